@@ -1,18 +1,41 @@
 from flask import Flask
 from flask_cors import CORS
+from config import Config
+from extensions import ensure_indexes
 from routes import register_routes
+from routes.interview import question_bank, question_prefetcher
+from routes.resume_score import resume_cache, resume_jobs
+from utils.auth_helpers import token_cache, user_cache
+from utils.llm_gateway import llm_gateway
+from utils.password_hasher import password_hasher
+from utils.resume_parser import start_page_pool
 
 app = Flask(__name__)
 
 # Enhanced CORS to prevent Preflight (OPTIONS) errors
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
+CORS(app, resources={r"/api/*": {"origins": Config.CORS_ORIGINS}}, supports_credentials=True)
 
 # Register all route blueprints
 register_routes(app)
 
+ensure_indexes()
+start_page_pool()
+
 @app.route("/api/health")
 def health():
     return {"status": "ok"}
 
+@app.route("/api/metrics")
+def metrics():
+    return {
+        "auth": {"users": user_cache.stats(), "tokens": token_cache.stats()},
+        "password_pool": password_hasher.stats(),
+        "llm_gateway": llm_gateway.stats(),
+        "question_prefetch": question_prefetcher.stats(),
+        "question_bank": question_bank.stats(),
+        "resume_cache": resume_cache.stats(),
+        "resume_jobs": resume_jobs.stats(),
+    }
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
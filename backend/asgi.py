@@ -0,0 +1,191 @@
+"""
+ASGI serving mode.
+
+The interview routes that wait on the model (/initiate, /submit, /next) are
+served natively async: they await the LLM gateway and Motor instead of
+pinning a worker thread, so one process can hold hundreds of sessions that
+are waiting on generation. Every other route is the unchanged Flask app,
+mounted through WSGIMiddleware.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from app import app as flask_app
+from config import Config
+from extensions import MONGO_CLIENT_OPTIONS
+from models.stats_model import answer_update, session_started_update
+from models.session_store import (
+    QUESTION_TEXT_FIELDS, SESSION_HEADER_FIELDS, bucket_append, bucket_query, count_increment, flatten, new_session,
+    session_query,
+)
+from routes.interview import agenerate_question, aanalyze_answer, question_bank, question_prefetcher
+from utils.auth_helpers import USER_PROJECTION, decode_token, user_cache
+
+# ============================
+# Async Mongo (Motor)
+# ============================
+_async_db = None
+
+def get_async_db():
+    global _async_db
+    if _async_db is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _async_db = AsyncIOMotorClient(Config.MONGO_URI, **MONGO_CLIENT_OPTIONS)[Config.DB_NAME]
+    return _async_db
+
+def set_async_db(db):
+    """Swap the async database (used by the benchmarks to plug in a stand-in)."""
+    global _async_db
+    _async_db = db
+
+# ============================
+# Helper: Auth
+# ============================
+async def current_user(request):
+    """Async equivalent of token_required. Returns (user, error_response)."""
+    token = request.headers.get("Authorization")
+    if not token:
+        return None, JSONResponse({"error": "Token missing"}, status_code=401)
+    try:
+        data = decode_token(token)
+        user = user_cache.get(data["email"])
+        if user is None:
+            user = await get_async_db()["users"].find_one({"email": data["email"]}, USER_PROJECTION)
+            if not user:
+                return None, JSONResponse({"error": "User not found"}, status_code=401)
+            user_cache.set(data["email"], user)
+    except Exception as e:
+        return None, JSONResponse({"error": "Invalid token", "details": str(e)}, status_code=401)
+    return user, None
+
+async def update_stats(user_id, update):
+    try:
+        await get_async_db()["user_stats"].update_one({"_id": user_id}, update, upsert=True)
+    except Exception as e:
+        print(f"User stats update failed: {e}")
+
+# ============================
+# Helper: Bucketed session storage (async twin of models/session_store.py)
+# ============================
+async def append_item(session_id, kind, item, user_id=None):
+    db = get_async_db()
+    header = await db["interviews"].find_one_and_update(
+        session_query(session_id, user_id), count_increment(kind), projection=SESSION_HEADER_FIELDS
+    )
+    if header is not None:
+        await db["interview_buckets"].update_one(*bucket_append(session_id, kind, item), upsert=True)
+    return header
+
+async def load_questions(header):
+    db = get_async_db()
+    items = []
+    if not header.get("bucketed"):
+        legacy = await db["interviews"].find_one({"_id": header["_id"]}, {"questions": 1}) or {}
+        items.extend(legacy.get("questions", []))
+    buckets = await db["interview_buckets"].find(bucket_query(header["_id"], "questions"), QUESTION_TEXT_FIELDS).sort("_id", 1).to_list(None)
+    items.extend(flatten(buckets))
+    return items
+
+# ============================
+# Routes
+# ============================
+async def initiate_session(request: Request):
+    user, error = await current_user(request)
+    if error:
+        return error
+    try:
+        data = await request.json()
+        session = new_session(
+            str(user["_id"]),
+            data.get("role", "Software Engineer"),
+            data.get("experience", "0-2 years"),
+            data.get("focus", "Technical"),
+        )
+        question = await agenerate_question(session['role'], session['experience'], session['focus'], data.get("resume_context", ""))
+        session["question_count"] = 1
+
+        result = await get_async_db()["interviews"].insert_one(session)
+        await get_async_db()["interview_buckets"].update_one(*bucket_append(result.inserted_id, "questions", question), upsert=True)
+        await update_stats(session["user_id"], session_started_update(session["focus"]))
+        question_prefetcher.ensure(str(result.inserted_id), session['role'], session['experience'], session['focus'])
+        return JSONResponse({"session_id": str(result.inserted_id), "question": question})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+async def submit_answer(request: Request):
+    user, error = await current_user(request)
+    if error:
+        return error
+    try:
+        data = await request.json()
+        session_id = data.get("session_id")
+        answer = data.get("answer")
+        question_title = data.get("question_title")
+
+        review = await aanalyze_answer(question_title, answer)
+
+        session = await append_item(session_id, "answers", {"question": question_title, "answer": answer, "feedback": review}, str(user["_id"]))
+        if session:
+            await update_stats(session["user_id"], answer_update(session.get("focus"), review))
+        return JSONResponse({"success": True, "review": review})
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+async def next_question(request: Request):
+    user, error = await current_user(request)
+    if error:
+        return error
+    try:
+        data = await request.json()
+        session_id = data.get("session_id")
+        session = await get_async_db()["interviews"].find_one(session_query(session_id, str(user["_id"])), SESSION_HEADER_FIELDS)
+
+        seen = await load_questions(session)
+        question = question_prefetcher.pop(session_id)
+        if question is None or question_bank.is_repeat(question, seen):
+            question = await agenerate_question(session['role'], session['experience'], session['focus'], seen=seen)
+        question_prefetcher.ensure(session_id, session['role'], session['experience'], session['focus'])
+        await append_item(session_id, "questions", question, str(user["_id"]))
+        return JSONResponse(question)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+NATIVE_ROUTES = [
+    Route("/api/interview/initiate", initiate_session, methods=["POST"]),
+    Route("/api/interview/submit", submit_answer, methods=["POST"]),
+    Route("/api/interview/next", next_question, methods=["POST"]),
+]
+
+class NativeRouteCORS:
+    """
+    Applies CORS to the native routes only; the mounted Flask app already
+    sets its own headers through flask_cors.
+    """
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = set(paths)
+        self.cors = CORSMiddleware(
+            app,
+            allow_origins=Config.CORS_ORIGINS,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            await self.cors(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app = NativeRouteCORS(
+    Starlette(routes=NATIVE_ROUTES + [Mount("/", app=WSGIMiddleware(flask_app))]),
+    [route.path for route in NATIVE_ROUTES],
+)
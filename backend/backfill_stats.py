@@ -0,0 +1,19 @@
+"""
+Rebuilds the materialised per-user stats (user_stats collection) from
+interview history. Run once after deploying, or any time the counters
+are suspected to have drifted.
+
+    python backfill_stats.py                 # every user
+    python backfill_stats.py --user <user_id>
+"""
+import argparse
+
+from models.stats_model import rebuild_user_stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild user stats from interview history")
+    parser.add_argument("--user", help="only rebuild this user_id")
+    args = parser.parse_args()
+
+    count = rebuild_user_stats(args.user)
+    print(f"Rebuilt stats for {count} user(s)")
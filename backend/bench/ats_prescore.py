@@ -0,0 +1,116 @@
+"""
+Latency of the local ATS pre-scorer (utils/ats_scorer.py) and its agreement
+with the LLM's score.
+
+Builds synthetic resumes for a role that cover a random share of its key
+skills, then times fast mode (PDF extraction + keyword scan, what
+/api/resume/score?mode=fast does) per resume, and score_many() over the
+whole batch. With --llm it also scores every resume with the full LLM prompt
+(RESUME_PREFILL off) against OLLAMA_HOST and reports Pearson/Spearman
+correlation and mean absolute difference. The fake Ollama server answers
+with a constant score, so agreement needs a real model.
+
+    python bench/ats_prescore.py --resumes 200 --role "Backend Engineer"
+    OLLAMA_HOST=http://127.0.0.1:11434 python bench/ats_prescore.py --resumes 40 --llm
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import numpy as np
+
+from load_test import make_pdf, percentile, use_mongomock
+
+FILLER = ("Delivered features end to end with product and design. "
+          "Owned on-call for customer-facing services and wrote postmortems. ")
+
+
+def make_resume_text(role_skills, other_skills, share, rng):
+    picked = rng.sample(role_skills, round(share * len(role_skills)))
+    extra = rng.sample(other_skills, rng.randint(0, 6))
+    skills = picked + extra
+    rng.shuffle(skills)
+    lines = [f"Candidate {rng.randint(1000, 9999)}. Software professional.", FILLER]
+    for i in range(0, len(skills), 3):
+        lines.append("Built and operated systems using " + ", ".join(skills[i:i + 3]) + ".")
+    return "\n".join(lines)
+
+
+def ranks(values):
+    order = np.argsort(values, kind="stable")
+    result = np.empty(len(values))
+    result[order] = np.arange(len(values))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local ATS pre-scorer benchmark")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--role", default="Backend Engineer")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--llm", action="store_true", help="also score with the LLM and report agreement")
+    args = parser.parse_args()
+
+    os.environ["RESUME_PREFILL"] = "false"
+    os.environ["RESUME_CACHE_PERSIST"] = "false"
+    use_mongomock()
+    from utils.ats_scorer import get_ats_scorer
+    from utils.resume_parser import extract_text
+    from utils.skill_taxonomy import get_taxonomy
+
+    taxonomy = get_taxonomy()
+    role_skills = taxonomy.roles[args.role]
+    other_skills = sorted(set(taxonomy.categories) - set(role_skills))
+    rng = random.Random(args.seed)
+    texts = [make_resume_text(role_skills, other_skills, rng.random(), rng) for _ in range(args.resumes)]
+    pdfs = [make_pdf(text) for text in texts]
+
+    t = time.perf_counter()
+    scorer = get_ats_scorer()
+    build_ms = (time.perf_counter() - t) * 1000
+
+    samples = []
+    fast_scores = []
+    for pdf in pdfs:
+        t = time.perf_counter()
+        result = scorer.score(extract_text(pdf), args.role)
+        samples.append((time.perf_counter() - t) * 1000)
+        fast_scores.append(result["score"])
+    samples.sort()
+
+    t = time.perf_counter()
+    scorer.score_many(texts, args.role)
+    batch_ms = (time.perf_counter() - t) * 1000
+
+    print(f"{args.resumes} resumes for {args.role!r} ({len(role_skills)} key skills), "
+          f"vocabulary {len(scorer.vocabulary)} skills, scorer built in {build_ms:.1f} ms")
+    print(f"fast mode (extract + scan):  p50 {percentile(samples, 50):.2f} ms   p95 {percentile(samples, 95):.2f} ms")
+    print(f"score_many over the batch:   {batch_ms:.1f} ms total, {batch_ms / len(texts) * 1000:.0f} us per resume")
+    print(f"fast scores: min {min(fast_scores)}, median {int(np.median(fast_scores))}, max {max(fast_scores)}")
+
+    if args.llm:
+        from routes.resume_score import score_resume_file
+
+        llm_scores = []
+        samples = []
+        for i, pdf in enumerate(pdfs):
+            t = time.perf_counter()
+            llm_scores.append(float(score_resume_file(pdf, f"bench-{i}.pdf", args.role)["score"]))
+            samples.append((time.perf_counter() - t) * 1000)
+        samples.sort()
+        fast = np.array(fast_scores, dtype=float)
+        llm = np.array(llm_scores)
+        if llm.std() == 0:
+            print(f"\nLLM returned a constant score ({llm[0]:.0f}); point OLLAMA_HOST at a real model for agreement")
+        else:
+            pearson = np.corrcoef(fast, llm)[0, 1]
+            spearman = np.corrcoef(ranks(fast), ranks(llm))[0, 1]
+            print(f"\nLLM scoring: p50 {percentile(samples, 50):.0f} ms   p95 {percentile(samples, 95):.0f} ms")
+            print(f"agreement: pearson {pearson:.2f}, spearman {spearman:.2f}, "
+                  f"mean |fast - llm| {np.abs(fast - llm).mean():.1f} points")
@@ -0,0 +1,93 @@
+"""
+Measures what token_required adds to an authenticated request.
+
+Drives /api/dashboard/ (a route that does nothing but authenticate) and
+/api/health (no auth) through the Flask test client, in three modes:
+the original full-document lookup, the projected lookup without caching,
+and the projected lookup with the auth caches enabled. The user document carries a resume blob
+of --resume-kb, like one saved through /api/profile/resume/upload.
+
+    pip install mongomock
+    python bench/auth_overhead.py --requests 2000 --resume-kb 2048
+    python bench/auth_overhead.py --mongo-uri mongodb://localhost:27017/
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from load_test import percentile, use_mongomock
+
+
+def timed(client, path, headers, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        resp = client.get(path, headers=headers)
+        samples.append(time.perf_counter() - start)
+        assert resp.status_code == 200, resp.get_json()
+    return samples
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return {
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 1),
+        "p50_us": round(percentile(samples, 50) * 1e6, 1),
+        "p99_us": round(percentile(samples, 99) * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="token_required overhead benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--resume-kb", type=int, default=2048)
+    parser.add_argument("--mongo-uri", help="use a real MongoDB instead of mongomock")
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        os.environ["MONGO_URI"] = args.mongo_uri
+    else:
+        use_mongomock()
+
+    import jwt
+    from app import app
+    from config import Config
+    from extensions import users_collection
+    from utils import auth_helpers
+
+    email = "bench-auth@example.com"
+    users_collection.delete_many({"email": email})
+    users_collection.insert_one({
+        "name": "bench", "email": email, "password": "x", "role": "candidate",
+        "resume_data": "A" * (args.resume_kb * 1024), "resume_filename": "resume.pdf",
+    })
+    token = jwt.encode({"email": email, "exp": int(time.time()) + 3600}, Config.SECRET_KEY)
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    projection = auth_helpers.USER_PROJECTION
+    cached_ttl = Config.AUTH_USER_CACHE_TTL or 60
+    results = {}
+    for mode, ttl, proj in (("full_doc", 0, None), ("projected", 0, projection), ("cached", cached_ttl, projection)):
+        auth_helpers.USER_PROJECTION = proj
+        auth_helpers.user_cache.ttl = ttl
+        auth_helpers.token_cache.ttl = ttl
+        timed(client, "/api/dashboard/", headers, 50)  # warm up
+        results[mode] = {
+            "health": summary(timed(client, "/api/health", {}, args.requests)),
+            "dashboard": summary(timed(client, "/api/dashboard/", headers, args.requests)),
+        }
+
+    print(f"{args.requests} requests, resume blob {args.resume_kb} KB")
+    print(f"{'mode':10} {'route':10} {'mean us':>10} {'p50 us':>10} {'p99 us':>10} {'auth us':>10}")
+    for mode, routes in results.items():
+        for route, row in routes.items():
+            auth = row["mean_us"] - routes["health"]["mean_us"] if route == "dashboard" else 0.0
+            print(f"{mode:10} {route:10} {row['mean_us']:>10} {row['p50_us']:>10} {row['p99_us']:>10} {auth:>10.1f}")
+
+    users_collection.delete_many({"email": email})
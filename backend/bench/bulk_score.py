@@ -0,0 +1,114 @@
+"""
+Scores a zip of N resumes against one job description through
+/api/resume/score/bulk and compares it with N sequential /api/resume/score
+calls, both against the fake Ollama server.
+
+Reports time to the first NDJSON line, total time, and the peak Python heap
+while the batch streams (tracemalloc), which should stay flat as N grows.
+
+    pip install mongomock pymupdf
+    python bench/bulk_score.py --resumes 50 --ttft 0.2 --tokens-per-sec 200
+    python bench/bulk_score.py --resumes 500 --skip-sequential
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import httpx
+
+from fake_ollama import start_fake_ollama
+from load_test import start_local_backend
+from pdf_extract import make_resume
+
+
+def make_archive(count, pages):
+    # Each resume differs by its first line so the result cache never hits
+    base = make_resume(pages)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for i in range(count):
+            zf.writestr(f"batch/resume_{i:04}.pdf", base + f"\n% {i}\n".encode())
+    return buf.getvalue()
+
+
+def run_bulk(base_url, archive, role):
+    lines = []
+    first = None
+    start = time.perf_counter()
+    with httpx.Client(base_url=base_url, timeout=None) as client:
+        with client.stream(
+            "POST", "/api/resume/score/bulk",
+            data={"job_description": role},
+            files={"archive": ("batch.zip", archive, "application/zip")},
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                if first is None:
+                    first = time.perf_counter() - start
+                lines.append(json.loads(line))
+    return first, time.perf_counter() - start, lines
+
+
+def run_sequential(base_url, archive, role):
+    start = time.perf_counter()
+    ok = 0
+    with httpx.Client(base_url=base_url, timeout=None) as client, zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        for info in zf.infolist():
+            resp = client.post(
+                "/api/resume/score",
+                data={"job_description": role},
+                files={"resume": (info.filename, zf.read(info), "application/pdf")},
+            )
+            ok += resp.status_code == 200
+    return time.perf_counter() - start, ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk vs sequential resume scoring")
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--ollama-port", type=int, default=11436)
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    fake = start_fake_ollama(port=args.ollama_port, ttft=args.ttft, tokens_per_sec=args.tokens_per_sec)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{args.ollama_port}"
+    os.environ["RESUME_CACHE_PERSIST"] = "false"
+    server = start_local_backend(args.port, None)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    from config import Config
+
+    archive = make_archive(args.resumes, args.pages)
+    print(f"{args.resumes} resumes, {len(archive) // 1024} KB zip, "
+          f"bulk concurrency {Config.RESUME_BULK_CONCURRENCY}, window {Config.RESUME_BULK_WINDOW}")
+
+    tracemalloc.start()
+    first, total, lines = run_bulk(base_url, archive, "Backend Engineer")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    summary = lines[-1]
+    print(f"\nbulk:       first result {first:6.2f}s, total {total:6.2f}s, "
+          f"{summary['scored']} scored / {summary['failed']} failed, peak heap {peak / 2**20:.1f} MB")
+
+    if not args.skip_sequential:
+        # New role so nothing comes from the bulk run's cache entries
+        total, ok = run_sequential(base_url, archive, "Platform Engineer")
+        print(f"sequential: total {total:6.2f}s, {ok} scored")
+
+    server.shutdown()
+    fake.shutdown()
@@ -0,0 +1,119 @@
+"""
+Frames per second of the face-mesh metrics in ml/cv/eye_tracking.py on
+synthetic landmarks (no camera or MediaPipe model needed).
+
+Compares the old per-frame functions (list comprehensions over landmark
+objects in every metric, camera matrix rebuilt per frame) with one
+landmarks_to_array() per frame (all 468 points, or only the tracked ones)
+plus the vectorized metrics, and with batch_metrics() over a (T, 468, 2)
+stack. Head pose (solvePnP) is timed
+separately since it dominates per-frame cost.
+
+    pip install opencv-python-headless numpy
+    python bench/eye_tracking_fps.py --frames 3000
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+import cv2
+import numpy as np
+
+from ml.cv import eye_tracking as et
+
+W, H = 1280, 720
+
+
+def make_frames(count, rng):
+    """Normalized landmark objects per frame, with the pose points projected from a slowly turning head."""
+    frames = []
+    base = rng.uniform(0.3, 0.7, size=(et.NUM_LANDMARKS, 2))
+    for t in range(count):
+        points = base + rng.normal(0, 0.002, size=base.shape)
+        rot = np.array([0.1 * np.sin(t / 50), 0.2 * np.sin(t / 80), 0.0])
+        projected, _ = cv2.projectPoints(
+            et.MODEL_POINTS, rot, np.array([0.0, 0.0, 1500.0]), et.camera_matrix(W, H), et.DIST_COEFFS,
+        )
+        points[et.POSE_LANDMARKS] = projected.reshape(-1, 2) / (W, H)
+        frames.append([SimpleNamespace(x=x, y=y, z=0.0) for x, y in points])
+    return frames
+
+
+# --- The previous implementation, for comparison ---
+def legacy_ear(eye, landmarks, w, h):
+    coords = np.array([(landmarks[i].x * w, landmarks[i].y * h) for i in eye])
+    a = np.linalg.norm(coords[1] - coords[14])
+    b = np.linalg.norm(coords[2] - coords[13])
+    c = np.linalg.norm(coords[0] - coords[8])
+    return (a + b) / (2.0 * c)
+
+
+def legacy_mouth(landmarks, w, h):
+    top = np.array([landmarks[et.MOUTH_TOP].x * w, landmarks[et.MOUTH_TOP].y * h])
+    bottom = np.array([landmarks[et.MOUTH_BOTTOM].x * w, landmarks[et.MOUTH_BOTTOM].y * h])
+    left = np.array([landmarks[et.MOUTH_LEFT].x * w, landmarks[et.MOUTH_LEFT].y * h])
+    right = np.array([landmarks[et.MOUTH_RIGHT].x * w, landmarks[et.MOUTH_RIGHT].y * h])
+    hor = np.linalg.norm(left - right)
+    return 0 if hor == 0 else np.linalg.norm(top - bottom) / hor * 100.0
+
+
+def legacy_pose(landmarks, w, h):
+    cam = np.array([[w, 0, w / 2], [0, w, h / 2], [0, 0, 1]], dtype=np.float64)
+    model = np.array(et.MODEL_POINTS.tolist())
+    image = np.array([(landmarks[i].x * w, landmarks[i].y * h) for i in et.POSE_LANDMARKS], dtype=np.float64)
+    _, rot_vec, _ = cv2.solvePnP(model, image, cam, np.zeros((4, 1)), flags=cv2.SOLVEPNP_ITERATIVE)
+    return et.rotation_to_euler(rot_vec)
+
+
+def fps(label, seconds, frames):
+    print(f"{label:40} {frames / seconds:>10.0f} {seconds / frames * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="eye_tracking frames-per-second benchmark")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, np.random.default_rng(args.seed))
+    print(f"{args.frames} synthetic frames at {W}x{H}")
+    print(f"\n{'metrics (EARs, mouth, blink)':40} {'fps':>10} {'us/frame':>10}")
+
+    t = time.perf_counter()
+    old = [(legacy_ear(et.LEFT_EYE, lm, W, H), legacy_ear(et.RIGHT_EYE, lm, W, H), legacy_mouth(lm, W, H)) for lm in frames]
+    fps("old: per-metric list comprehensions", time.perf_counter() - t, len(frames))
+
+    t = time.perf_counter()
+    new = [et.frame_metrics(et.landmarks_to_array(lm, W, H)) for lm in frames]
+    fps("new: one (468, 2) array per frame", time.perf_counter() - t, len(frames))
+
+    t = time.perf_counter()
+    tracked = [et.frame_metrics(et.landmarks_to_array(lm, W, H, tracked_only=True)) for lm in frames]
+    fps("new: tracked landmarks only", time.perf_counter() - t, len(frames))
+
+    stack = np.stack([et.landmarks_to_array(lm, W, H) for lm in frames])
+    t = time.perf_counter()
+    batch = et.batch_metrics(stack)
+    fps("new: batch_metrics over (T, 468, 2)", time.perf_counter() - t, len(frames))
+
+    t = time.perf_counter()
+    for lm in frames:
+        et.landmarks_to_array(lm, W, H)
+    fps("  (landmarks_to_array alone)", time.perf_counter() - t, len(frames))
+
+    assert np.allclose([o[:2] for o in old], batch["ears"]) and np.allclose([o[2] for o in old], batch["mouth_openness"])
+    assert all(n["blinking"] == t["blinking"] == b for n, t, b in zip(new, tracked, batch["blinking"]))
+
+    print(f"\n{'head pose (solvePnP)':40} {'fps':>10} {'us/frame':>10}")
+    t = time.perf_counter()
+    old_pose = [legacy_pose(lm, W, H) for lm in frames]
+    fps("old: rebuild matrices per frame", time.perf_counter() - t, len(frames))
+    t = time.perf_counter()
+    new_pose = et.batch_head_pose(stack, W, H)
+    fps("new: batch_head_pose", time.perf_counter() - t, len(frames))
+    assert np.allclose(old_pose, new_pose)
@@ -0,0 +1,154 @@
+"""
+Stand-in Ollama server for benchmarking without a GPU.
+
+Serves /api/chat and /api/generate (streaming and non-streaming) with canned
+JSON answers shaped like the ones our prompts ask for. Latency is modelled as
+a fixed time-to-first-token plus a token rate.
+
+    python bench/fake_ollama.py --port 11435 --ttft 0.2 --tokens-per-sec 40
+    OLLAMA_HOST=http://127.0.0.1:11435 python app.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED = {
+    "question": {
+        "title": "Designing a Rate Limiter",
+        "description": "How would you design a rate limiter for a public API serving millions of users?",
+        "input_format": "text",
+        "output_format": "text",
+    },
+    "analysis": {
+        "clarity_score": 7,
+        "confidence_score": 6,
+        "feedback": "Clear structure, but support the trade-offs with concrete numbers.",
+    },
+    "resume": {
+        "score": 72,
+        "improvement_tips": ["Quantify project impact", "List cloud experience"],
+        "summary": "Solid backend profile with limited production ML exposure.",
+        "missing_keywords": ["Kubernetes", "CI/CD"],
+        "strengths": ["Python", "REST APIs"],
+        "weaknesses": ["No system design examples"],
+    },
+    "chat": {"reply": "ok"},
+}
+
+
+def pick_response(prompt):
+    text = prompt.lower()
+    if "resume" in text and "score" in text:
+        return CANNED["resume"]
+    if "analyze this interview response" in text or "candidate answer" in text:
+        return CANNED["analysis"]
+    if "interview question" in text or "interviewer" in text:
+        return CANNED["question"]
+    return CANNED["chat"]
+
+
+def tokenize(text):
+    # Roughly 4 characters per token, good enough for pacing
+    return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ttft = 0.2
+    tokens_per_sec = 40.0
+    trailing_chatter = ""
+
+    def log_message(self, *args):
+        pass
+
+    def _prompt(self, body):
+        if "messages" in body:
+            return "\n".join(m.get("content", "") for m in body["messages"])
+        return body.get("prompt", "")
+
+    def _chunk(self, body, text, done):
+        chunk = {"model": body.get("model", "fake"), "done": done}
+        if self.path == "/api/chat":
+            chunk["message"] = {"role": "assistant", "content": text}
+        else:
+            chunk["response"] = text
+        return chunk
+
+    def do_GET(self):
+        if self.path in ("/", "/api/tags"):
+            self._send_json({"models": [{"name": "llama3:8b"}]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path not in ("/api/chat", "/api/generate"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        text = json.dumps(pick_response(self._prompt(body))) + self.trailing_chatter
+        tokens = tokenize(text)
+        delay = 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+        time.sleep(self.ttft)
+        if not body.get("stream", True):
+            time.sleep(delay * len(tokens))
+            self._send_json(self._chunk(body, text, True))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                self._write_chunk(json.dumps(self._chunk(body, token, False)) + "\n")
+                time.sleep(delay)
+            self._write_chunk(json.dumps(self._chunk(body, "", True)) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading (e.g. early JSON termination)
+            self.close_connection = True
+
+    def _write_chunk(self, data):
+        data = data.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_fake_ollama(host="127.0.0.1", port=11435, ttft=0.2, tokens_per_sec=40.0, trailing_chatter=""):
+    """Starts the server on a daemon thread and returns it (call .shutdown() to stop)."""
+    handler = type("ConfiguredHandler", (FakeOllamaHandler,), {
+        "ttft": ttft, "tokens_per_sec": tokens_per_sec, "trailing_chatter": trailing_chatter,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--ttft", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--chatter", default="", help="text appended after the JSON answer")
+    args = parser.parse_args()
+
+    server = start_fake_ollama(args.host, args.port, args.ttft, args.tokens_per_sec, args.chatter)
+    print(f"Fake Ollama listening on http://{args.host}:{args.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
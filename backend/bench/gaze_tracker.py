@@ -0,0 +1,171 @@
+"""
+CPU per minute of video for GazeBlinkTracker (ml/cv/eye_tracking.py)
+against calling the stateless per-frame functions on every frame.
+
+Generates a synthetic interview clip as landmark arrays: still listening,
+talking, small head movements and looking away, with blinks at random
+times outside talking. A stand-in detector burns --inference-ms of CPU per
+call in place of MediaPipe Face Mesh (several ms per frame on a laptop CPU),
+so skipped frames save what real inference would cost; use 0 to time only
+the Python side. Reports CPU seconds per minute of video, the share of
+frames run through the detector, and blinks / talking / gaze-away next to
+the generated ground truth.
+
+    pip install opencv-python-headless numpy
+    python bench/gaze_tracker.py --seconds 120 --inference-ms 8
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(BACKEND_DIR))
+
+import cv2
+import numpy as np
+
+from ml.cv import eye_tracking as et
+
+W, H = 1280, 720
+FPS = 30.0
+EYE_WIDTH = 60.0
+OPEN_EAR, CLOSED_EAR = 0.3, 0.08
+# Share of one-second segments in each behaviour
+SEGMENTS = {"still": 0.55, "talk": 0.25, "move": 0.1, "away": 0.1}
+
+
+def make_clip(seconds, rng):
+    """(T, 468, 2) pixel landmarks plus ground truth: blink count, talking and away frames."""
+    count = int(seconds * FPS)
+    kinds = rng.choice(list(SEGMENTS), size=int(np.ceil(seconds)), p=list(SEGMENTS.values()))
+    kind = np.repeat(kinds, int(FPS))[:count]
+
+    # Head rotation: drifts while moving, turns about 30 degrees while away
+    yaw = np.where(kind == "away", 0.55, 0.0)
+    yaw += np.where(kind == "move", 0.15 * np.sin(np.arange(count) / 6.0), 0.0)
+    pitch = np.where(kind == "move", 0.08 * np.cos(np.arange(count) / 9.0), 0.0)
+
+    ear = np.full(count, OPEN_EAR)
+    blinks = 0
+    t = length = 0
+    while True:
+        # At least half a second between blinks so two never merge into one
+        t += length + int(FPS / 2 + rng.exponential(FPS * 60 / 17))
+        length = int(rng.integers(3, 7))
+        if t + length >= count:
+            break
+        if (kind[t:t + length] != "talk").all():
+            ear[t:t + length] = CLOSED_EAR
+            blinks += 1
+    mouth = np.where(kind == "talk", rng.uniform(0.2, 0.45, count), 0.05)
+
+    base = rng.uniform(0.3, 0.7, size=(et.NUM_LANDMARKS, 2)) * (W, H)
+    clip = np.empty((count, et.NUM_LANDMARKS, 2))
+    cam = et.camera_matrix(W, H)
+    for i in range(count):
+        points = base + rng.normal(0, 0.2, size=base.shape)
+        projected, _ = cv2.projectPoints(
+            et.MODEL_POINTS, np.array([pitch[i], yaw[i], 0.0]), np.array([0.0, 0.0, 1500.0]), cam, et.DIST_COEFFS,
+        )
+        points[et.POSE_LANDMARKS] = projected.reshape(-1, 2)
+        # Eye contours and inner lips around the projected corners
+        for eye, outer, inward in ((et.RIGHT_EYE, 33, 1.0), (et.LEFT_EYE, 263, -1.0)):
+            corner = points[outer]
+            other = corner + (inward * EYE_WIDTH, 0.0)
+            ends = (eye[0], eye[8]) if eye[0] == outer else (eye[8], eye[0])
+            points[ends[0]], points[ends[1]] = corner, other
+            center = (corner + other) / 2
+            half = ear[i] * EYE_WIDTH / 2
+            for top, bottom in ((eye[1], eye[14]), (eye[2], eye[13])):
+                points[top] = center - (0.0, half)
+                points[bottom] = center + (0.0, half)
+        left, right = points[et.MOUTH_LEFT], points[et.MOUTH_RIGHT]
+        half = mouth[i] * np.linalg.norm(right - left) / 2
+        points[et.MOUTH_TOP] = (left + right) / 2 - (0.0, half)
+        points[et.MOUTH_BOTTOM] = (left + right) / 2 + (0.0, half)
+        clip[i] = points
+
+    truth = {
+        "blinks": blinks,
+        "talking_ratio": float((kind == "talk").mean()),
+        "gaze_away_seconds": float((kind == "away").sum() / FPS),
+    }
+    return clip, truth
+
+
+def make_detector(clip, inference_ms):
+    """Frame -> landmarks for the clip, spending inference_ms of CPU like a face mesh model would."""
+    def detect(frame):
+        deadline = time.process_time() + inference_ms / 1000
+        while time.process_time() < deadline:
+            pass
+        return clip[int(frame[0, 0, 0])]
+    return detect
+
+
+def frames(count):
+    # Zero-copy stand-ins for video frames; the pixel value is the frame index
+    return (np.broadcast_to(np.int32(i), (H, W, 3)) for i in range(count))
+
+
+def run_stateless(clip, detect):
+    """The old way: detector plus is_blinking / get_head_pose on every frame, counting in the caller."""
+    blinks = closed_run = talking = away = 0
+    for frame in frames(len(clip)):
+        landmarks = detect(frame)
+        closed = et.is_blinking(landmarks, frame.shape)
+        x, y, _ = et.get_head_pose(frame, landmarks)
+        away += not et.is_looking_at_camera(x, y)
+        talking += et.get_mouth_openness(landmarks, W, H) > et.MOUTH_OPEN_THRESHOLD
+        if closed:
+            closed_run += 1
+        else:
+            blinks += closed_run >= 2
+            closed_run = 0
+    return {
+        "blinks": blinks,
+        "talking_ratio": talking / len(clip),
+        "gaze_away_seconds": away / FPS,
+        "processed_frames": len(clip),
+    }
+
+
+def run_tracker(clip, detect, max_skip):
+    tracker = et.GazeBlinkTracker(fps=FPS, detector=detect, window_seconds=len(clip) / FPS, max_skip=max_skip)
+    for frame in frames(len(clip)):
+        tracker.update(frame)
+    return tracker.summary()
+
+
+def report(label, cpu, stats, minutes, count):
+    print(f"{label:30} {cpu / minutes:>8.2f} {stats['processed_frames'] / count:>9.0%} "
+          f"{stats['blinks']:>7} {stats['talking_ratio']:>8.2f} {stats['gaze_away_seconds']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming gaze/blink tracker CPU benchmark")
+    parser.add_argument("--seconds", type=float, default=120)
+    parser.add_argument("--inference-ms", type=float, default=8.0)
+    parser.add_argument("--max-skip", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    clip, truth = make_clip(args.seconds, np.random.default_rng(args.seed))
+    detect = make_detector(clip, args.inference_ms)
+    minutes = args.seconds / 60
+    print(f"{len(clip)} frames ({args.seconds:.0f}s at {FPS:.0f} fps), "
+          f"simulated face mesh {args.inference_ms} ms/frame")
+    print(f"\n{'':30} {'cpu s/min':>8} {'detected':>9} {'blinks':>7} {'talking':>8} {'away s':>8}")
+    print(f"{'ground truth':30} {'':>8} {'':>9} {truth['blinks']:>7} "
+          f"{truth['talking_ratio']:>8.2f} {truth['gaze_away_seconds']:>8.1f}")
+
+    runs = [
+        ("stateless, every frame", lambda: run_stateless(clip, detect)),
+        ("tracker, every frame", lambda: run_tracker(clip, detect, 0)),
+        (f"tracker, max_skip={args.max_skip}", lambda: run_tracker(clip, detect, args.max_skip)),
+    ]
+    for label, run in runs:
+        start = time.process_time()
+        stats = run()
+        report(label, time.process_time() - start, stats, minutes, len(clip))
@@ -0,0 +1,211 @@
+"""
+End-to-end load test for the hot API routes.
+
+Starts the fake Ollama server, swaps MongoDB for an in-memory mongomock
+instance (unless --mongo-uri is given), serves the Flask app on a local
+port and drives it with concurrent virtual users. Each user signs up once,
+then repeats: login -> initiate -> submit -> next -> history -> resume score.
+Reports p50/p95/p99 latency and requests per second for every route.
+
+    pip install mongomock pymupdf
+    python bench/load_test.py --users 20 --iterations 5
+    python bench/load_test.py --base-url http://127.0.0.1:8000   # existing server
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import httpx
+
+from fake_ollama import start_fake_ollama
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.started = None
+        self.finished = None
+
+    def call(self, route, fn):
+        t0 = time.perf_counter()
+        try:
+            response = fn()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self.latencies[route].append(elapsed)
+            if not ok:
+                self.errors[route] += 1
+        return response if ok else None
+
+    def report(self):
+        wall = (self.finished or time.perf_counter()) - self.started
+        rows = []
+        for route, values in self.latencies.items():
+            values = sorted(values)
+            rows.append({
+                "route": route,
+                "count": len(values),
+                "errors": self.errors[route],
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "rps": round(len(values) / wall, 2) if wall else 0.0,
+            })
+        return {"wall_seconds": round(wall, 2), "routes": rows}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank method
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def make_pdf(text):
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text, fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def virtual_user(base_url, rec, user_no, iterations, repeat_resume, include_resume=True):
+    email = f"load{user_no}_{int(time.time() * 1000)}@bench.local"
+    password = "bench-password"
+    with httpx.Client(base_url=base_url, timeout=120) as client:
+        rec.call("POST /api/auth/signup", lambda: client.post(
+            "/api/auth/signup", json={"name": f"Load {user_no}", "email": email, "password": password}))
+
+        for i in range(iterations):
+            r = rec.call("POST /api/auth/login", lambda: client.post(
+                "/api/auth/login", json={"email": email, "password": password}))
+            if r is None:
+                continue
+            headers = {"Authorization": f"Bearer {r.json()['token']}"}
+
+            r = rec.call("POST /api/interview/initiate", lambda: client.post(
+                "/api/interview/initiate", headers=headers,
+                json={"role": "Backend Engineer", "experience": "2-5 years", "focus": "System Design"}))
+            if r is not None:
+                session_id = r.json()["session_id"]
+                title = r.json()["question"].get("title", "")
+                rec.call("POST /api/interview/submit", lambda: client.post(
+                    "/api/interview/submit", headers=headers,
+                    json={"session_id": session_id, "question_title": title,
+                          "answer": "I would use a token bucket per API key stored in Redis."}))
+                rec.call("POST /api/interview/next", lambda: client.post(
+                    "/api/interview/next", headers=headers, json={"session_id": session_id}))
+
+            rec.call("GET /api/interview/history", lambda: client.get(
+                "/api/interview/history", headers=headers))
+
+            if not include_resume:
+                continue
+            resume_text = "Python developer" if repeat_resume else f"Python developer {user_no}-{i}"
+            pdf = make_pdf(resume_text)
+            rec.call("POST /api/resume/score", lambda: client.post(
+                "/api/resume/score",
+                files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                data={"job_description": "Backend Engineer"}))
+
+
+def run_load(base_url, users, iterations, repeat_resume=False, include_resume=True):
+    rec = Recorder()
+    rec.started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        futures = [
+            pool.submit(virtual_user, base_url, rec, n, iterations, repeat_resume, include_resume)
+            for n in range(users)
+        ]
+        for f in futures:
+            f.result()
+    rec.finished = time.perf_counter()
+    return rec.report()
+
+
+def use_mongomock():
+    """Points every MongoClient the app creates at one shared in-memory mongomock client."""
+    import mongomock
+    import mongomock.gridfs
+    import pymongo
+    mongomock.gridfs.enable_gridfs_integration()
+    shared = mongomock.MongoClient()
+    pymongo.MongoClient = lambda *args, **kwargs: shared
+    return shared
+
+
+def start_local_backend(port, mongo_uri=None):
+    """Imports the Flask app against mongomock (or a real Mongo) and serves it threaded."""
+    if mongo_uri:
+        os.environ["MONGO_URI"] = mongo_uri
+    else:
+        use_mongomock()
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def print_report(report):
+    print(f"\nWall time: {report['wall_seconds']}s")
+    print(f"{'route':32} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for row in report["routes"]:
+        print(f"{row['route']:32} {row['count']:>6} {row['errors']:>4} {row['p50_ms']:>9} "
+              f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['rps']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PrepAI backend load test")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--base-url", help="drive an already running backend instead of starting one")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--mongo-uri", help="use a real MongoDB instead of mongomock")
+    parser.add_argument("--ollama-port", type=int, default=11435)
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--repeat-resume", action="store_true", help="upload the same PDF every time (cache hits)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    fake = start_fake_ollama(port=args.ollama_port, ttft=args.ttft, tokens_per_sec=args.tokens_per_sec)
+    base_url = args.base_url
+    server = None
+    if not base_url:
+        os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{args.ollama_port}"
+        server = start_local_backend(args.port, args.mongo_uri)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    report = run_load(base_url, args.users, args.iterations, args.repeat_resume)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if server:
+        server.shutdown()
+    fake.shutdown()
@@ -0,0 +1,79 @@
+"""
+Login throughput with password verification on the bounded hashing pool.
+
+Creates --accounts users in mongomock, then fires --logins POST
+/api/auth/login requests from --concurrency client threads through the
+Flask test client. Reports logins/s, logins/s per pool worker (one worker
+saturates one core, since scrypt/pbkdf2 release the GIL), latency and how
+many requests were shed with 429.
+
+    pip install mongomock
+    python bench/login_throughput.py --workers 4 --concurrency 64 --logins 400
+    python bench/login_throughput.py --method pbkdf2:sha256:600000
+    python bench/login_throughput.py --stored-method pbkdf2:sha256:260000   # measures rehash-on-login
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from load_test import percentile, use_mongomock
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--method", default="scrypt:32768:8:1", help="configured PASSWORD_HASH_METHOD")
+    parser.add_argument("--stored-method", help="hash the seeded passwords with this instead (forces rehash)")
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ["PASSWORD_HASH_METHOD"] = args.method
+    os.environ["PASSWORD_POOL_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_POOL_MAX_PENDING"] = str(args.max_pending)
+    use_mongomock()
+
+    from werkzeug.security import generate_password_hash
+    from app import app
+    from extensions import users_collection
+    from utils.password_hasher import password_hasher
+
+    stored = generate_password_hash("bench-password", args.stored_method or args.method)
+    users_collection.insert_many([
+        {"name": f"u{i}", "email": f"login{i}@example.com", "password": stored, "role": "candidate"}
+        for i in range(args.accounts)
+    ])
+
+    client = app.test_client()
+
+    def login(i):
+        start = time.perf_counter()
+        resp = client.post("/api/auth/login", json={"email": f"login{i % args.accounts}@example.com", "password": "bench-password"})
+        return resp.status_code, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(login, range(args.logins)))
+    wall = time.perf_counter() - started
+
+    ok = sorted(t for status, t in results if status == 200)
+    shed = sum(1 for status, _ in results if status == 429)
+    other = len(results) - len(ok) - shed
+    time.sleep(0.5)  # let background rehashes land
+
+    print(f"method {args.method}  workers {args.workers}  cores {os.cpu_count()}  concurrency {args.concurrency}")
+    print(f"logins ok {len(ok)}  shed (429) {shed}  other errors {other}  wall {wall:.2f}s")
+    print(f"logins/s {len(ok) / wall:.1f}  per worker {len(ok) / wall / args.workers:.1f}")
+    if ok:
+        print(f"latency ms p50 {percentile(ok, 50) * 1000:.0f}  p95 {percentile(ok, 95) * 1000:.0f}  p99 {percentile(ok, 99) * 1000:.0f}")
+    print(f"pool {password_hasher.stats()}")
+    if args.stored_method:
+        upgraded = users_collection.count_documents({"password": {"$ne": stored}})
+        print(f"accounts rehashed to the configured method: {upgraded}/{args.accounts}")
@@ -0,0 +1,152 @@
+"""
+Query plans and latencies for the hot Mongo lookups, before and after the
+startup indexes from extensions.ensure_indexes().
+
+Seeds a scratch database (default prepai_bench, never the app database)
+with --interviews session documents spread over --users users, then runs
+each query with only the _id index and again with the app indexes,
+printing the winning plan, documents/keys examined and latency.
+
+Needs a real MongoDB (mongomock has no query planner):
+
+    python bench/mongo_indexes.py --mongo-uri mongodb://localhost:27017/ --interviews 1000000
+    python bench/mongo_indexes.py --mongo-uri ... --reuse   # skip seeding if already there
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from load_test import percentile
+
+# Same projection as routes/interview.py, kept local so the bench does not import the routes
+HISTORY_SUMMARY_FIELDS = {"role": 1, "experience": 1, "focus": 1, "created_at": 1, "status": 1, "overall_score": 1}
+
+
+def seed(db, users, interviews, batch=10000):
+    db.users.drop()
+    db.interviews.drop()
+    db.users.insert_many(
+        [{"name": f"user{i}", "email": f"user{i}@example.com", "password": "x", "role": "candidate"} for i in range(users)]
+    )
+    user_ids = [str(u["_id"]) for u in db.users.find({}, {"_id": 1})]
+    start = datetime.utcnow() - timedelta(days=365)
+    inserted = 0
+    while inserted < interviews:
+        n = min(batch, interviews - inserted)
+        db.interviews.insert_many([
+            {
+                "user_id": random.choice(user_ids),
+                "role": "Software Engineer",
+                "experience": "0-2 years",
+                "focus": "Technical",
+                "created_at": start + timedelta(seconds=random.randint(0, 365 * 86400)),
+                "questions": [{"title": "Q", "description": "Explain a hash map."}],
+                "answers": [],
+                "status": "completed",
+            }
+            for _ in range(n)
+        ], ordered=False)
+        inserted += n
+        print(f"\rseeded {inserted}/{interviews}", end="", flush=True)
+    print()
+
+
+def plan_summary(explain):
+    """Flattens the winning plan into 'STAGE <- STAGE <- ...' (classic and SBE explain formats)."""
+    plan = explain["queryPlanner"]["winningPlan"]
+    plan = plan.get("queryPlan", plan)
+    stages = []
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage += f"({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return " <- ".join(stages)
+
+
+def measure(name, run, explain, reps):
+    samples = []
+    for _ in range(reps):
+        t = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    stats = explain()["executionStats"]
+    return {
+        "query": name,
+        "plan": plan_summary(explain()),
+        "docs": stats["totalDocsExamined"],
+        "keys": stats["totalKeysExamined"],
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+    }
+
+
+def run_queries(db, reps):
+    user = db.users.find_one({}, {"_id": 1, "email": 1}, skip=random.randint(0, db.users.estimated_document_count() - 1))
+    user_id = str(user["_id"])
+    session = db.interviews.find_one({"user_id": user_id}, {"_id": 1}) or {"_id": None}
+    history_filter = {"user_id": user_id}
+    history_sort = [("created_at", -1), ("_id", -1)]
+    delete_filter = {"_id": session["_id"], "user_id": user_id}
+
+    return [
+        measure(
+            "users by email",
+            lambda: db.users.find_one({"email": user["email"]}),
+            lambda: db.command("explain", {"find": "users", "filter": {"email": user["email"]}, "limit": 1}, verbosity="executionStats"),
+            reps,
+        ),
+        measure(
+            "history page (user_id, created_at)",
+            lambda: list(db.interviews.find(history_filter, HISTORY_SUMMARY_FIELDS).sort(history_sort).limit(21)),
+            lambda: db.interviews.find(history_filter, HISTORY_SUMMARY_FIELDS).sort(history_sort).limit(21).explain(),
+            reps,
+        ),
+        measure(
+            "delete filter (_id, user_id)",
+            lambda: db.interviews.find_one(delete_filter),
+            lambda: db.interviews.find(delete_filter).limit(1).explain(),
+            reps,
+        ),
+    ]
+
+
+def print_rows(title, rows):
+    print(f"\n=== {title} ===")
+    print(f"{'query':36} {'docs':>9} {'keys':>9} {'p50 ms':>9} {'p95 ms':>9}  plan")
+    for r in rows:
+        print(f"{r['query']:36} {r['docs']:>9} {r['keys']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9}  {r['plan']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mongo index benchmark")
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db", default="prepai_bench")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--interviews", type=int, default=1000000)
+    parser.add_argument("--reps", type=int, default=20)
+    parser.add_argument("--reuse", action="store_true", help="keep existing seeded data if the counts match")
+    args = parser.parse_args()
+
+    os.environ["MONGO_URI"] = args.mongo_uri
+    from extensions import client, ensure_indexes
+
+    db = client[args.db]
+    if not (args.reuse and db.interviews.estimated_document_count() == args.interviews):
+        seed(db, args.users, args.interviews)
+
+    db.users.drop_indexes()
+    db.interviews.drop_indexes()
+    print_rows("_id index only", run_queries(db, args.reps))
+
+    ensure_indexes(db)
+    print_rows("with startup indexes", run_queries(db, args.reps))
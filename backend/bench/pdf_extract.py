@@ -0,0 +1,100 @@
+"""
+PDF text extraction cost for 1-50 page resumes.
+
+Compares the original path (write a temp file, reopen it, build the text
+with +=) against utils/resume_parser.extract_text reading from memory:
+the whole document serially, the whole document page-parallel, and with
+the scoring prompt's character budget (what /api/resume/score does).
+
+    pip install pymupdf
+    python bench/pdf_extract.py --pages 1 5 20 50 --reps 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import fitz
+
+from load_test import percentile
+
+LINE = "Led a team of five engineers building payment APIs in Python and Go; cut p99 latency by 40%."
+
+
+def make_resume(pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(f"{number + 1}.{i} {LINE}" for i in range(45))
+        page.insert_textbox(fitz.Rect(54, 54, 558, 738), text, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_extract(data):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        text = ""
+        with fitz.open(path) as doc:
+            for page in doc:
+                text += page.get_text()
+        return text
+
+
+def timed_ms(fn, reps):
+    samples = []
+    for _ in range(reps):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 95)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF text extraction benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--reps", type=int, default=20)
+    parser.add_argument("--workers", type=int, help="page-parallel workers (default: PDF_EXTRACT_WORKERS)")
+    args = parser.parse_args()
+
+    from config import Config
+    from utils import resume_parser
+
+    workers = args.workers or max(2, Config.PDF_EXTRACT_WORKERS)
+    budget = Config.RESUME_PROMPT_CHARS
+
+    def serial(data, max_chars=None):
+        Config.PDF_EXTRACT_WORKERS = 1
+        return resume_parser.extract_text(data, max_chars)
+
+    def parallel(data, max_chars=None):
+        Config.PDF_EXTRACT_WORKERS = workers
+        return resume_parser.extract_text(data, max_chars)
+
+    # Start the pool outside the timings
+    Config.PDF_EXTRACT_WORKERS = workers
+    resume_parser._page_pool().submit(int).result()
+
+    print(f"page-parallel from {Config.PDF_PARALLEL_MIN_PAGES} pages on {workers} workers, prompt budget {budget} chars")
+    print(f"\n{'pages':>5} {'mode':28} {'p50 ms':>9} {'p95 ms':>9} {'chars':>8}")
+    for pages in args.pages:
+        data = make_resume(pages)
+        full = legacy_extract(data)
+        assert serial(data) == full and parallel(data) == full
+        for name, fn in (
+            ("temp file + text +=", lambda: legacy_extract(data)),
+            ("in memory, serial", lambda: serial(data)),
+            ("in memory, page-parallel", lambda: parallel(data)),
+            (f"in memory, {budget}-char budget", lambda: parallel(data, budget)),
+        ):
+            p50, p95 = timed_ms(fn, args.reps)
+            print(f"{pages:>5} {name:28} {p50:>9.2f} {p95:>9.2f} {len(fn()):>8}")
@@ -0,0 +1,105 @@
+"""
+Per-resume throughput of the spaCy fallback parser.
+
+Compares the old ml/nlp parser's approach (full en_core_web_sm pipeline, a
+Matcher rebuilt for every resume, one nlp() call each) with
+utils/resume_parser: the trimmed pipeline one resume at a time, and
+parse_resumes_with_spacy batching through nlp.pipe. PDF extraction is
+timed separately since both paths now share it.
+
+    pip install spacy pymupdf && python -m spacy download en_core_web_sm
+    python bench/resume_nlp.py --resumes 200 --batch-size 16
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from pdf_extract import make_resume
+
+# The old parser's hand-written skill patterns
+SKILL_PATTERNS = [
+    [{"LOWER": "python"}], [{"LOWER": "java"}], [{"LOWER": "javascript"}],
+    [{"LOWER": "react"}], [{"LOWER": "fastapi"}], [{"LOWER": "opencv"}],
+    [{"LOWER": "tensorflow"}], [{"LOWER": "pytorch"}],
+    [{"LOWER": "machine"}, {"LOWER": "learning"}],
+]
+
+SECTIONS = [
+    "Jane Doe, Software Engineer. Berlin, Germany.",
+    "Experience: Senior Engineer at Stripe, 2020-2024. Built payment APIs in Python and Go.",
+    "Engineer at Zalando, 2017-2020. Worked on React front ends and FastAPI services.",
+    "Education: MSc in Computer Science, Technical University of Munich. BSc at RWTH Aachen University.",
+    "Skills: Python, Java, JavaScript, TensorFlow, PyTorch, OpenCV, machine learning, Kubernetes.",
+]
+
+
+def make_text(i):
+    return f"Resume {i}. " + " ".join(SECTIONS) * 3
+
+
+def rate(label, seconds, count):
+    print(f"{label:36} {count / seconds:>10.1f} {seconds / count * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="spaCy resume parsing throughput")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, help="nlp.pipe batch size (default: SPACY_BATCH_SIZE)")
+    parser.add_argument("--pages", type=int, default=2, help="pages per PDF for the extraction timing")
+    args = parser.parse_args()
+
+    import spacy
+    from spacy.matcher import Matcher
+
+    from config import Config
+    from utils.resume_parser import (
+        extract_text, get_nlp, parse_resume_with_spacy, parse_resumes_with_spacy,
+    )
+
+    texts = [make_text(i) for i in range(args.resumes)]
+
+    t = time.perf_counter()
+    full = spacy.load(Config.SPACY_MODEL)
+    full_load = time.perf_counter() - t
+    t = time.perf_counter()
+    if get_nlp() is None:
+        sys.exit("spaCy model unavailable")
+    trimmed_load = time.perf_counter() - t
+
+    def legacy(text):
+        doc = full(text)
+        matcher = Matcher(full.vocab)
+        matcher.add("SKILLS", SKILL_PATTERNS)
+        skills = [doc[s:e].text for _, s, e in matcher(doc)]
+        orgs = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+        education = [tok.sent.text for tok in doc if tok.text.lower() in ("university", "college", "msc", "bsc")]
+        return skills, orgs, education
+
+    print(f"model {Config.SPACY_MODEL}: full pipeline {full.pipe_names}, loaded in {full_load:.2f}s")
+    print(f"fallback pipeline {get_nlp().pipe_names}, loaded in {trimmed_load:.2f}s")
+    print(f"\n{'mode':36} {'resumes/s':>10} {'ms each':>10}")
+
+    t = time.perf_counter()
+    for text in texts:
+        legacy(text)
+    rate("old: full pipeline, nlp() each", time.perf_counter() - t, len(texts))
+
+    t = time.perf_counter()
+    for text in texts:
+        parse_resume_with_spacy(text)
+    rate("trimmed pipeline, one at a time", time.perf_counter() - t, len(texts))
+
+    t = time.perf_counter()
+    parse_resumes_with_spacy(texts, batch_size=args.batch_size)
+    rate("trimmed pipeline, nlp.pipe batch", time.perf_counter() - t, len(texts))
+
+    pdf = make_resume(args.pages)
+    t = time.perf_counter()
+    for _ in range(len(texts)):
+        extract_text(pdf)
+    rate(f"PyMuPDF extraction ({args.pages} pages)", time.perf_counter() - t, len(texts))
@@ -0,0 +1,136 @@
+"""
+Compares the Flask dev server with the ASGI serving mode (asgi.py on uvicorn)
+under many concurrent interview sessions waiting on a slow model.
+
+Each mode runs in its own subprocess against mongomock and the fake Ollama
+server; the parent drives both with the same load and prints the reports
+side by side.
+
+    pip install mongomock uvicorn starlette
+    python bench/serving_compare.py --users 200 --iterations 2 --ttft 1.0
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import httpx
+
+from fake_ollama import start_fake_ollama
+from load_test import print_report, run_load, use_mongomock
+
+
+class ThreadedAsyncCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    async def to_list(self, length=None):
+        return await asyncio.to_thread(lambda: list(self.cursor if length is None else self.cursor.limit(length)))
+
+
+class ThreadedAsyncCollection:
+    """Awaitable facade over a sync (mongomock) collection, standing in for Motor."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return ThreadedAsyncCursor(self.collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+
+class ThreadedAsyncDB:
+    def __init__(self, db):
+        self.db = db
+
+    def __getitem__(self, name):
+        return ThreadedAsyncCollection(self.db[name])
+
+
+def serve(mode, port):
+    shared = use_mongomock()
+    if mode == "flask":
+        from werkzeug.serving import run_simple
+        from app import app
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        run_simple("127.0.0.1", port, app, threaded=True)
+    else:
+        import uvicorn
+        import asgi
+        asgi.set_async_db(ThreadedAsyncDB(shared["prepai"]))
+        uvicorn.run(asgi.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def wait_ready(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flask vs ASGI serving benchmark")
+    parser.add_argument("--serve", choices=["flask", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--ollama-port", type=int, default=11436)
+    parser.add_argument("--ttft", type=float, default=1.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        sys.exit(0)
+
+    fake = start_fake_ollama(port=args.ollama_port, ttft=args.ttft, tokens_per_sec=args.tokens_per_sec)
+    env = dict(
+        os.environ,
+        OLLAMA_HOST=f"http://127.0.0.1:{args.ollama_port}",
+        # Let the model server, not the gateway cap, be the bottleneck
+        LLM_MAX_INFLIGHT=str(args.users * 2),
+        LLM_POOL_SIZE=str(args.users * 2),
+        QUESTION_PREFETCH_DEPTH="0",
+    )
+
+    reports = {}
+    for mode in ("flask", "asgi"):
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(args.port)],
+            cwd=BACKEND_DIR, env=env,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            wait_ready(base_url)
+            reports[mode] = run_load(base_url, args.users, args.iterations, include_resume=False)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    fake.shutdown()
+    for mode, report in reports.items():
+        print(f"\n=== {mode} ===")
+        print_report(report)
@@ -0,0 +1,118 @@
+"""
+Document size and /next read cost for one long interview session, stored
+the old way (questions/answers arrays inline on the interview document)
+and bucketed (small header + fixed-size buckets, models/session_store.py).
+
+The /next read is what the route does before generating: the old layout
+reads the whole document; the bucketed one reads the projected header and
+the question text from the question buckets.
+
+    pip install mongomock
+    python bench/session_storage.py --questions 100 --reads 300
+    python bench/session_storage.py --mongo-uri mongodb://localhost:27017/   # cleans up after itself
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+import bson
+
+from load_test import percentile, use_mongomock
+
+
+def make_question(i):
+    return {
+        "title": f"Question {i}: design a rate limiter",
+        "description": "Explain how you would design a distributed rate limiter for a public API, "
+                       "covering algorithms, storage, consistency and failure modes. " * 2,
+    }
+
+
+def make_answer(i):
+    return {
+        "question": f"Question {i}: design a rate limiter",
+        "answer": "I would start with a token bucket per API key stored in Redis... " * 20,
+        "feedback": {"clarity_score": 7, "confidence_score": 6, "feedback": "Clear structure, mention sliding windows."},
+    }
+
+
+def timed_us(fn, reps):
+    samples = []
+    for _ in range(reps):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1e6)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 95)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inline vs bucketed interview storage")
+    parser.add_argument("--questions", type=int, default=100, help="questions (and answers) in the session")
+    parser.add_argument("--reads", type=int, default=300)
+    parser.add_argument("--mongo-uri", help="use a real MongoDB instead of mongomock")
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        os.environ["MONGO_URI"] = args.mongo_uri
+    else:
+        use_mongomock()
+
+    from extensions import interview_buckets_collection, interviews_collection
+    from models.session_store import (
+        BUCKET_SIZE, QUESTION_TEXT_FIELDS, SESSION_HEADER_FIELDS, append_item, create_session, get_header,
+        load_items, new_session,
+    )
+
+    questions = [make_question(i) for i in range(args.questions)]
+    answers = [make_answer(i) for i in range(args.questions)]
+
+    legacy = {**new_session("bench-user", "Software Engineer", "0-2 years", "Technical"), "questions": questions, "answers": answers}
+    del legacy["bucketed"]
+    legacy_id = interviews_collection.insert_one(legacy).inserted_id
+
+    session_id = create_session(new_session("bench-user", "Software Engineer", "0-2 years", "Technical"), questions[0])
+    for q in questions[1:]:
+        append_item(session_id, "questions", q)
+    for a in answers:
+        append_item(session_id, "answers", a)
+
+    try:
+        legacy_doc = interviews_collection.find_one({"_id": legacy_id})
+        header_doc = interviews_collection.find_one({"_id": bson.ObjectId(session_id)})
+        bucket_sizes = [len(bson.encode(b)) for b in interview_buckets_collection.find({"session_id": bson.ObjectId(session_id)})]
+
+        def legacy_next():
+            session = interviews_collection.find_one({"_id": legacy_id})
+            return session["role"], session.get("questions", [])
+
+        def bucketed_next():
+            session = get_header(session_id)
+            return session["role"], load_items(session, "questions", QUESTION_TEXT_FIELDS)
+
+        def header_only():
+            return interviews_collection.find_one({"_id": bson.ObjectId(session_id)}, SESSION_HEADER_FIELDS)
+
+        print(f"session with {args.questions} questions and {args.questions} answers, bucket size {BUCKET_SIZE}")
+        print(f"\n{'document':34} {'bytes':>10}")
+        print(f"{'inline interview document':34} {len(bson.encode(legacy_doc)):>10}")
+        print(f"{'bucketed header':34} {len(bson.encode(header_doc)):>10}")
+        print(f"{'largest bucket':34} {max(bucket_sizes):>10}")
+        print(f"{'buckets':34} {len(bucket_sizes):>10}")
+
+        print(f"\n{'read':34} {'p50 us':>10} {'p95 us':>10}")
+        for name, fn in (
+            ("/next read, inline document", legacy_next),
+            ("/next read, header + questions", bucketed_next),
+            ("header only (submit/complete)", header_only),
+        ):
+            p50, p95 = timed_us(fn, args.reads)
+            print(f"{name:34} {p50:>10.0f} {p95:>10.0f}")
+    finally:
+        interviews_collection.delete_many({"_id": {"$in": [legacy_id, bson.ObjectId(session_id)]}})
+        interview_buckets_collection.delete_many({"session_id": bson.ObjectId(session_id)})
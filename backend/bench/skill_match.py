@@ -0,0 +1,104 @@
+"""
+Skill matching throughput against taxonomy size.
+
+Pads the shipped taxonomy (data/skill_taxonomy.json) with synthetic one- to
+three-word skills up to each --sizes value and runs the same resumes through:
+a per-phrase regex scan (what growing the old pattern list amounts to), the
+compiled token trie in utils/skill_taxonomy.py, and, if spaCy is installed, a
+PhraseMatcher on a blank English tokenizer.
+
+    python bench/skill_match.py --sizes 200 1000 10000 50000 --resumes 200
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from resume_nlp import make_text
+
+WORDS = ("data", "cloud", "stream", "graph", "edge", "vector", "query", "cache", "mesh", "flow",
+         "ops", "lake", "core", "sync", "node", "grid", "pulse", "forge", "shift", "scope")
+
+
+def build_skills(base, size, rng):
+    skills = list(base)
+    n = 0
+    while len(skills) < size:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        name = " ".join(words) + f" {n}x"
+        skills.append({"name": name, "category": "synthetic", "aliases": [name.replace(" ", "-")]})
+        n += 1
+    return skills
+
+
+def regex_scan(skills):
+    compiled = []
+    for skill in skills:
+        for phrase in (skill["name"], *skill.get("aliases", ())):
+            compiled.append((skill["name"], re.compile(r"(?<!\w)" + re.escape(phrase.lower()) + r"(?!\w)")))
+
+    def match(text):
+        lowered = text.lower()
+        return {name for name, pattern in compiled if pattern.search(lowered)}
+    return match
+
+
+def phrase_matcher(skills):
+    import spacy
+    from spacy.matcher import PhraseMatcher
+
+    nlp = spacy.blank("en")
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    for skill in skills:
+        matcher.add(skill["name"], list(nlp.tokenizer.pipe([skill["name"], *skill.get("aliases", ())])))
+
+    def match(text):
+        doc = nlp.make_doc(text)
+        return {nlp.vocab.strings[match_id] for match_id, _, _ in matcher(doc)}
+    return match
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Skill taxonomy matching benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 10000, 50000])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--regex-max", type=int, default=10000, help="skip the regex scan above this size")
+    args = parser.parse_args()
+
+    from config import Config
+    from utils.skill_taxonomy import SkillTaxonomy
+
+    with open(Config.SKILL_TAXONOMY_PATH, encoding="utf-8") as f:
+        base = json.load(f)["skills"]
+    texts = [make_text(i) for i in range(args.resumes)]
+    rng = random.Random(7)
+
+    engines = [("regex per phrase", regex_scan), ("token trie", lambda s: SkillTaxonomy(s).match)]
+    try:
+        import spacy  # noqa: F401
+        engines.append(("spaCy PhraseMatcher", phrase_matcher))
+    except ImportError:
+        print("spaCy not installed, skipping PhraseMatcher")
+
+    print(f"{args.resumes} resumes of ~{len(texts[0])} chars; shipped taxonomy has {len(base)} skills")
+    print(f"\n{'skills':>7} {'engine':22} {'build ms':>9} {'resumes/s':>10} {'matches/s':>11} {'found':>6}")
+    for size in args.sizes:
+        skills = build_skills(base, size, rng)
+        for name, build in engines:
+            if name == "regex per phrase" and size > args.regex_max:
+                continue
+            t = time.perf_counter()
+            match = build(skills)
+            build_ms = (time.perf_counter() - t) * 1000
+            t = time.perf_counter()
+            found = [match(text) for text in texts]
+            elapsed = time.perf_counter() - t
+            total = sum(len(f) for f in found)
+            print(f"{size:>7} {name:22} {build_ms:>9.1f} {len(texts) / elapsed:>10.0f} {total / elapsed:>11.0f} {len(found[0]):>6}")
@@ -6,4 +6,93 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "prepai_local_dev_key_2026")
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-    DB_NAME = "prepai"
\ No newline at end of file
+    DB_NAME = "prepai"
+    # One pooled MongoClient is shared by the whole process
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+    MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+    CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+
+    # Auth: in-process caches of slim user records and decoded tokens (0 TTL disables)
+    AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+    AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+    AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+
+    # Password hashing pool; changing the method/cost rehashes users on their next login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "32"))
+    PASSWORD_POOL_TIMEOUT = float(os.getenv("PASSWORD_POOL_TIMEOUT", "10"))
+
+    # LLM gateway (shared pooled connection to the Ollama server)
+    OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")
+    OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3:8b")
+    LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+    LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "16"))
+    LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+    LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+    # Circuit breaker: trip after N consecutive failures, probe again after reset seconds
+    LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+    LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+    # Per-route latency budgets (seconds, queueing included) before falling back
+    LLM_BUDGET_QUESTION = float(os.getenv("LLM_BUDGET_QUESTION", "20"))
+    LLM_BUDGET_REVIEW = float(os.getenv("LLM_BUDGET_REVIEW", "20"))
+    LLM_BUDGET_RESUME = float(os.getenv("LLM_BUDGET_RESUME", "45"))
+
+    # Questions/answers stored per bucket document (models/session_store.py)
+    INTERVIEW_BUCKET_SIZE = int(os.getenv("INTERVIEW_BUCKET_SIZE", "20"))
+
+    # /api/interview/history page sizes
+    HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "100"))
+
+    # Background question prefetch for /api/interview/next
+    QUESTION_PREFETCH_DEPTH = int(os.getenv("QUESTION_PREFETCH_DEPTH", "2"))
+    QUESTION_PREFETCH_WORKERS = int(os.getenv("QUESTION_PREFETCH_WORKERS", "2"))
+    # Distinct question generations allowed in flight for one identical prompt
+    QUESTION_VARIANTS = int(os.getenv("QUESTION_VARIANTS", "3"))
+
+    # Question bank: serve stored questions once this many LLM calls are queued
+    QUESTION_BANK_QUEUE_THRESHOLD = int(os.getenv("QUESTION_BANK_QUEUE_THRESHOLD", "4"))
+    QUESTION_BANK_DUP_THRESHOLD = float(os.getenv("QUESTION_BANK_DUP_THRESHOLD", "0.9"))
+
+    # Resume uploads stored in GridFS through /api/profile/resume
+    RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # PDF text extraction for /api/resume/score
+    RESUME_PROMPT_CHARS = int(os.getenv("RESUME_PROMPT_CHARS", "2000"))
+    # The local keyword scan (utils/ats_scorer.py) reads further than the prompt.
+    # With RESUME_PREFILL it supplies score and missing_keywords so the LLM only writes
+    # the narrative; off until bench/ats_prescore.py --llm shows it agrees with a real model
+    RESUME_SCAN_CHARS = int(os.getenv("RESUME_SCAN_CHARS", "20000"))
+    RESUME_PREFILL = os.getenv("RESUME_PREFILL", "false").lower() == "true"
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+
+    # spaCy fallback for structured resume parsing (loaded on first use)
+    SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "16"))
+    # Versioned skill names and aliases (see utils/skill_taxonomy.py)
+    SKILL_TAXONOMY_PATH = os.getenv(
+        "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+    )
+
+    # Result cache for /api/resume/score
+    RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+    RESUME_CACHE_TTL = int(os.getenv("RESUME_CACHE_TTL", "86400"))
+    RESUME_CACHE_PERSIST = os.getenv("RESUME_CACHE_PERSIST", "true").lower() == "true"
+
+    # Async job mode for /api/resume/score?async=1
+    RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "2"))
+    RESUME_JOB_MAX_PENDING = int(os.getenv("RESUME_JOB_MAX_PENDING", "50"))
+    RESUME_JOB_TTL = int(os.getenv("RESUME_JOB_TTL", "600"))
+
+    # /api/resume/score/bulk: concurrent scorings across all batches, resumes
+    # read and in flight per batch, and the batch size limit
+    RESUME_BULK_CONCURRENCY = int(os.getenv("RESUME_BULK_CONCURRENCY", "4"))
+    RESUME_BULK_WINDOW = int(os.getenv("RESUME_BULK_WINDOW", "8"))
+    RESUME_BULK_MAX_FILES = int(os.getenv("RESUME_BULK_MAX_FILES", "1000"))
@@ -1,17 +1,64 @@
-import os
-from pymongo import MongoClient
-from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
+from config import Config
 
-load_dotenv()
+# Shared by the sync client here and the Motor client in asgi.py
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+    "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+    "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+    "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+    "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "socketTimeoutMS": Config.MONGO_SOCKET_TIMEOUT_MS,
+    "readPreference": Config.MONGO_READ_PREFERENCE,
+}
 
-mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+client = MongoClient(Config.MONGO_URI, **MONGO_CLIENT_OPTIONS)
 
-client = MongoClient(mongo_uri)
-
-db = client["prepai"]
+db = client[Config.DB_NAME]
 
 users_collection = db["users"]
 
 interviews_collection = db["interviews"]
 
-print("MongoDB connected successfully")
\ No newline at end of file
+interview_buckets_collection = db["interview_buckets"]
+
+resume_cache_collection = db["resume_score_cache"]
+
+question_bank_collection = db["question_bank"]
+
+user_stats_collection = db["user_stats"]
+
+print("MongoDB connected successfully")
+
+# ============================
+# Indexes
+# ============================
+INDEXES = {
+    # Login, signup and token_required look users up by email
+    "users": [([("email", ASCENDING)], {"unique": True, "name": "email_unique"})],
+    # /history pages a user's sessions by (created_at, _id) desc; delete filters on user_id
+    "interviews": [(
+        [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+        {"name": "user_created_id"},
+    )],
+    # Questions/answers buckets are read per session in insertion order
+    "interview_buckets": [(
+        [("session_id", ASCENDING), ("kind", ASCENDING), ("_id", ASCENDING)],
+        {"name": "session_kind"},
+    )],
+}
+
+
+def ensure_indexes(database=None):
+    """Creates the app's indexes; a no-op for ones that already exist."""
+    database = database if database is not None else db
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                database[collection].create_index(keys, **options)
+            except ServerSelectionTimeoutError as e:
+                print(f"Skipping index creation, MongoDB unreachable: {e}")
+                return
+            except PyMongoError as e:
+                print(f"Index {collection}.{options['name']} not created: {e}")
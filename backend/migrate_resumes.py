@@ -0,0 +1,12 @@
+"""
+Moves resumes stored inline as base64 (users.resume_data) into the
+GridFS "resumes" bucket and drops the blob from the user document.
+Idempotent; re-run until it reports 0.
+
+    python migrate_resumes.py
+"""
+from models.resume_store import migrate_inline_resumes
+
+if __name__ == "__main__":
+    count = migrate_inline_resumes()
+    print(f"Migrated {count} resume(s) to GridFS")
@@ -0,0 +1,120 @@
+import base64
+import hashlib
+from datetime import datetime
+
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+
+from config import Config
+from extensions import db, users_collection
+from utils.auth_helpers import invalidate_user
+
+# Resume PDFs live in the "resumes" GridFS bucket (resumes.files / resumes.chunks);
+# the user document only keeps a reference and the metadata below.
+RESUME_FIELDS = {
+    "resume_file_id": 1, "resume_filename": 1, "resume_content_type": 1,
+    "resume_size": 1, "resume_sha256": 1, "resume_updated_at": 1,
+}
+
+READ_SIZE = 64 * 1024
+
+_bucket = None
+
+
+class ResumeTooLarge(Exception):
+    pass
+
+
+def resume_bucket():
+    global _bucket
+    if _bucket is None:
+        _bucket = GridFSBucket(db, bucket_name="resumes")
+    return _bucket
+
+
+def _store(user_id, chunks, filename, content_type, max_bytes=None):
+    """Writes chunks to GridFS while hashing them. Returns the resume metadata fields."""
+    digest = hashlib.sha256()
+    size = 0
+    upload = resume_bucket().open_upload_stream(
+        filename or "resume.pdf",
+        metadata={"user_id": str(user_id), "content_type": content_type},
+    )
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ResumeTooLarge(f"Resume exceeds the {max_bytes // 1024} KB limit")
+            digest.update(chunk)
+            upload.write(chunk)
+        upload.sha256 = digest.hexdigest()
+        upload.close()
+    except BaseException:
+        upload.abort()
+        raise
+    return {
+        "resume_file_id": upload._id,
+        "resume_filename": filename,
+        "resume_content_type": content_type,
+        "resume_size": size,
+        "resume_sha256": digest.hexdigest(),
+        "resume_updated_at": datetime.utcnow(),
+    }
+
+
+def _swap(user, fields):
+    """Points the user at the new file, then deletes the file it replaces."""
+    users_collection.update_one(
+        {"_id": user["_id"]},
+        {"$set": fields, "$unset": {"resume_data": ""}},
+    )
+    invalidate_user(user["email"])
+    old_id = user.get("resume_file_id")
+    if old_id and old_id != fields["resume_file_id"]:
+        try:
+            resume_bucket().delete(old_id)
+        except NoFile:
+            pass
+        except Exception as e:
+            # The user already points at the new file; an orphan is harmless
+            print(f"Failed to delete replaced resume {old_id}: {e}")
+
+
+def save_resume(user, stream, filename, content_type="application/pdf"):
+    """Streams an uploaded file into GridFS without holding it in memory."""
+    chunks = iter(lambda: stream.read(READ_SIZE), b"")
+    fields = _store(user["_id"], chunks, filename, content_type, Config.RESUME_MAX_BYTES)
+    _swap(user, fields)
+    return fields
+
+
+def get_resume_meta(user_id):
+    user = users_collection.find_one({"_id": user_id}, RESUME_FIELDS)
+    if not user or not user.get("resume_file_id"):
+        return None
+    return user
+
+
+def open_resume(file_id):
+    """Seekable, chunk-at-a-time reader over a stored resume."""
+    return resume_bucket().open_download_stream(file_id)
+
+
+def migrate_inline_resumes():
+    """
+    Moves base64 resume_data blobs from user documents into GridFS.
+    Safe to re-run: only users that still carry resume_data are touched.
+    Returns the number of users migrated.
+    """
+    migrated = 0
+    cursor = users_collection.find(
+        {"resume_data": {"$exists": True}},
+        {"email": 1, "resume_data": 1, "resume_filename": 1, "resume_file_id": 1},
+    )
+    for user in cursor:
+        raw = base64.b64decode(user["resume_data"])
+        chunks = (raw[i:i + READ_SIZE] for i in range(0, len(raw), READ_SIZE))
+        fields = _store(user["_id"], chunks, user.get("resume_filename") or "resume.pdf", "application/pdf")
+        _swap(user, fields)
+        migrated += 1
+    return migrated
@@ -0,0 +1,133 @@
+from datetime import datetime
+from bson import ObjectId
+from config import Config
+from extensions import interviews_collection, interview_buckets_collection
+
+# An interview is a small header document in `interviews` plus fixed-size
+# buckets in `interview_buckets`:
+#   {session_id, kind: "questions" | "answers", count, items: [...]}
+# Appends go to the session's open bucket (count < BUCKET_SIZE) or upsert a
+# new one, so no document grows without bound. Sessions created before
+# bucketing keep their inline questions/answers arrays and are read as-is.
+BUCKET_SIZE = Config.INTERVIEW_BUCKET_SIZE
+
+KINDS = ("questions", "answers")
+COUNT_FIELDS = {"questions": "question_count", "answers": "answer_count"}
+
+# Everything /next, /submit and /complete need from the header
+SESSION_HEADER_FIELDS = {"user_id": 1, "role": 1, "experience": 1, "focus": 1, "status": 1, "bucketed": 1}
+
+# What /next needs from each asked question to avoid repeats
+QUESTION_TEXT_FIELDS = {"items.title": 1, "items.description": 1}
+
+# What deleting a session must take back out of the user's stats
+DELETED_SESSION_FIELDS = {"user_id": 1, "focus": 1, "status": 1, "overall_score": 1, "bucketed": 1, "answers.feedback": 1}
+
+
+def new_session(user_id, role, experience, focus):
+    return {
+        "user_id": user_id,
+        "role": role,
+        "experience": experience,
+        "focus": focus,
+        "created_at": datetime.utcnow(),
+        "status": "active",
+        "bucketed": True,
+        "question_count": 0,
+        "answer_count": 0,
+    }
+
+
+# ============================
+# Query builders (shared with the Motor code in asgi.py)
+# ============================
+def bucket_append(session_id, kind, item):
+    """(filter, update) for update_one(..., upsert=True) that appends `item` to the open bucket."""
+    return (
+        {"session_id": ObjectId(session_id), "kind": kind, "count": {"$lt": BUCKET_SIZE}},
+        {"$push": {"items": item}, "$inc": {"count": 1}, "$setOnInsert": {"created_at": datetime.utcnow()}},
+    )
+
+
+def session_query(session_id, user_id=None):
+    """Header filter; with user_id only the owner's session matches."""
+    query = {"_id": ObjectId(session_id)}
+    if user_id is not None:
+        query["user_id"] = user_id
+    return query
+
+
+def count_increment(kind):
+    return {"$inc": {COUNT_FIELDS[kind]: 1}}
+
+
+def bucket_query(session_id, kind):
+    return {"session_id": ObjectId(session_id), "kind": kind}
+
+
+def flatten(buckets):
+    return [item for bucket in buckets for item in bucket.get("items", [])]
+
+
+# ============================
+# Sync API
+# ============================
+def create_session(header, first_question):
+    """Inserts the header and the first question. Returns the session id."""
+    header["question_count"] = 1
+    result = interviews_collection.insert_one(header)
+    interview_buckets_collection.update_one(*bucket_append(result.inserted_id, "questions", first_question), upsert=True)
+    return str(result.inserted_id)
+
+
+def get_header(session_id, user_id=None, fields=SESSION_HEADER_FIELDS):
+    return interviews_collection.find_one(session_query(session_id, user_id), fields)
+
+
+def append_item(session_id, kind, item, user_id=None):
+    """Appends to the session's buckets and returns the header (projected), or None if not found / not owned."""
+    header = interviews_collection.find_one_and_update(
+        session_query(session_id, user_id), count_increment(kind), projection=SESSION_HEADER_FIELDS
+    )
+    if header is not None:
+        interview_buckets_collection.update_one(*bucket_append(session_id, kind, item), upsert=True)
+    return header
+
+
+def load_items(header, kind, fields=None):
+    """All items of `kind` for a session, in order: legacy inline array first, then buckets."""
+    items = []
+    if not header.get("bucketed"):
+        legacy = interviews_collection.find_one({"_id": header["_id"]}, {kind: 1}) or {}
+        items.extend(legacy.get(kind, []))
+    buckets = interview_buckets_collection.find(bucket_query(header["_id"], kind), fields).sort("_id", 1)
+    items.extend(flatten(buckets))
+    return items
+
+
+def load_session(session_id, user_id):
+    """Full session (header + questions + answers) as one dict, or None."""
+    session = get_header(session_id, user_id, fields=None)
+    if session is None:
+        return None
+    for kind in KINDS:
+        buckets = interview_buckets_collection.find(bucket_query(session_id, kind)).sort("_id", 1)
+        session[kind] = session.get(kind, []) + flatten(buckets)
+    return session
+
+
+def remove_session(session_id, user_id):
+    """
+    Deletes the session and its buckets. Returns the deleted header with all
+    its answers (feedback only) under "answers", for session_deleted_update(),
+    or None if there was nothing to delete.
+    """
+    header = interviews_collection.find_one_and_delete(
+        session_query(session_id, user_id), projection=DELETED_SESSION_FIELDS
+    )
+    if header is None:
+        return None
+    buckets = interview_buckets_collection.find(bucket_query(session_id, "answers"), {"items.feedback": 1})
+    header["answers"] = header.get("answers", []) + flatten(buckets)
+    interview_buckets_collection.delete_many({"session_id": ObjectId(session_id)})
+    return header
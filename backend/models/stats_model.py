@@ -0,0 +1,184 @@
+from datetime import datetime
+from extensions import interview_buckets_collection, interviews_collection, user_stats_collection
+
+# One document per user, _id = user_id, kept current with $inc:
+# {
+#   "totals":   {sessions, completed, score_sum, scored, answers, clarity_sum, confidence_sum},
+#   "by_focus": {"<focus>": {same counters}},
+# }
+COUNTERS = ("sessions", "completed", "score_sum", "scored", "answers", "clarity_sum", "confidence_sum")
+
+
+def focus_key(focus):
+    """Focus labels become field names, so strip what Mongo does not allow there."""
+    key = str(focus or "Other").replace(".", "_").lstrip("$")
+    return key or "Other"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _inc(focus, counters):
+    fields = {}
+    for name, value in counters.items():
+        fields[f"totals.{name}"] = value
+        fields[f"by_focus.{focus_key(focus)}.{name}"] = value
+    return {"$inc": fields, "$set": {"updated_at": datetime.utcnow()}}
+
+
+# ============================
+# Updates (apply with update_one({"_id": user_id}, update, upsert=True))
+# ============================
+def session_started_update(focus):
+    return _inc(focus, {"sessions": 1})
+
+
+def answer_update(focus, review):
+    counters = {"answers": 1}
+    if _is_number(review.get("clarity_score")):
+        counters["clarity_sum"] = review["clarity_score"]
+    if _is_number(review.get("confidence_score")):
+        counters["confidence_sum"] = review["confidence_score"]
+    return _inc(focus, counters)
+
+
+def completion_update(focus, overall_score, before=None):
+    """`before` is the session as it was prior to this /complete call."""
+    counters = {"completed": 0, "score_sum": 0, "scored": 0}
+    if before and before.get("status") == "completed":
+        # Completed again: swap the old score for the new one instead of counting twice
+        if _is_number(before.get("overall_score")):
+            counters["score_sum"] -= before["overall_score"]
+            counters["scored"] -= 1
+    else:
+        counters["completed"] = 1
+    if _is_number(overall_score):
+        counters["score_sum"] += overall_score
+        counters["scored"] += 1
+    return _inc(focus, counters)
+
+
+def session_deleted_update(session):
+    """Takes a deleted session (remove_session()'s return value) back out of every counter it added to."""
+    counters = {"sessions": -1, "answers": 0, "clarity_sum": 0, "confidence_sum": 0}
+    if session.get("status") == "completed":
+        counters["completed"] = -1
+        if _is_number(session.get("overall_score")):
+            counters["score_sum"] = -session["overall_score"]
+            counters["scored"] = -1
+    for answer in session.get("answers", []):
+        review = answer.get("feedback") or {}
+        counters["answers"] -= 1
+        if _is_number(review.get("clarity_score")):
+            counters["clarity_sum"] -= review["clarity_score"]
+        if _is_number(review.get("confidence_score")):
+            counters["confidence_sum"] -= review["confidence_score"]
+    return _inc(session.get("focus"), counters)
+
+
+def apply_update(user_id, update):
+    """Stats are secondary to the request that triggered them, so failures are only logged."""
+    try:
+        user_stats_collection.update_one({"_id": user_id}, update, upsert=True)
+    except Exception as e:
+        print(f"User stats update failed: {e}")
+
+
+# ============================
+# Reads
+# ============================
+def _summary(bucket):
+    answers = bucket.get("answers", 0)
+    scored = bucket.get("scored", 0)
+    return {
+        "sessions": bucket.get("sessions", 0),
+        "completed": bucket.get("completed", 0),
+        "avg_score": round(bucket.get("score_sum", 0) / scored, 1) if scored else 0,
+        "answers": answers,
+        "avg_clarity": round(bucket.get("clarity_sum", 0) / answers, 2) if answers else 0,
+        "avg_confidence": round(bucket.get("confidence_sum", 0) / answers, 2) if answers else 0,
+    }
+
+
+def summarize_stats(doc):
+    doc = doc or {}
+    return {
+        **_summary(doc.get("totals", {})),
+        "by_focus": {focus: _summary(bucket) for focus, bucket in doc.get("by_focus", {}).items()},
+    }
+
+
+def get_user_stats(user_id):
+    return summarize_stats(user_stats_collection.find_one({"_id": user_id}))
+
+
+# ============================
+# Backfill
+# ============================
+def rebuild_user_stats(user_id=None):
+    """
+    Recomputes stats documents from interview history, for one user or all.
+    Each user's document is replaced in one write; increments that land
+    while the aggregation runs can be overwritten, so run it off-peak.
+    Returns the number of users rebuilt.
+    """
+    match = {"user_id": user_id} if user_id else {}
+    # Session counters, plus answers still stored inline on pre-bucketing sessions
+    sessions_pipeline = [
+        {"$match": match},
+        {"$project": {
+            "user_id": 1,
+            "focus": 1,
+            "completed": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]},
+            "score": {"$cond": [{"$isNumber": "$overall_score"}, "$overall_score", None]},
+            "answers": {"$size": {"$ifNull": ["$answers", []]}},
+            "clarity_sum": {"$sum": "$answers.feedback.clarity_score"},
+            "confidence_sum": {"$sum": "$answers.feedback.confidence_score"},
+        }},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "focus": "$focus"},
+            "sessions": {"$sum": 1},
+            "completed": {"$sum": "$completed"},
+            "score_sum": {"$sum": "$score"},
+            "scored": {"$sum": {"$cond": [{"$eq": ["$score", None]}, 0, 1]}},
+            "answers": {"$sum": "$answers"},
+            "clarity_sum": {"$sum": "$clarity_sum"},
+            "confidence_sum": {"$sum": "$confidence_sum"},
+        }},
+    ]
+    # Answer counters from the bucket documents, attributed through the session header
+    buckets_pipeline = [
+        {"$match": {"kind": "answers"}},
+        {"$group": {
+            "_id": "$session_id",
+            "answers": {"$sum": "$count"},
+            "clarity_sum": {"$sum": {"$sum": "$items.feedback.clarity_score"}},
+            "confidence_sum": {"$sum": {"$sum": "$items.feedback.confidence_score"}},
+        }},
+        {"$lookup": {"from": interviews_collection.name, "localField": "_id", "foreignField": "_id", "as": "session"}},
+        {"$unwind": "$session"},
+        {"$match": {f"session.{k}": v for k, v in match.items()}},
+        {"$group": {
+            "_id": {"user_id": "$session.user_id", "focus": "$session.focus"},
+            "answers": {"$sum": "$answers"},
+            "clarity_sum": {"$sum": "$clarity_sum"},
+            "confidence_sum": {"$sum": "$confidence_sum"},
+        }},
+    ]
+
+    docs = {}
+    rows = list(interviews_collection.aggregate(sessions_pipeline, allowDiskUse=True))
+    rows += list(interview_buckets_collection.aggregate(buckets_pipeline, allowDiskUse=True))
+    for row in rows:
+        uid = row["_id"]["user_id"]
+        doc = docs.setdefault(uid, {"_id": uid, "totals": dict.fromkeys(COUNTERS, 0), "by_focus": {}})
+        bucket = doc["by_focus"].setdefault(focus_key(row["_id"].get("focus")), dict.fromkeys(COUNTERS, 0))
+        for name in COUNTERS:
+            bucket[name] += row.get(name, 0)
+            doc["totals"][name] += row.get(name, 0)
+
+    for doc in docs.values():
+        doc["updated_at"] = datetime.utcnow()
+        user_stats_collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+    return len(docs)
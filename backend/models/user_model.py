@@ -1,16 +1,18 @@
 from extensions import users_collection
-from werkzeug.security import generate_password_hash
+from utils.auth_helpers import invalidate_user
+from utils.password_hasher import password_hasher
 
 def create_user(name, email, password):
 
     user = {
         "name": name,
         "email": email,
-        "password": generate_password_hash(password),
+        "password": password_hasher.hash(password),
         "role": "candidate"
     }
 
     users_collection.insert_one(user)
+    invalidate_user(email)
 
     return user
 
@@ -19,4 +21,13 @@ def get_user_by_email(email):
 
     return users_collection.find_one({
         "email": email
-    })
\ No newline at end of file
+    }, {"resume_data": 0})
+
+
+def set_password_hash(email, pwhash, previous):
+
+    # Only replaces the hash it was computed from, so a concurrent password change wins
+    users_collection.update_one(
+        {"email": email, "password": previous},
+        {"$set": {"password": pwhash}}
+    )
\ No newline at end of file
@@ -1,47 +1,40 @@
-import httpx
-import json
 import logging
 
+from config import Config
+from utils.llm_gateway import llm_gateway
+
+ANALYSIS_SCHEMA = {"clarity": (int, float), "confidence": (int, float), "feedback": str, "suggestions": list}
+RESUME_SCHEMA = {"score": (int, float), "missing_keywords": list, "strengths": list, "weaknesses": list, "summary": str}
+
 # Configure Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class OllamaClient:
-    def __init__(self, base_url="http://localhost:11434", model="llama3"):
+    def __init__(self, gateway=llm_gateway, model=None):
         """
         Initialize the Ollama Client.
+        Requests go through the shared LLM gateway (pooled connections, in-flight cap).
         Ensure you have Ollama running: `ollama run llama3`
         """
-        self.base_url = f"{base_url}/api/generate"
-        self.model = model
-        self.headers = {"Content-Type": "application/json"}
+        self.gateway = gateway
+        self.model = model or gateway.model
 
-    async def _send_request(self, prompt: str, json_mode: bool = False):
+    async def _send_request(self, prompt: str, json_mode: bool = False, timeout: float = Config.LLM_BUDGET_QUESTION):
         """
         Helper method to send async requests to Ollama.
+        `timeout` is the whole call's budget in seconds.
         """
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-        }
-        
-        if json_mode:
-            payload["format"] = "json"
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url, 
-                    json=payload, 
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", "")
-            except Exception as e:
-                logger.error(f"Ollama Connection Error: {e}")
-                return None
+        try:
+            return await self.gateway.aprompt(
+                prompt,
+                model=self.model,
+                format="json" if json_mode else None,
+                timeout=timeout,
+            )
+        except Exception as e:
+            logger.error(f"Ollama Connection Error: {e}")
+            return None
 
     async def generate_question(self, role: str, experience: str, history: list):
         """
@@ -62,7 +55,7 @@ class OllamaClient:
         Do not include "Here is a question" or polite filler. Just the question.
         """
         
-        response = await self._send_request(prompt)
+        response = await self._send_request(prompt, timeout=Config.LLM_BUDGET_QUESTION)
         return response.strip() if response else "Tell me about your experience with this role."
 
     async def analyze_answer(self, question: str, answer: str):
@@ -85,11 +78,10 @@ class OllamaClient:
         }}
         """
         
-        response = await self._send_request(prompt, json_mode=True)
-        
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return await self.gateway.aprompt_json(prompt, ANALYSIS_SCHEMA, model=self.model, timeout=Config.LLM_BUDGET_REVIEW)
+        except Exception as e:
+            logger.error(f"Answer analysis failed: {e}")
             # Fallback if LLM fails to generate valid JSON
             return {
                 "clarity": 70,
@@ -118,11 +110,10 @@ class OllamaClient:
         }}
         """
         
-        response = await self._send_request(prompt, json_mode=True)
-        
         try:
-            return json.loads(response)
-        except Exception:
+            return await self.gateway.aprompt_json(prompt, RESUME_SCHEMA, model=self.model, timeout=Config.LLM_BUDGET_RESUME)
+        except Exception as e:
+            logger.error(f"Resume parsing failed: {e}")
             return {
                 "score": 50,
                 "missing_keywords": ["Error parsing resume"],
@@ -2,6 +2,7 @@ from .auth import auth_bp
 from .dashboard import dashboard_bp
 from .interview import interview_bp
 from .resume_score import resume_bp 
+from .profile import profile_bp
 
 def register_routes(app):
     # Auth -> /api/auth/...
@@ -14,4 +15,7 @@ def register_routes(app):
     app.register_blueprint(interview_bp, url_prefix="/api/interview")
 
     # Resume Scoring -> /api/resume/...
-    app.register_blueprint(resume_bp, url_prefix="/api/resume")
\ No newline at end of file
+    app.register_blueprint(resume_bp, url_prefix="/api/resume")
+
+    # Profile (resume storage) -> /api/profile/...
+    app.register_blueprint(profile_bp, url_prefix="/api/profile")
\ No newline at end of file
@@ -1,14 +1,21 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import check_password_hash
 import jwt
 from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
 
 from config import Config
-from models.user_model import create_user, get_user_by_email
+from models.user_model import create_user, get_user_by_email, set_password_hash
+from utils.password_hasher import PasswordPoolBusy, password_hasher
 
 auth_bp = Blueprint("auth", __name__)
 
 
+def busy(error):
+    response = jsonify({"error": str(error)})
+    response.headers["Retry-After"] = "1"
+    return response, 429
+
+
 @auth_bp.route("/signup", methods=["POST"])
 def signup():
 
@@ -21,7 +28,13 @@ def signup():
     if get_user_by_email(email):
         return jsonify({"error": "User exists"}), 409
 
-    create_user(name, email, password)
+    try:
+        create_user(name, email, password)
+    except PasswordPoolBusy as e:
+        return busy(e)
+    except DuplicateKeyError:
+        # Concurrent signup with the same email lost the race on the unique index
+        return jsonify({"error": "User exists"}), 409
 
     return jsonify({"message": "User created"})
 
@@ -39,9 +52,18 @@ def login():
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    if not check_password_hash(user["password"], password):
+    try:
+        valid = password_hasher.verify(user["password"], password)
+    except PasswordPoolBusy as e:
+        return busy(e)
+
+    if not valid:
         return jsonify({"error": "Invalid password"}), 401
 
+    # Hash cost changed since this password was stored: upgrade it in the background
+    if password_hasher.needs_rehash(user["password"]):
+        password_hasher.rehash_later(password, lambda pwhash: set_password_hash(email, pwhash, user["password"]))
+
     token = jwt.encode({
         "email": email,
         "exp": datetime.now(timezone.utc) + timedelta(hours=24)
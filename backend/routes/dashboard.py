@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 from utils.auth_helpers import token_required
+from models.stats_model import get_user_stats
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -8,13 +9,17 @@ dashboard_bp = Blueprint("dashboard", __name__)
 @token_required
 def dashboard(current_user):
 
+    # Single _id lookup on the materialised stats document
+    stats = get_user_stats(str(current_user["_id"]))
+
     return jsonify({
 
         "user": current_user["name"],
 
         "stats": {
-            "interviews": 0,
-            "avg_score": 0
+            "interviews": stats["sessions"],
+            "avg_score": stats["avg_score"],
+            **stats
         }
 
-    })
\ No newline at end of file
+    })
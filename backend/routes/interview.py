@@ -1,19 +1,39 @@
 import os
 import json
-import ollama
-from datetime import datetime
+import asyncio
+import time
 from bson import ObjectId
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from config import Config
 from utils.auth_helpers import token_required
-from extensions import interviews_collection
+from models.stats_model import (
+    answer_update, apply_update, completion_update, session_deleted_update, session_started_update,
+)
+from models.session_store import (
+    QUESTION_TEXT_FIELDS, append_item, create_session, get_header, load_items, load_session, new_session, remove_session,
+)
+from extensions import interviews_collection, question_bank_collection
+from utils.llm_gateway import llm_gateway
+from utils.json_stream import JSONObjectScanner, extract_json_object, validate_schema
+from utils.pagination import InvalidCursor, encode_cursor, keyset_filter
+from utils.question_prefetch import QuestionPrefetcher
+from utils.question_bank import QuestionBank
+from utils.sse import sse_event, SSE_HEADERS
 
 interview_bp = Blueprint("interview", __name__)
 
 # ============================
 # Helper: Generate Question
 # ============================
-def generate_question(role, experience, focus, resume_context=""):
-    prompt = f"""
+QUESTION_SCHEMA = {"title": str, "description": str, "input_format": str, "output_format": str}
+# String fields streamed to the client as they are written
+QUESTION_STREAM_FIELDS = ("title", "description")
+
+# Every generated question is kept, tagged and indexed for reuse
+question_bank = QuestionBank(question_bank_collection, duplicate_threshold=Config.QUESTION_BANK_DUP_THRESHOLD)
+
+def question_prompt(role, experience, focus, resume_context=""):
+    return f"""
     You are an expert technical interviewer. Generate ONE interview question.
     Role: {role} | Experience: {experience} | Focus: {focus}
     Resume Context: {resume_context[:500]}
@@ -25,23 +45,77 @@ def generate_question(role, experience, focus, resume_context=""):
     "output_format": "text or code"
     }}
     """
+
+def fallback_question(role):
+    return {
+        "title": "Technical Background",
+        "description": f"Explain your experience working with projects related to {role}.",
+        "input_format": "text", "output_format": "text"
+    }
+
+def request_question(role, experience, focus, resume_context=""):
+    """Asks the model for a question; raises if it is unavailable, slow or off-schema."""
+    # Identical prompts are coalesced, but keep a few samples in flight so a
+    # cohort (or a session's prefetch) does not all get the same question
+    question = llm_gateway.prompt_json(
+        question_prompt(role, experience, focus, resume_context),
+        QUESTION_SCHEMA,
+        variants=Config.QUESTION_VARIANTS,
+        timeout=Config.LLM_BUDGET_QUESTION,
+    )
+    question_bank.add(question, role, experience, focus)
+    return question
+
+def banked_question(role, experience, focus, seen=()):
+    """A stored question the session has not seen, if the model should be skipped."""
+    if llm_gateway.under_pressure(Config.QUESTION_BANK_QUEUE_THRESHOLD):
+        return question_bank.pick(role, experience, focus, seen)
+    return None
+
+def generate_question(role, experience, focus, resume_context="", seen=()):
+    # Under load (or with the breaker open) serve from the bank instead of queueing
+    question = banked_question(role, experience, focus, seen)
+    if question:
+        return question
+    try:
+        question = request_question(role, experience, focus, resume_context)
+    except Exception as e:
+        print(f"Question generation fell back: {e}")
+        return question_bank.pick(role, experience, focus, seen) or fallback_question(role)
+    # The model repeats itself; swap in an unseen banked question when it does
+    if question_bank.is_repeat(question, seen):
+        return question_bank.pick(role, experience, focus, seen) or question
+    return question
+
+async def agenerate_question(role, experience, focus, resume_context="", seen=()):
+    """Async twin of generate_question() for the ASGI serving mode."""
+    # The first bank read loads it from Mongo; keep that and all bank I/O off the event loop
+    question = await asyncio.to_thread(banked_question, role, experience, focus, seen)
+    if question:
+        return question
     try:
-        response = ollama.chat(model="llama3:8b", messages=[{"role": "user", "content": prompt}])
-        content = response["message"]["content"]
-        start, end = content.find("{"), content.rfind("}")
-        return json.loads(content[start:end+1])
-    except:
-        return {
-            "title": "Technical Background",
-            "description": f"Explain your experience working with projects related to {role}.",
-            "input_format": "text", "output_format": "text"
-        }
+        question = await llm_gateway.aprompt_json(
+            question_prompt(role, experience, focus, resume_context),
+            QUESTION_SCHEMA,
+            variants=Config.QUESTION_VARIANTS,
+            timeout=Config.LLM_BUDGET_QUESTION,
+        )
+    except Exception as e:
+        print(f"Question generation fell back: {e}")
+        return await asyncio.to_thread(question_bank.pick, role, experience, focus, seen) or fallback_question(role)
+    await asyncio.to_thread(question_bank.add, question, role, experience, focus)
+    if question_bank.is_repeat(question, seen):
+        return await asyncio.to_thread(question_bank.pick, role, experience, focus, seen) or question
+    return question
 
 # ============================
 # Helper: Analyze Answer
 # ============================
-def analyze_answer(question, answer):
-    prompt = f"""
+REVIEW_SCHEMA = {"clarity_score": (int, float), "confidence_score": (int, float), "feedback": str}
+REVIEW_STREAM_FIELDS = ("feedback",)
+
+def analysis_prompt(question, answer):
+    return f"""
     Analyze this interview response. Question: {question} | Answer: {answer}
     Return ONLY valid JSON:
     {{
@@ -50,13 +124,113 @@ def analyze_answer(question, answer):
         "feedback": "Concise 1-2 sentence feedback"
     }}
     """
+
+def fallback_review():
+    return {"clarity_score": 5, "confidence_score": 5, "feedback": "Good effort."}
+
+def analyze_answer(question, answer):
+    try:
+        return llm_gateway.prompt_json(
+            analysis_prompt(question, answer), REVIEW_SCHEMA, timeout=Config.LLM_BUDGET_REVIEW
+        )
+    except Exception as e:
+        print(f"Answer analysis fell back: {e}")
+        return fallback_review()
+
+async def aanalyze_answer(question, answer):
+    """Async twin of analyze_answer() for the ASGI serving mode."""
+    try:
+        return await llm_gateway.aprompt_json(
+            analysis_prompt(question, answer), REVIEW_SCHEMA, timeout=Config.LLM_BUDGET_REVIEW
+        )
+    except Exception as e:
+        print(f"Answer analysis fell back: {e}")
+        return fallback_review()
+
+# ============================
+# Helper: Streaming
+# ============================
+def stream_llm_json(prompt, schema, fallback, budget, fields=()):
+    """
+    Streams a JSON completion. Yields ("token", (field, text)) with the decoded
+    text of the top-level string `fields` as the model writes them and finishes
+    with ("done", parsed_result). Generation is cut off
+    once the JSON object closes; off-schema output gets one repair pass and
+    `fallback` is used if that fails too or the `budget` (seconds) runs out,
+    same as the blocking helpers.
+    """
+    deadline = time.perf_counter() + budget
+    scanner = JSONObjectScanner(fields)
+    stream = llm_gateway.stream_chat([{"role": "user", "content": prompt}], timeout=budget)
     try:
-        response = ollama.chat(model="llama3:8b", messages=[{"role": "user", "content": prompt}])
-        content = response["message"]["content"]
-        start, end = content.find("{"), content.rfind("}")
-        return json.loads(content[start:end+1])
-    except:
-        return {"clarity_score": 5, "confidence_score": 5, "feedback": "Good effort."}
+        for text in stream:
+            complete = scanner.feed(text)
+            for piece in scanner.take_text():
+                yield "token", piece
+            if complete:
+                break
+        # Release the in-flight slot before a possible repair call
+        stream.close()
+        try:
+            result = extract_json_object(scanner.text)
+            errors = validate_schema(result, schema)
+        except ValueError as e:
+            errors = [str(e)]
+        if errors:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError("No budget left for a repair pass")
+            result = llm_gateway.repair_json(scanner.text, schema, errors, timeout=remaining)
+    except Exception as e:
+        print(f"Streaming generation fell back: {e}")
+        result = fallback
+    finally:
+        stream.close()
+    yield "done", result
+
+def stream_question(role, experience, focus, resume_context="", seen=()):
+    """
+    Streaming twin of generate_question(): the same bank check under load,
+    bank add and bank fallback, with ("token", (field, text)) events while the
+    model writes the title and description and ("done", question) at the end.
+    """
+    question = banked_question(role, experience, focus, seen)
+    if question is None:
+        prompt = question_prompt(role, experience, focus, resume_context)
+        for kind, payload in stream_llm_json(prompt, QUESTION_SCHEMA, None, Config.LLM_BUDGET_QUESTION, QUESTION_STREAM_FIELDS):
+            if kind == "token":
+                yield kind, payload
+            else:
+                question = payload
+        if question is None:
+            question = question_bank.pick(role, experience, focus, seen) or fallback_question(role)
+        else:
+            question_bank.add(question, role, experience, focus)
+            if question_bank.is_repeat(question, seen):
+                question = question_bank.pick(role, experience, focus, seen) or question
+    yield "done", question
+
+# Background generation of upcoming questions per session
+question_prefetcher = QuestionPrefetcher(
+    request_question,
+    depth=Config.QUESTION_PREFETCH_DEPTH,
+    workers=Config.QUESTION_PREFETCH_WORKERS,
+)
+
+# ============================
+# Session writes (shared by the blocking and streaming routes)
+# ============================
+def start_session(session, question):
+    """Stores a new session with its first question, counts it in the user's stats and starts prefetching."""
+    session_id = create_session(session, question)
+    apply_update(session["user_id"], session_started_update(session["focus"]))
+    question_prefetcher.ensure(session_id, session['role'], session['experience'], session['focus'])
+    return session_id
+
+def save_answer(session_id, user_id, question_title, answer, review):
+    session = append_item(session_id, "answers", {"question": question_title, "answer": answer, "feedback": review}, user_id)
+    if session:
+        apply_update(session["user_id"], answer_update(session.get("focus"), review))
 
 # ============================
 # Routes
@@ -67,22 +241,17 @@ def analyze_answer(question, answer):
 def initiate_session(current_user):
     try:
         data = request.json
-        session = {
-            "user_id": str(current_user["_id"]),
-            "role": data.get("role", "Software Engineer"),
-            "experience": data.get("experience", "0-2 years"),
-            "focus": data.get("focus", "Technical"),
-            "created_at": datetime.utcnow(),
-            "questions": [],
-            "answers": [],
-            "status": "active"
-        }
+        session = new_session(
+            str(current_user["_id"]),
+            data.get("role", "Software Engineer"),
+            data.get("experience", "0-2 years"),
+            data.get("focus", "Technical"),
+        )
         # Generate first question
         question = generate_question(session['role'], session['experience'], session['focus'], data.get("resume_context", ""))
-        session["questions"].append(question)
-        
-        result = interviews_collection.insert_one(session)
-        return jsonify({"session_id": str(result.inserted_id), "question": question}), 200
+
+        session_id = start_session(session, question)
+        return jsonify({"session_id": session_id, "question": question}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -97,10 +266,7 @@ def submit_answer(current_user):
 
         review = analyze_answer(question_title, answer)
 
-        interviews_collection.update_one(
-            {"_id": ObjectId(session_id)},
-            {"$push": {"answers": {"question": question_title, "answer": answer, "feedback": review}}}
-        )
+        save_answer(session_id, str(current_user["_id"]), question_title, answer, review)
         return jsonify({"success": True, "review": review}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -111,13 +277,15 @@ def next_question(current_user):
     try:
         data = request.json
         session_id = data.get("session_id")
-        session = interviews_collection.find_one({"_id": ObjectId(session_id)})
-        
-        question = generate_question(session['role'], session['experience'], session['focus'])
-        interviews_collection.update_one(
-            {"_id": ObjectId(session_id)},
-            {"$push": {"questions": question}}
-        )
+        session = get_header(session_id, str(current_user["_id"]))
+
+        # Serve from the prefetch buffer, generate inline only on a miss
+        seen = load_items(session, "questions", QUESTION_TEXT_FIELDS)
+        question = question_prefetcher.pop(session_id)
+        if question is None or question_bank.is_repeat(question, seen):
+            question = generate_question(session['role'], session['experience'], session['focus'], seen=seen)
+        question_prefetcher.ensure(session_id, session['role'], session['experience'], session['focus'])
+        append_item(session_id, "questions", question, str(current_user["_id"]))
         return jsonify(question), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -130,22 +298,78 @@ def complete_session(current_user):
         session_id = data.get("session_id")
         overall_score = data.get("overall_score")
         
-        interviews_collection.update_one(
-            {"_id": ObjectId(session_id)},
-            {"$set": {"status": "completed", "overall_score": overall_score}}
+        before = interviews_collection.find_one_and_update(
+            {"_id": ObjectId(session_id), "user_id": str(current_user["_id"])},
+            {"$set": {"status": "completed", "overall_score": overall_score}},
+            projection={"user_id": 1, "focus": 1, "status": 1, "overall_score": 1},
         )
+        if before:
+            apply_update(before["user_id"], completion_update(before.get("focus"), overall_score, before))
+        question_prefetcher.discard(session_id)
         return jsonify({"success": True}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Fields shown in history lists; questions, answers and feedback come from /session/<id>
+HISTORY_SUMMARY_FIELDS = {
+    "role": 1, "experience": 1, "focus": 1, "created_at": 1, "status": 1, "overall_score": 1,
+    "question_count": 1, "answer_count": 1,
+}
+
 @interview_bp.route("/history", methods=["GET"])
 @token_required
 def get_history(current_user):
+    """
+    One page of session summaries, newest first, streamed as
+    {"items": [...], "next_cursor": "..."}. Pass ?cursor=<next_cursor> for
+    the following page; next_cursor is null on the last one.
+    """
     try:
-        history = list(interviews_collection.find({"user_id": str(current_user["_id"])}).sort("created_at", -1))
-        for item in history:
-            item["_id"] = str(item["_id"])
-        return jsonify(history), 200
+        limit = int(request.args.get("limit", Config.HISTORY_PAGE_SIZE))
+        limit = max(1, min(limit, Config.HISTORY_MAX_PAGE_SIZE))
+        query = keyset_filter({"user_id": str(current_user["_id"])}, request.args.get("cursor"))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    # One extra row tells us whether there is a next page
+    sessions = (
+        interviews_collection.find(query, HISTORY_SUMMARY_FIELDS)
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+
+    def body():
+        yield '{"items": ['
+        next_cursor = None
+        try:
+            last = None
+            for i, item in enumerate(sessions):
+                if i == limit:
+                    next_cursor = encode_cursor(last)
+                    break
+                item["_id"] = str(item["_id"])
+                last = item
+                yield ("," if i else "") + current_app.json.dumps(item)
+        except Exception as e:
+            print(f"History stream failed: {e}")
+            yield '], "next_cursor": null, "error": ' + json.dumps(str(e)) + "}"
+            return
+        yield '], "next_cursor": ' + json.dumps(next_cursor) + "}"
+
+    return Response(stream_with_context(body()), mimetype="application/json")
+
+@interview_bp.route("/session/<session_id>", methods=["GET"])
+@token_required
+def get_session(current_user, session_id):
+    """Full session document: questions, answers and feedback."""
+    try:
+        session = load_session(session_id, str(current_user["_id"]))
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        session["_id"] = str(session["_id"])
+        return jsonify(session), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -153,7 +377,99 @@ def get_history(current_user):
 @token_required
 def delete_session(current_user, session_id):
     try:
-        interviews_collection.delete_one({"_id": ObjectId(session_id), "user_id": str(current_user["_id"])})
+        deleted = remove_session(session_id, str(current_user["_id"]))
+        if deleted:
+            apply_update(deleted["user_id"], session_deleted_update(deleted))
+        question_prefetcher.discard(session_id)
         return jsonify({"success": True}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# ============================
+# Streaming Routes (Server-Sent Events)
+# Each emits "token" events, {"field": ..., "text": ...}, with decoded text
+# appended to a string field (question title/description, review feedback) as
+# the model writes it, and a final "done" event whose data matches the JSON
+# body of the blocking route. "done" is authoritative: after a repair pass or
+# a fallback it can differ from the streamed text.
+# ============================
+
+def sse_response(events):
+    return Response(stream_with_context(events), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+def token_event(piece):
+    field, text = piece
+    return sse_event("token", {"field": field, "text": text})
+
+@interview_bp.route("/initiate/stream", methods=["POST"])
+@token_required
+def initiate_session_stream(current_user):
+    data = request.json
+    session = new_session(
+        str(current_user["_id"]),
+        data.get("role", "Software Engineer"),
+        data.get("experience", "0-2 years"),
+        data.get("focus", "Technical"),
+    )
+    resume_context = data.get("resume_context", "")
+
+    def events():
+        try:
+            for kind, payload in stream_question(session['role'], session['experience'], session['focus'], resume_context):
+                if kind == "token":
+                    yield token_event(payload)
+                    continue
+                session_id = start_session(session, payload)
+                yield sse_event("done", {"session_id": session_id, "question": payload})
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    return sse_response(events())
+
+@interview_bp.route("/submit/stream", methods=["POST"])
+@token_required
+def submit_answer_stream(current_user):
+    data = request.json
+    session_id = data.get("session_id")
+    answer = data.get("answer")
+    question_title = data.get("question_title")
+
+    def events():
+        try:
+            for kind, payload in stream_llm_json(analysis_prompt(question_title, answer), REVIEW_SCHEMA, fallback_review(), Config.LLM_BUDGET_REVIEW, REVIEW_STREAM_FIELDS):
+                if kind == "token":
+                    yield token_event(payload)
+                    continue
+                save_answer(session_id, str(current_user["_id"]), question_title, answer, payload)
+                yield sse_event("done", {"success": True, "review": payload})
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    return sse_response(events())
+
+@interview_bp.route("/next/stream", methods=["POST"])
+@token_required
+def next_question_stream(current_user):
+    data = request.json
+    session_id = data.get("session_id")
+
+    def events():
+        try:
+            session = get_header(session_id, str(current_user["_id"]))
+            seen = load_items(session, "questions", QUESTION_TEXT_FIELDS)
+            question = question_prefetcher.pop(session_id)
+            if question is not None and question_bank.is_repeat(question, seen):
+                question = None
+            if question is None:
+                for kind, payload in stream_question(session['role'], session['experience'], session['focus'], seen=seen):
+                    if kind == "token":
+                        yield token_event(payload)
+                    else:
+                        question = payload
+            question_prefetcher.ensure(session_id, session['role'], session['experience'], session['focus'])
+            append_item(session_id, "questions", question, str(current_user["_id"]))
+            yield sse_event("done", question)
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    return sse_response(events())
@@ -1,8 +1,7 @@
-import base64
-from flask import Blueprint, request, jsonify
+from urllib.parse import quote
+from flask import Blueprint, Response, request, jsonify
 from utils.auth_helpers import token_required
-from extensions import users_collection
-from bson import ObjectId
+from models.resume_store import ResumeTooLarge, get_resume_meta, open_resume, save_resume
 
 profile_bp = Blueprint("profile", __name__)
 
@@ -14,30 +13,91 @@ def upload_resume(current_user):
         if not file:
             return jsonify({"error": "No file uploaded"}), 400
 
-        # Convert PDF to Base64 for easy storage/retrieval in this demo
-        # For larger files, GridFS is recommended
-        encoded_string = base64.b64encode(file.read()).decode('utf-8')
-
-        users_collection.update_one(
-            {"_id": current_user["_id"]},
-            {"$set": {
-                "resume_data": encoded_string,
-                "resume_filename": file.filename,
-                "resume_updated_at": datetime.utcnow()
-            }}
-        )
-        return jsonify({"success": True, "filename": file.filename}), 200
+        # Streamed into GridFS chunk by chunk; werkzeug has already spooled large uploads to disk
+        meta = save_resume(current_user, file.stream, file.filename, file.mimetype or "application/pdf")
+        return jsonify({
+            "success": True,
+            "filename": file.filename,
+            "size": meta["resume_size"],
+            "sha256": meta["resume_sha256"],
+        }), 200
+    except ResumeTooLarge as e:
+        return jsonify({"error": str(e)}), 413
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @profile_bp.route("/resume/get", methods=["GET"])
 @token_required
 def get_resume(current_user):
-    user = users_collection.find_one({"_id": current_user["_id"]})
-    if not user or "resume_data" not in user:
+    """Resume metadata; the file itself is served by /resume/file."""
+    meta = get_resume_meta(current_user["_id"])
+    if not meta:
         return jsonify({"error": "No resume found"}), 404
-    
+
     return jsonify({
-        "resume_filename": user.get("resume_filename"),
-        "resume_data": user.get("resume_data")
-    }), 200
\ No newline at end of file
+        "resume_filename": meta.get("resume_filename"),
+        "content_type": meta.get("resume_content_type"),
+        "size": meta.get("resume_size"),
+        "sha256": meta.get("resume_sha256"),
+        "updated_at": meta.get("resume_updated_at"),
+        "download_url": f"{request.script_root}/api/profile/resume/file",
+    }), 200
+
+def content_disposition(filename):
+    """inline header for a user-supplied filename: quotes, backslashes and non-ASCII never reach the quoted form."""
+    name = filename or "resume.pdf"
+    plain = "".join(ch if 32 <= ord(ch) < 127 and ch not in '"\\' else "_" for ch in name)
+    return f"inline; filename=\"{plain}\"; filename*=UTF-8''{quote(name, safe='')}"
+
+@profile_bp.route("/resume/file", methods=["GET"])
+@token_required
+def download_resume(current_user):
+    """
+    Streams the stored PDF. Supports If-None-Match and single-range Range
+    requests; multi-range requests get the whole file with a 200.
+    """
+    meta = get_resume_meta(current_user["_id"])
+    if not meta:
+        return jsonify({"error": "No resume found"}), 404
+
+    size = meta["resume_size"]
+    etag = meta["resume_sha256"]
+    headers = {
+        "ETag": f'"{etag}"',
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": content_disposition(meta.get("resume_filename")),
+    }
+
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    start, stop, status = 0, size, 200
+    # If-Range with any other validator (or a date) means the client wants the whole new file
+    if_range = request.headers.get("If-Range")
+    if request.range and len(request.range.ranges) == 1 and (not if_range or request.if_range.etag == etag):
+        byte_range = request.range.range_for_length(size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status=416, headers=headers)
+        start, stop = byte_range
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+
+    grid_out = open_resume(meta["resume_file_id"])
+    grid_out.seek(start)
+
+    def body():
+        remaining = stop - start
+        try:
+            while remaining > 0:
+                chunk = grid_out.read(min(remaining, 256 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            grid_out.close()
+
+    headers["Content-Length"] = str(stop - start)
+    return Response(body(), status=status, mimetype=meta.get("resume_content_type") or "application/pdf", headers=headers)
@@ -1,12 +1,178 @@
-import os
+import io
 import json
-import tempfile
-import ollama
-from flask import Blueprint, request, jsonify
-from utils.resume_parser import extract_text_from_file
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from config import Config
+from extensions import resume_cache_collection
+from utils.resume_parser import extract_text, extract_text_pooled
+from utils.ats_scorer import get_ats_scorer
+from utils.skill_taxonomy import get_taxonomy
+from utils.llm_gateway import llm_gateway, LLMUnavailable
+from utils.json_stream import JSONSchemaError
+from utils.result_cache import ResultCache, MongoCacheBackend, content_key
+from utils.job_queue import JobQueue, QueueFull
+from utils.sse import sse_event, SSE_HEADERS
 
 resume_bp = Blueprint('resume', __name__)
-client = ollama.Client(host='http://127.0.0.1:11434')
+
+# Bump whenever the scoring prompt changes so stale results are not served
+PROMPT_VERSION = "3"
+
+resume_cache = ResultCache(
+    max_entries=Config.RESUME_CACHE_SIZE,
+    ttl=Config.RESUME_CACHE_TTL,
+    backend=MongoCacheBackend(resume_cache_collection) if Config.RESUME_CACHE_PERSIST else None,
+)
+
+# Background workers for ?async=1 scoring
+resume_jobs = JobQueue(
+    workers=Config.RESUME_JOB_WORKERS,
+    max_pending=Config.RESUME_JOB_MAX_PENDING,
+    ttl=Config.RESUME_JOB_TTL,
+    name="resume-score",
+)
+
+# Shared by every /score/bulk request, so its size caps bulk LLM calls process-wide
+bulk_executor = ThreadPoolExecutor(max_workers=Config.RESUME_BULK_CONCURRENCY, thread_name_prefix="resume-bulk")
+
+RESUME_SCHEMA = {
+    "score": (int, float),
+    "improvement_tips": list,
+    "summary": str,
+    "missing_keywords": list,
+    "strengths": list,
+    "weaknesses": list,
+}
+
+# What the model still writes when the keyword scan supplies score and missing_keywords
+NARRATIVE_SCHEMA = {
+    "improvement_tips": list,
+    "summary": str,
+    "strengths": list,
+    "weaknesses": list,
+}
+
+CONNECTION_ERROR = "Ollama connection failed. Run 'ollama serve'."
+UNAVAILABLE_ERROR = "AI scoring is temporarily unavailable, please retry shortly."
+
+
+class ScoringError(Exception):
+    """The model answered but its output could not be used."""
+
+
+def score_resume_file(file_bytes, filename, job_role, extract=extract_text):
+    """
+    Extracts the resume text and scores it with the LLM.
+    Returns the result dict; raises ScoringError on unusable model output.
+    """
+    # Same file + role + model + prompt -> same result; prefill and the
+    # taxonomy's weights and roles decide the score and keywords too
+    cache_key = content_key(
+        file_bytes, job_role, llm_gateway.model, PROMPT_VERSION,
+        "prefill" if Config.RESUME_PREFILL else "llm", f"taxonomy-{get_taxonomy().version}",
+    )
+    cached = resume_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # 1. Extract Text from PDF (in memory, only as far as the prompt, or the keyword scan with prefill, reads)
+    budget = Config.RESUME_SCAN_CHARS if Config.RESUME_PREFILL else Config.RESUME_PROMPT_CHARS
+    resume_text = extract(file_bytes, max_chars=budget)
+    prescore = get_ats_scorer().score(resume_text, job_role) if Config.RESUME_PREFILL else None
+    prefilled = prescore is not None and prescore["score"] is not None
+
+    # 2. Call Ollama (Using llama3:8b from your list)
+    if prefilled:
+        # Score and missing keywords come from the local scan; the model only writes the narrative
+        prompt = f"""
+    Analyze this resume for the role: {job_role}.
+    Resume Content: {resume_text[:Config.RESUME_PROMPT_CHARS]}
+
+    A keyword scan already scored it {prescore["score"]}/100.
+    Matched skills: {", ".join(prescore["matched_keywords"]) or "none"}
+    Missing skills: {", ".join(prescore["missing_keywords"]) or "none"}
+    Do not score it again. Return ONLY a valid JSON object.
+    {{
+        "improvement_tips": ["tip1", "tip2"],
+        "summary": "brief summary",
+        "strengths": ["strength1"],
+        "weaknesses": ["weakness1"]
+    }}
+    """
+        schema = NARRATIVE_SCHEMA
+    else:
+        prompt = f"""
+    Analyze this resume for the role: {job_role}.
+    Resume Content: {resume_text[:Config.RESUME_PROMPT_CHARS]}
+
+    Return ONLY a valid JSON object.
+    {{
+        "score": 85,
+        "improvement_tips": ["tip1", "tip2"],
+        "summary": "brief summary",
+        "missing_keywords": ["skill1"],
+        "strengths": ["strength1"],
+        "weaknesses": ["weakness1"]
+    }}
+    """
+        schema = RESUME_SCHEMA
+
+    # 3. Parse JSON (generation stops once the object closes)
+    try:
+        result_data = llm_gateway.prompt_json(prompt, schema, timeout=Config.LLM_BUDGET_RESUME)
+    except JSONSchemaError:
+        raise ScoringError("AI failed to format response")
+
+    if prefilled:
+        result_data.update(
+            score=prescore["score"],
+            missing_keywords=prescore["missing_keywords"],
+            keyword_coverage=prescore["keyword_coverage"],
+        )
+    # Only as much text as was extracted for the prompt/scan, not the whole document
+    result_data['extracted_text'] = resume_text
+    resume_cache.set(cache_key, result_data)
+    return result_data
+
+
+def prescore_resume_file(file_bytes, job_role, extract=extract_text):
+    """
+    Keyword-scan result in the same shape as score_resume_file, without the
+    LLM. Raises ScoringError when the job description names no known skills.
+    """
+    resume_text = extract(file_bytes, max_chars=Config.RESUME_SCAN_CHARS)
+    prescore = get_ats_scorer().score(resume_text, job_role)
+    if prescore["score"] is None:
+        raise ScoringError("Fast scoring needs a known role or skills in the job description")
+    matched, missing = prescore["matched_keywords"], prescore["missing_keywords"]
+    return {
+        "mode": "fast",
+        "score": prescore["score"],
+        "summary": f"Covers {len(matched)} of {prescore['required_keywords']} key skills"
+                   + (f" for {prescore['role_profile']}." if prescore["role_profile"] else "."),
+        "missing_keywords": missing,
+        "strengths": matched,
+        "weaknesses": [],
+        "improvement_tips": [f"Show where you have used {skill}, if you have" for skill in missing[:3]],
+        "keyword_coverage": prescore["keyword_coverage"],
+        "similarity": prescore["similarity"],
+        "extracted_text": resume_text,
+    }
+
+
+def _score_job(file_bytes, filename, job_role, extract=extract_text):
+    try:
+        return score_resume_file(file_bytes, filename, job_role, extract)
+    except ScoringError:
+        raise
+    except LLMUnavailable:
+        raise ScoringError(UNAVAILABLE_ERROR)
+    except Exception as e:
+        print(f"Server Error: {str(e)}")
+        raise ScoringError(CONNECTION_ERROR)
+
 
 @resume_bp.route('/score', methods=['POST'])
 def score_resume():
@@ -16,47 +182,207 @@ def score_resume():
 
         file = request.files['resume']
         job_role = request.form.get('job_description', 'Software Engineer')
-        
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            temp_path = os.path.join(tmp_dir, file.filename)
-            file.save(temp_path)
-            
-            # 1. Extract Text from PDF
-            resume_text = extract_text_from_file(temp_path)
-            
-            # 2. Call Ollama (Using llama3:8b from your list)
-            prompt = f"""
-            Analyze this resume for the role: {job_role}.
-            Resume Content: {resume_text[:2000]}
-            
-            Return ONLY a valid JSON object.
-            {{
-                "score": 85,
-                "improvement_tips": ["tip1", "tip2"],
-                "summary": "brief summary",
-                "missing_keywords": ["skill1"],
-                "strengths": ["strength1"],
-                "weaknesses": ["weakness1"]
-            }}
-            """
-            
-            # Use the EXACT name from your 'ollama list'
-            response = client.chat(
-                model='llama3:8b', 
-                messages=[{'role': 'user', 'content': prompt}]
-            )
-            content = response['message']['content']
-            
-            # 3. Clean and Parse JSON
-            start, end = content.find("{"), content.rfind("}")
-            if start == -1 or end == -1:
-                return jsonify({"error": "AI failed to format response"}), 500
-                
-            result_data = json.loads(content[start:end+1])
-            result_data['extracted_text'] = resume_text 
-            
-            return jsonify(result_data)
+        file_bytes = file.read()
+
+        # Fast mode: local keyword scan only, answers in milliseconds
+        if request.args.get('mode') == 'fast':
+            try:
+                return jsonify(prescore_resume_file(file_bytes, job_role))
+            except ScoringError as e:
+                return jsonify({"error": str(e)}), 422
+
+        # Async mode: hand off to the worker pool and let the client poll
+        if request.args.get('async') in ('1', 'true'):
+            try:
+                job = resume_jobs.submit(_score_job, file_bytes, file.filename, job_role)
+            except QueueFull as e:
+                return jsonify({"error": str(e)}), 429
+            return jsonify({
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"{request.script_root}/api/resume/score/jobs/{job.id}",
+            }), 202
 
+        return jsonify(score_resume_file(file_bytes, file.filename, job_role))
+
+    except ScoringError as e:
+        return jsonify({"error": str(e)}), 500
+    except LLMUnavailable:
+        # Breaker is open: answer immediately instead of waiting on the model
+        return jsonify({"error": UNAVAILABLE_ERROR}), 503
     except Exception as e:
         print(f"Server Error: {str(e)}")
-        return jsonify({"error": "Ollama connection failed. Run 'ollama serve'."}), 500
\ No newline at end of file
+        return jsonify({"error": CONNECTION_ERROR}), 500
+
+
+@resume_bp.route('/score/jobs/<job_id>', methods=['GET'])
+def score_job_status(job_id):
+    job = resume_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+    return jsonify(job.to_dict())
+
+
+@resume_bp.route('/score/jobs/<job_id>/events', methods=['GET'])
+def score_job_events(job_id):
+    job = resume_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found or expired"}), 404
+
+    def events():
+        # Heartbeat every few seconds keeps proxies from closing the stream
+        while not job.done.wait(5):
+            yield sse_event("status", {"job_id": job.id, "status": job.status})
+        yield sse_event("done", job.to_dict())
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+
+# ============================
+# Bulk scoring: many resumes, one job description, NDJSON out
+# ============================
+class BulkInputError(Exception):
+    pass
+
+
+def _detach(upload):
+    """
+    Takes over an upload's stream. Flask closes request files as soon as the
+    view returns, before a streamed response body has been generated.
+    """
+    stream, upload.stream = upload.stream, io.BytesIO()
+    return stream
+
+
+def _bulk_entries(archive, uploads):
+    """
+    (filename, read) pairs for the PDFs inside a zip stream, or for a list of
+    (filename, stream) uploads. Reading is deferred so only the resumes in
+    flight are held in memory; Werkzeug spools large uploads to disk.
+    """
+    if archive is None:
+        return [(name, stream.read) for name, stream in uploads]
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise BulkInputError("Archive is not a valid zip file")
+    entries = []
+    for info in zf.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(".pdf"):
+            continue
+        if info.file_size > Config.RESUME_MAX_BYTES:
+            entries.append((name, None))
+        else:
+            entries.append((name, lambda info=info: zf.read(info)))
+    return entries
+
+
+def _extract_or_fail(file_bytes, max_chars=None):
+    text = extract_text_pooled(file_bytes, max_chars)
+    if not text.strip():
+        raise ScoringError("No text could be extracted from this PDF")
+    return text
+
+
+def _score_bulk_item(filename, read, job_role, fast=False):
+    if read is None:
+        raise ScoringError(f"File exceeds the {Config.RESUME_MAX_BYTES // 1024} KB limit")
+    file_bytes = read()
+    if len(file_bytes) > Config.RESUME_MAX_BYTES:
+        raise ScoringError(f"File exceeds the {Config.RESUME_MAX_BYTES // 1024} KB limit")
+    # Extraction runs on the process pool; this thread only waits on it and the LLM
+    if fast:
+        result = prescore_resume_file(file_bytes, job_role, extract=_extract_or_fail)
+    else:
+        result = _score_job(file_bytes, filename, job_role, extract=_extract_or_fail)
+    return {key: value for key, value in result.items() if key != "extracted_text"}
+
+
+def _bulk_results(entries, job_role, streams, fast=False):
+    """
+    Yields one NDJSON line per resume as it finishes, then a summary.
+    At most RESUME_BULK_WINDOW resumes are read and in flight at a time.
+    """
+    start = time.monotonic()
+    pending = {}
+    scored = failed = 0
+    queue = iter(enumerate(entries))
+    try:
+        while True:
+            while len(pending) < Config.RESUME_BULK_WINDOW:
+                item = next(queue, None)
+                if item is None:
+                    break
+                index, (filename, read) = item
+                future = bulk_executor.submit(_score_bulk_item, filename, read, job_role, fast)
+                pending[future] = (index, filename)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, filename = pending.pop(future)
+                line = {"type": "result", "index": index, "filename": filename}
+                try:
+                    line.update(status="ok", result=future.result())
+                    scored += 1
+                except Exception as e:
+                    line.update(status="error", error=str(e))
+                    failed += 1
+                yield json.dumps(line) + "\n"
+        yield json.dumps({
+            "type": "summary",
+            "total": len(entries),
+            "scored": scored,
+            "failed": failed,
+            "elapsed_seconds": round(time.monotonic() - start, 2),
+        }) + "\n"
+    finally:
+        # If the client went away, drop the resumes that have not started
+        for future in pending:
+            future.cancel()
+        for stream in streams:
+            stream.close()
+
+
+@resume_bp.route('/score/bulk', methods=['POST'])
+def score_resume_bulk():
+    """
+    Scores many resumes against one job description. Accepts a zip as
+    'archive' or several 'resumes' files and streams one NDJSON line per
+    resume as it finishes, followed by a summary line. ?mode=fast skips the
+    LLM and returns the keyword-scan scores.
+    """
+    job_role = request.form.get('job_description', 'Software Engineer')
+    archive = request.files.get('archive')
+    files = [f for f in request.files.getlist('resumes') if f.filename]
+    if archive is None and not files:
+        return jsonify({"error": "Upload resumes as 'resumes' files or one zip as 'archive'"}), 400
+
+    # Flask closes request files when the view returns, before the streamed
+    # body is generated, so take the streams over and close them ourselves
+    if archive is not None:
+        streams = [_detach(archive)]
+        uploads = []
+    else:
+        uploads = [(f.filename, _detach(f)) for f in files]
+        streams = [stream for _, stream in uploads]
+
+    try:
+        entries = _bulk_entries(streams[0] if archive is not None else None, uploads)
+        if not entries:
+            raise BulkInputError("No PDF resumes found in the upload")
+    except BulkInputError as e:
+        for stream in streams:
+            stream.close()
+        return jsonify({"error": str(e)}), 400
+    if len(entries) > Config.RESUME_BULK_MAX_FILES:
+        for stream in streams:
+            stream.close()
+        return jsonify({"error": f"At most {Config.RESUME_BULK_MAX_FILES} resumes per batch"}), 413
+
+    return Response(
+        stream_with_context(_bulk_results(entries, job_role, streams, request.args.get('mode') == 'fast')),
+        mimetype="application/x-ndjson",
+        headers=SSE_HEADERS,
+    )
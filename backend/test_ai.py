@@ -1,6 +1,6 @@
-import ollama
+from utils.llm_gateway import llm_gateway
 try:
-    response = ollama.chat(model='llama3:8b', messages=[{'role': 'user', 'content': 'hi'}])
-    print("CONNECTION SUCCESSFUL:", response['message']['content'])
+    response = llm_gateway.prompt('hi')
+    print("CONNECTION SUCCESSFUL:", response)
 except Exception as e:
     print("CONNECTION FAILED:", e)
\ No newline at end of file
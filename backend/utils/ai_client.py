@@ -1,8 +1,10 @@
-import ollama
-import json
+from config import Config
+from utils.llm_gateway import llm_gateway
 
 # Define the model name here so other files (like resume_score.py) can import it
-MODEL_NAME = "llama3:8b" 
+MODEL_NAME = Config.OLLAMA_MODEL
+
+QUESTION_SCHEMA = {"title": str, "description": str, "input_format": str, "output_format": str}
 
 def generate_question(role, experience, focus, resume):
     # Refining the prompt to force JSON and prevent "yapping" from the AI
@@ -24,7 +26,8 @@ def generate_question(role, experience, focus, resume):
     """
 
     try:
-        response = ollama.chat(
+        # Streams the answer and stops once the JSON object closes
+        return llm_gateway.chat_json(
             model=MODEL_NAME,
             messages=[
                 {
@@ -32,23 +35,13 @@ def generate_question(role, experience, focus, resume):
                     "content": prompt
                 }
             ],
+            schema=QUESTION_SCHEMA,
+            timeout=Config.LLM_BUDGET_QUESTION,
             options={
                 "temperature": 0.7, # Adds a bit of variety to questions
             }
         )
 
-        content = response["message"]["content"]
-
-        # Extract JSON from potential markdown backticks
-        start = content.find("{")
-        end = content.rfind("}")
-
-        if start == -1 or end == -1:
-            raise Exception("No JSON object found in response")
-
-        json_str = content[start:end+1]
-        return json.loads(json_str)
-
     except Exception as e:
         print(f"OLLAMA FAILURE on model {MODEL_NAME}:", str(e))
         # Robust fallback so the frontend doesn't crash
@@ -65,6 +58,6 @@ class AIClient:
         self.model = MODEL_NAME
     
     def chat(self, messages):
-        return ollama.chat(model=self.model, messages=messages)
+        return {"message": {"content": llm_gateway.chat(messages, model=self.model)}}
 
 client = AIClient()
\ No newline at end of file
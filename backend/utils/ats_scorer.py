@@ -0,0 +1,128 @@
+import threading
+
+import numpy as np
+
+from utils.skill_taxonomy import get_taxonomy
+
+# Share of the score from required-skill coverage; the rest is TF-IDF cosine
+COVERAGE_WEIGHT = 0.7
+MISSING_LIMIT = 10
+MATCHED_LIMIT = 10
+
+# Job-title words that mean the same thing when matching a role
+TITLE_SYNONYMS = {"developer": "engineer", "dev": "engineer", "programmer": "engineer"}
+
+
+class ATSScorer:
+    """
+    Deterministic resume-vs-role scoring over the skill taxonomy.
+
+    The vocabulary is the taxonomy's canonical skills, fixed when the scorer
+    is built; each skill's IDF-like weight comes from its category weight in
+    the data file, so soft skills count for less than tools and languages.
+    A text becomes a sublinear TF vector (log1p of mention counts) times
+    those weights. The job side is the skills named in the job description
+    plus, when it names a known role ("Senior Backend Engineer"), that role's
+    key skills. score_many() scores a batch with a few matrix products.
+    """
+
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.vocabulary = sorted(taxonomy.categories)
+        self._column = {name: i for i, name in enumerate(self.vocabulary)}
+        self.idf = np.array(
+            [taxonomy.category_weights.get(taxonomy.categories[name], 1.0) for name in self.vocabulary],
+            dtype=np.float32,
+        )
+        self._roles = []
+        for title, skills in taxonomy.roles.items():
+            terms = self._terms(title)
+            profile = np.zeros(len(self.vocabulary), dtype=np.float32)
+            profile[[self._column[name] for name in skills]] = 1.0
+            self._roles.append((title, terms, profile))
+
+    def _terms(self, text):
+        """Lowercase words with skill phrases collapsed to their canonical name ("ML" == "Machine Learning")."""
+        tokens = self.taxonomy.tokens(text)
+        terms = set()
+        covered = set()
+        for name, start, end in self.taxonomy.find(text):
+            terms.add(name)
+            covered.update(range(start, end))
+        for i, token in enumerate(tokens):
+            if i not in covered:
+                word = token.lower()
+                terms.add(TITLE_SYNONYMS.get(word, word))
+        return terms
+
+    def counts(self, text):
+        columns = [self._column[name] for name, _, _ in self.taxonomy.find(text)]
+        return np.bincount(columns, minlength=len(self.vocabulary)).astype(np.float32)
+
+    def weigh(self, counts):
+        return np.log1p(counts) * self.idf
+
+    def match_role(self, job_description):
+        """Best matching known role for a job title or description, or None."""
+        terms = self._terms(job_description)
+        best, best_overlap = None, 0.5
+        for title, role_terms, profile in self._roles:
+            overlap = len(terms & role_terms) / len(role_terms)
+            if overlap > best_overlap:
+                best, best_overlap = (title, profile), overlap
+        return best
+
+    def job_vector(self, job_description):
+        counts = self.counts(job_description)
+        role = self.match_role(job_description)
+        if role is not None:
+            counts = counts + role[1]
+        return self.weigh(counts), role[0] if role else None
+
+    def score_many(self, resume_texts, job_description):
+        """One result dict per resume; score is None when the job names no known skills."""
+        job, role = self.job_vector(job_description)
+        required = job > 0
+        resumes = self.weigh(np.vstack([self.counts(text) for text in resume_texts]))
+        present = resumes > 0
+
+        weights = self.idf * required
+        total = weights.sum()
+        coverage = present @ weights / total if total else np.zeros(len(resume_texts), dtype=np.float32)
+        norms = np.linalg.norm(resumes, axis=1) * np.linalg.norm(job)
+        similarity = np.divide(resumes @ job, norms, out=np.zeros_like(norms), where=norms > 0)
+        scores = np.rint(100 * (COVERAGE_WEIGHT * coverage + (1 - COVERAGE_WEIGHT) * similarity))
+
+        # Most important job skills first when listing what is missing
+        order = np.argsort(-job, kind="stable")
+        order = order[required[order]]
+        results = []
+        for i in range(len(resume_texts)):
+            hits = present[i, order]
+            results.append({
+                "score": int(scores[i]) if total else None,
+                "keyword_coverage": round(float(coverage[i]), 3),
+                "similarity": round(float(similarity[i]), 3),
+                "required_keywords": int(required.sum()),
+                "matched_keywords": [self.vocabulary[j] for j in order[hits][:MATCHED_LIMIT]],
+                "missing_keywords": [self.vocabulary[j] for j in order[~hits][:MISSING_LIMIT]],
+                "role_profile": role,
+            })
+        return results
+
+    def score(self, resume_text, job_description):
+        return self.score_many([resume_text], job_description)[0]
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_ats_scorer():
+    """Scorer over the configured taxonomy, built once per process on first use."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = ATSScorer(get_taxonomy())
+    return _scorer
@@ -1,18 +1,52 @@
 import jwt
-import os
+import time
 from functools import wraps
 from flask import request, jsonify
-from dotenv import load_dotenv
-from pymongo import MongoClient
+from config import Config
+from extensions import users_collection
+from utils.result_cache import ResultCache
 
-load_dotenv()
+SECRET_KEY = Config.SECRET_KEY
 
-SECRET_KEY = os.getenv("SECRET_KEY", "prepai_local_dev_key_2026")
 
-# Mongo connection
-client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017/"))
-db = client["prepai"]
-users_collection = db["users"]
+# Fields never needed to authorise a request; resume_data can be megabytes
+USER_PROJECTION = {"password": 0, "resume_data": 0}
+
+# Slim user records by email and decoded payloads by raw token
+user_cache = ResultCache(max_entries=Config.AUTH_USER_CACHE_SIZE, ttl=Config.AUTH_USER_CACHE_TTL)
+token_cache = ResultCache(max_entries=Config.AUTH_TOKEN_CACHE_SIZE, ttl=Config.AUTH_USER_CACHE_TTL)
+
+
+def decode_token(auth_header):
+    """Returns the JWT payload from an Authorization header value; raises on invalid tokens."""
+    token = auth_header.split(" ")[1] if " " in auth_header else auth_header
+
+    payload = token_cache.get(token)
+    if payload is not None and payload.get("exp", float("inf")) > time.time():
+        return payload
+
+    payload = jwt.decode(
+        token,
+        SECRET_KEY,
+        algorithms=["HS256"]
+    )
+    token_cache.set(token, payload)
+    return payload
+
+
+def get_auth_user(email):
+    """Slim user record for `email`, served from the cache when possible."""
+    user = user_cache.get(email)
+    if user is None:
+        user = users_collection.find_one({"email": email}, USER_PROJECTION)
+        if user:
+            user_cache.set(email, user)
+    return user
+
+
+def invalidate_user(email):
+    """Call after any write to a user document so auth stops serving the old copy."""
+    user_cache.delete(email)
 
 
 def token_required(f):
@@ -30,17 +64,9 @@ def token_required(f):
 
         try:
 
-            token = token.split(" ")[1] if " " in token else token
-
-            data = jwt.decode(
-                token,
-                SECRET_KEY,
-                algorithms=["HS256"]
-            )
+            data = decode_token(token)
 
-            user = users_collection.find_one({
-                "email": data["email"]
-            })
+            user = get_auth_user(data["email"])
 
             if not user:
                 return jsonify({"error": "User not found"}), 401
@@ -0,0 +1,86 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending work to a failing dependency.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    allow() returns False, so callers degrade immediately instead of waiting
+    for a timeout. Once `reset_timeout` seconds have passed a single probe
+    call is let through (half-open): success closes the breaker, failure
+    opens it again. A probe that ends without an outcome (cancelled, or a
+    stream closed early) is handed back with release_probe(); one that never
+    reports within `reset_timeout` is replaced by the next call.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._probe_started_at = None
+
+        self.trips = 0
+        self.rejected = 0
+        self.total_failures = 0
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and (
+                not self._probe_in_flight or time.monotonic() - self._probe_started_at >= self.reset_timeout
+            ):
+                self._probe_in_flight = True
+                self._probe_started_at = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.state = CLOSED
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """The call ended with neither success nor failure; let the next call probe instead."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+                self.trips += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "failures": self.total_failures,
+            }
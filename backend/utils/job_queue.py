@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at capacity; callers should answer 429."""
+
+
+class Job:
+    __slots__ = ("id", "status", "result", "error", "created_at", "started_at", "finished_at", "done")
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        data = {"job_id": self.id, "status": self.status}
+        if self.status == "completed":
+            data["result"] = self.result
+        elif self.status == "failed":
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    Bounded background worker pool for slow request work.
+    At most `workers` jobs run at once and at most `max_pending` wait behind
+    them. Finished jobs are kept for `ttl` seconds so clients can poll for them.
+    Jobs live in process memory, so polls must reach the same worker process.
+    """
+
+    def __init__(self, workers=2, max_pending=50, ttl=600, name="jobs"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self.queued = 0
+        self.running = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.total_queue_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _expire_locked(self):
+        cutoff = time.time() - self.ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.created_at >= cutoff:
+                break
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                self.expired += 1
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self._expire_locked()
+            if self.queued >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull("Job queue is full, try again shortly")
+            job = Job()
+            self._jobs[job.id] = job
+            self.queued += 1
+            self.submitted += 1
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            job.status = "running"
+            job.started_at = time.time()
+            self.total_queue_seconds += job.started_at - job.created_at
+        try:
+            result = fn(*args, **kwargs)
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+        with self._lock:
+            self.running -= 1
+            job.finished_at = time.time()
+            self.total_run_seconds += job.finished_at - job.started_at
+            if error is None:
+                job.status, job.result = "completed", result
+                self.completed += 1
+            else:
+                job.status, job.error = "failed", error
+                self.failed += 1
+        job.done.set()
+
+    def get(self, job_id):
+        with self._lock:
+            self._expire_locked()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queue_length": self.queued,
+                "running": self.running,
+                "tracked": len(self._jobs),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "avg_queue_ms": round(self.total_queue_seconds / finished * 1000, 2) if finished else 0.0,
+                "avg_run_ms": round(self.total_run_seconds / finished * 1000, 2) if finished else 0.0,
+            }
@@ -0,0 +1,209 @@
+import json
+import re
+
+# Characters that can change the scanner state; everything else is skipped
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+# When decoding fields, ":" and "," matter too: they tell keys from values
+_STRUCTURAL_FIELDS = re.compile(r'[{}\[\]"\\:,]')
+
+
+class JSONSchemaError(ValueError):
+    """LLM output was not a JSON object matching the expected schema."""
+
+    def __init__(self, errors, raw=""):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        self.raw = raw
+
+
+class JSONObjectScanner:
+    """
+    Incrementally finds the first top-level JSON object in a token stream.
+
+    feed() returns True as soon as the object's closing brace arrives, so the
+    caller can stop generation there instead of paying for trailing chatter.
+    Anything before the opening brace (markdown fences, preambles) is ignored.
+
+    With `fields`, the top-level string values of those keys are also decoded
+    as they arrive; take_text() returns the new (key, text) pieces since the
+    last call, so a client can show "description" while it is being written.
+    """
+
+    def __init__(self, fields=None):
+        self._parts = []
+        self.started = False
+        self.complete = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+        self.fields = frozenset(fields or ())
+        self._expect_key = False
+        self._key = None
+        self._target = None      # "key" or "value" while inside a string being captured
+        self._raw = []           # raw (still escaped) characters of that string
+        self._pending = ""       # trailing escape that may continue in the next chunk
+        self._text = []
+
+    def feed(self, chunk):
+        if self.complete:
+            return True
+        begin = 0
+        if not self.started:
+            begin = chunk.find("{")
+            if begin == -1:
+                return False
+            self.started = True
+
+        skip = -1
+        if self._escape:
+            # The escaped character is the first one of this chunk
+            self._escape = False
+            skip = 0
+
+        fields = self.fields
+        capture = begin if self._target else -1
+        for match in (_STRUCTURAL_FIELDS if fields else _STRUCTURAL).finditer(chunk, begin):
+            pos = match.start()
+            if pos == skip:
+                continue
+            ch = match.group()
+            if self._in_string:
+                if ch == "\\":
+                    if pos + 1 < len(chunk):
+                        skip = pos + 1
+                    else:
+                        self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if capture >= 0:
+                        self._raw.append(chunk[capture:pos])
+                        self._close_string()
+                        capture = -1
+                continue
+            if ch == '"':
+                self._in_string = True
+                if fields and self._depth == 1:
+                    if self._expect_key:
+                        self._target = "key"
+                    elif self._key in fields:
+                        self._target = "value"
+                    if self._target:
+                        capture = pos + 1
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{" and self._depth == 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[begin:pos + 1])
+                    self.complete = True
+                    return True
+            elif self._depth == 1:
+                # Only ":" and "," reach here, and only when decoding fields
+                self._expect_key = ch == ","
+
+        if capture >= 0:
+            self._raw.append(chunk[capture:])
+            if self._target == "value":
+                self._emit(final=False)
+        self._parts.append(chunk[begin:])
+        return False
+
+    def _close_string(self):
+        if self._target == "key":
+            self._key = json.loads('"' + "".join(self._raw) + '"')
+            self._raw = []
+        else:
+            self._emit(final=True)
+        self._target = None
+
+    def _emit(self, final):
+        raw = self._pending + "".join(self._raw)
+        self._raw = []
+        cut = len(raw) if final else _complete_prefix(raw)
+        self._pending = raw[cut:]
+        if cut:
+            self._text.append((self._key, json.loads('"' + raw[:cut] + '"')))
+
+    def take_text(self):
+        """(key, text) pieces decoded since the last call."""
+        pieces, self._text = self._text, []
+        return pieces
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+
+def _escape_start(raw):
+    """Index of the last unescaped backslash in escaped string content, or -1."""
+    i = raw.rfind("\\")
+    while i != -1:
+        start = i
+        while start > 0 and raw[start - 1] == "\\":
+            start -= 1
+        if (i - start) % 2 == 0:
+            return i
+        # An escaped backslash ("\\\\"): look before the pair
+        i = raw.rfind("\\", 0, i - 1)
+    return -1
+
+
+def _complete_prefix(raw):
+    """Length of `raw` (escaped string content) that ends on a whole escape, surrogate pairs included."""
+    cut = len(raw)
+    i = _escape_start(raw)
+    if i != -1:
+        rest = raw[i + 1:]
+        if not rest or (rest[0] == "u" and len(rest) < 5):
+            cut = i
+    # A high surrogate waits for its low half
+    i = _escape_start(raw[:cut])
+    if i != -1 and cut - i == 6 and raw[i + 1] == "u" and raw[i + 2] in "dD" and raw[i + 3] in "89abAB":
+        cut = i
+    return cut
+
+
+def extract_json_object(text):
+    """Parses the first balanced top-level JSON object in `text`."""
+    scanner = JSONObjectScanner()
+    if not scanner.feed(text):
+        raise ValueError("No complete JSON object found in response")
+    return json.loads(scanner.text)
+
+
+def validate_schema(obj, schema):
+    """
+    Checks a parsed object against a flat schema of {key: type or tuple of types}.
+    Returns a list of problems (empty when valid).
+    """
+    if not isinstance(obj, dict):
+        return ["top-level value is not an object"]
+    if not schema:
+        return []
+    errors = []
+    for key, expected in schema.items():
+        if key not in obj:
+            errors.append(f"missing key '{key}'")
+            continue
+        value = obj[key]
+        if isinstance(value, bool) and bool not in (expected if isinstance(expected, tuple) else (expected,)):
+            errors.append(f"'{key}' must not be a boolean")
+        elif not isinstance(value, expected):
+            names = "/".join(t.__name__ for t in (expected if isinstance(expected, tuple) else (expected,)))
+            errors.append(f"'{key}' should be {names}")
+    return errors
+
+
+def repair_prompt(raw, schema, errors):
+    fields = ", ".join(
+        f'"{key}": {"/".join(t.__name__ for t in (exp if isinstance(exp, tuple) else (exp,)))}'
+        for key, exp in (schema or {}).items()
+    )
+    return f"""
+    Fix this JSON so it is valid and has exactly these fields: {{{fields}}}.
+    Problems: {"; ".join(errors)}
+    JSON: {raw[:2000]}
+    Return ONLY the corrected JSON object.
+    """
@@ -0,0 +1,577 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+
+import httpx
+
+from config import Config
+from utils.single_flight import SingleFlight
+from utils.circuit_breaker import CircuitBreaker
+from utils.json_stream import JSONObjectScanner, JSONSchemaError, extract_json_object, repair_prompt, validate_schema
+
+
+class LLMGatewayBusy(Exception):
+    """Raised when a call waited longer than the queue timeout for a free slot."""
+
+
+class LLMUnavailable(Exception):
+    """Raised without calling the model while the circuit breaker is open."""
+
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when a streamed completion runs past the caller's latency budget."""
+
+
+# ============================
+# In-flight limiter (FIFO wait queue)
+# ============================
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+class InflightLimiter:
+    """
+    Caps how many LLM calls run at once. Extra callers wait in one FIFO queue,
+    whether they are request threads or coroutines, so a burst of sync and
+    async traffic is served in arrival order.
+    """
+
+    def __init__(self, max_inflight):
+        self.max_inflight = max(1, int(max_inflight))
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self.in_flight = 0
+
+        self.total_acquired = 0
+        self.total_waited = 0
+        self.total_rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_queue_depth = 0
+
+    def _record_wait(self, waited):
+        self.total_acquired += 1
+        if waited > 0:
+            self.total_waited += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _try_acquire_locked(self):
+        if self.in_flight < self.max_inflight and not self._waiters:
+            self.in_flight += 1
+            self._record_wait(0.0)
+            return True
+        return False
+
+    def _enqueue_locked(self, waiter):
+        self._waiters.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+
+    def acquire(self, timeout=None):
+        started = time.perf_counter()
+        with self._lock:
+            if self._try_acquire_locked():
+                return 0.0
+            waiter = _Waiter(event=threading.Event())
+            self._enqueue_locked(waiter)
+
+        waiter.event.wait(timeout)
+
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                self.total_rejected += 1
+                raise LLMGatewayBusy(f"No LLM slot free after {timeout}s")
+            waited = time.perf_counter() - started
+            self._record_wait(waited)
+        return waited
+
+    async def acquire_async(self, timeout=None):
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire_locked():
+                return 0.0
+            waiter = _Waiter(loop=loop, future=loop.create_future())
+            self._enqueue_locked(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    self.total_rejected += 1
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    raise LLMGatewayBusy(f"No LLM slot free after {timeout}s")
+            # The slot was handed over while we were being cancelled: keep it
+            # if we timed out (we got it after all), give it back if cancelled.
+            if isinstance(e, asyncio.CancelledError):
+                self.release()
+                raise
+
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._record_wait(waited)
+        return waited
+
+    @property
+    def queue_depth(self):
+        return len(self._waiters)
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the next waiter; in_flight is unchanged.
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                if waiter.event is not None:
+                    waiter.event.set()
+                elif not waiter.future.done():
+                    waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            else:
+                self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            avg_wait = self.total_wait_seconds / self.total_waited if self.total_waited else 0.0
+            return {
+                "max_inflight": self.max_inflight,
+                "in_flight": self.in_flight,
+                "queue_depth": len(self._waiters),
+                "peak_queue_depth": self.peak_queue_depth,
+                "acquired": self.total_acquired,
+                "waited": self.total_waited,
+                "rejected": self.total_rejected,
+                "avg_wait_ms": round(avg_wait * 1000, 2),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            }
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+# ============================
+# Gateway
+# ============================
+class LLMGateway:
+    """
+    Single entry point for every call to the Ollama server.
+    Holds long-lived pooled HTTP clients, the in-flight limiter and the
+    circuit breaker.
+
+    `timeout` on every call is the caller's total latency budget in seconds:
+    time spent queueing for a slot counts against it.
+    """
+
+    def __init__(self, host=None, model=None, max_inflight=None, pool_size=None,
+                 queue_timeout=None, request_timeout=None):
+        self.host = (host or Config.OLLAMA_HOST).rstrip("/")
+        self.model = model or Config.OLLAMA_MODEL
+        self.queue_timeout = Config.LLM_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self.request_timeout = Config.LLM_REQUEST_TIMEOUT if request_timeout is None else request_timeout
+        pool_size = pool_size or Config.LLM_POOL_SIZE
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.limiter = InflightLimiter(max_inflight or Config.LLM_MAX_INFLIGHT)
+        self.single_flight = SingleFlight()
+        self.breaker = CircuitBreaker(Config.LLM_BREAKER_THRESHOLD, Config.LLM_BREAKER_RESET)
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        # httpx.AsyncClient is bound to the loop that first used it
+        self._async_clients = {}
+
+        self.total_calls = 0
+        self.total_errors = 0
+        self.total_llm_seconds = 0.0
+        self.json_calls = 0
+        self.json_early_stops = 0
+        self.json_repairs = 0
+        self.json_repair_failures = 0
+
+    # ---------- HTTP clients ----------
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        base_url=self.host, limits=self.limits, timeout=self.request_timeout
+                    )
+        return self._client
+
+    def _async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            for stale in [l for l in self._async_clients if l.is_closed()]:
+                del self._async_clients[stale]
+            client = httpx.AsyncClient(
+                base_url=self.host, limits=self.limits, timeout=self.request_timeout
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def _payload(self, messages, model, options, format, stream=False):
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "stream": stream,
+        }
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        return payload
+
+    def _record(self, started, ok):
+        """ok is None when the caller gave up (cancelled, stream closed early): no breaker outcome."""
+        self.total_calls += 1
+        self.total_llm_seconds += time.perf_counter() - started
+        if ok is None:
+            self.breaker.release_probe()
+        elif ok:
+            self.breaker.record_success()
+        else:
+            self.total_errors += 1
+            self.breaker.record_failure()
+
+    # ---------- Deadlines & breaker ----------
+    def _deadline(self, timeout):
+        return time.perf_counter() + timeout if timeout else None
+
+    def _remaining(self, deadline, default):
+        if deadline is None:
+            return default
+        return max(0.001, min(default, deadline - time.perf_counter()))
+
+    def _admit(self, deadline):
+        """Fails fast while the breaker is open; returns the queue wait allowed."""
+        if not self.breaker.allow():
+            raise LLMUnavailable("Model server circuit breaker is open")
+        return self._remaining(deadline, self.queue_timeout)
+
+    def _acquire(self, deadline):
+        wait = self._admit(deadline)
+        try:
+            self.limiter.acquire(wait)
+        except LLMGatewayBusy:
+            # A queue that never drains means the model server is overloaded
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Interrupted while queued: says nothing about the model server
+            self.breaker.release_probe()
+            raise
+
+    async def _acquire_async(self, deadline):
+        wait = self._admit(deadline)
+        try:
+            await self.limiter.acquire_async(wait)
+        except LLMGatewayBusy:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled while queued (e.g. the client disconnected)
+            self.breaker.release_probe()
+            raise
+
+    def _flight_key(self, payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _chat_once(self, payload, timeout):
+        deadline = self._deadline(timeout)
+        self._acquire(deadline)
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = self.client.post(
+                "/api/chat", json=payload, timeout=self._remaining(deadline, self.request_timeout)
+            )
+            response.raise_for_status()
+            content = response.json()["message"]["content"]
+            ok = True
+            return content
+        finally:
+            self._record(started, ok)
+            self.limiter.release()
+
+    async def _achat_once(self, payload, timeout):
+        deadline = self._deadline(timeout)
+        await self._acquire_async(deadline)
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = await self._async_client().post(
+                "/api/chat", json=payload, timeout=self._remaining(deadline, self.request_timeout)
+            )
+            response.raise_for_status()
+            content = response.json()["message"]["content"]
+            ok = True
+            return content
+        except asyncio.CancelledError:
+            ok = None
+            raise
+        finally:
+            self._record(started, ok)
+            self.limiter.release()
+
+    # ---------- Public API ----------
+    def chat(self, messages, model=None, options=None, format=None, timeout=None,
+             coalesce=True, variants=1):
+        """
+        Blocking chat completion. Returns the assistant message content.
+        Concurrent calls with an identical payload share one upstream call
+        (see SingleFlight); pass variants > 1 to keep that many distinct
+        samples in flight, or coalesce=False to always call the model.
+        Raises LLMGatewayBusy if no slot frees up within the queue timeout,
+        and httpx errors if the model server fails.
+        """
+        payload = self._payload(messages, model, options, format)
+        if not coalesce:
+            return self._chat_once(payload, timeout)
+        return self.single_flight.do(
+            self._flight_key(payload), lambda: self._chat_once(payload, timeout), variants
+        )
+
+    async def achat(self, messages, model=None, options=None, format=None, timeout=None,
+                    coalesce=True, variants=1):
+        """Async twin of chat() sharing the same in-flight limit."""
+        payload = self._payload(messages, model, options, format)
+        if not coalesce:
+            return await self._achat_once(payload, timeout)
+        return await self.single_flight.ado(
+            self._flight_key(payload), lambda: self._achat_once(payload, timeout), variants
+        )
+
+    def stream_chat(self, messages, model=None, options=None, format=None, timeout=None):
+        """
+        Streaming chat completion. Yields content chunks as the model produces
+        them. The in-flight slot is held until the generator is exhausted or
+        closed; closing it early drops the upstream request.
+        """
+        deadline = self._deadline(timeout)
+        self._acquire(deadline)
+        started = time.perf_counter()
+        ok = False
+        try:
+            with self.client.stream(
+                "POST",
+                "/api/chat",
+                json=self._payload(messages, model, options, format, stream=True),
+                timeout=self._remaining(deadline, self.request_timeout),
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if deadline is not None and time.perf_counter() > deadline:
+                        raise LLMDeadlineExceeded(f"Generation exceeded {timeout}s budget")
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    text = chunk.get("message", {}).get("content", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
+            ok = True
+        except GeneratorExit:
+            # Closed early by the consumer: neither success nor failure
+            ok = None
+            raise
+        finally:
+            self._record(started, ok)
+            self.limiter.release()
+
+    async def astream_chat(self, messages, model=None, options=None, format=None, timeout=None):
+        """Async twin of stream_chat()."""
+        deadline = self._deadline(timeout)
+        await self._acquire_async(deadline)
+        started = time.perf_counter()
+        ok = False
+        try:
+            async with self._async_client().stream(
+                "POST",
+                "/api/chat",
+                json=self._payload(messages, model, options, format, stream=True),
+                timeout=self._remaining(deadline, self.request_timeout),
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if deadline is not None and time.perf_counter() > deadline:
+                        raise LLMDeadlineExceeded(f"Generation exceeded {timeout}s budget")
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    text = chunk.get("message", {}).get("content", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
+            ok = True
+        except (GeneratorExit, asyncio.CancelledError):
+            ok = None
+            raise
+        finally:
+            self._record(started, ok)
+            self.limiter.release()
+
+    # ---------- Structured (JSON) output ----------
+    def _check_json(self, scanner, raw, schema):
+        if scanner.complete:
+            self.json_early_stops += 1
+        candidate = scanner.text if scanner.complete else raw
+        try:
+            obj = json.loads(candidate)
+        except ValueError as e:
+            return candidate, None, [f"invalid JSON: {e}"]
+        return candidate, obj, validate_schema(obj, schema)
+
+    def _check_repair(self, content, schema, errors):
+        try:
+            obj = extract_json_object(content)
+            problems = validate_schema(obj, schema)
+        except ValueError as e:
+            problems = [str(e)]
+        if problems:
+            self.json_repair_failures += 1
+            raise JSONSchemaError(errors + problems, content)
+        return obj
+
+    def _repair_payload(self, candidate, schema, errors, model):
+        # Short, deterministic generation: the model only has to rewrite the object
+        messages = [{"role": "user", "content": repair_prompt(candidate, schema, errors)}]
+        return self._payload(messages, model, {"temperature": 0, "num_predict": 512}, "json")
+
+    def _chat_json_once(self, messages, schema, model, options, timeout, repair):
+        self.json_calls += 1
+        deadline = self._deadline(timeout)
+        scanner = JSONObjectScanner()
+        raw = []
+        stream = self.stream_chat(messages, model=model, options=options, timeout=timeout)
+        try:
+            for text in stream:
+                raw.append(text)
+                if scanner.feed(text):
+                    break
+        finally:
+            # Closing the stream drops the upstream request and stops generation
+            stream.close()
+
+        candidate, obj, errors = self._check_json(scanner, "".join(raw), schema)
+        if not errors:
+            return obj
+        if not repair:
+            raise JSONSchemaError(errors, candidate)
+        # The repair pass only gets what is left of the budget
+        return self.repair_json(candidate, schema, errors, model, timeout and self._remaining(deadline, timeout))
+
+    async def _achat_json_once(self, messages, schema, model, options, timeout, repair):
+        self.json_calls += 1
+        deadline = self._deadline(timeout)
+        scanner = JSONObjectScanner()
+        raw = []
+        stream = self.astream_chat(messages, model=model, options=options, timeout=timeout)
+        try:
+            async for text in stream:
+                raw.append(text)
+                if scanner.feed(text):
+                    break
+        finally:
+            await stream.aclose()
+
+        candidate, obj, errors = self._check_json(scanner, "".join(raw), schema)
+        if not errors:
+            return obj
+        if not repair:
+            raise JSONSchemaError(errors, candidate)
+        self.json_repairs += 1
+        content = await self._achat_once(
+            self._repair_payload(candidate, schema, errors, model), timeout and self._remaining(deadline, timeout)
+        )
+        return self._check_repair(content, schema, errors)
+
+    def repair_json(self, candidate, schema, errors, model=None, timeout=None):
+        """One cheap pass asking the model to fix malformed or off-schema JSON."""
+        self.json_repairs += 1
+        content = self._chat_once(self._repair_payload(candidate, schema, errors, model), timeout)
+        return self._check_repair(content, schema, errors)
+
+    def chat_json(self, messages, schema=None, model=None, options=None, timeout=None,
+                  coalesce=True, variants=1, repair=True):
+        """
+        Chat completion that must produce one JSON object.
+        Streams the answer and stops generation as soon as the first top-level
+        object closes, then validates it against `schema`
+        ({key: type or tuple of types}). Invalid output gets one short repair
+        call; if that fails too, JSONSchemaError is raised.
+        """
+        call = lambda: self._chat_json_once(messages, schema, model, options, timeout, repair)
+        if not coalesce:
+            return call()
+        key = self._flight_key({"json": self._payload(messages, model, options, None), "schema": sorted(schema or {})})
+        return self.single_flight.do(key, call, variants)
+
+    async def achat_json(self, messages, schema=None, model=None, options=None, timeout=None,
+                         coalesce=True, variants=1, repair=True):
+        """Async twin of chat_json()."""
+        call = lambda: self._achat_json_once(messages, schema, model, options, timeout, repair)
+        if not coalesce:
+            return await call()
+        key = self._flight_key({"json": self._payload(messages, model, options, None), "schema": sorted(schema or {})})
+        return await self.single_flight.ado(key, call, variants)
+
+    def prompt_json(self, prompt, schema=None, **kwargs):
+        """Shorthand for chat_json() with a single user message."""
+        return self.chat_json([{"role": "user", "content": prompt}], schema, **kwargs)
+
+    async def aprompt_json(self, prompt, schema=None, **kwargs):
+        return await self.achat_json([{"role": "user", "content": prompt}], schema, **kwargs)
+
+    def prompt(self, prompt, **kwargs):
+        """Shorthand for a single user message."""
+        return self.chat([{"role": "user", "content": prompt}], **kwargs)
+
+    async def aprompt(self, prompt, **kwargs):
+        return await self.achat([{"role": "user", "content": prompt}], **kwargs)
+
+    def under_pressure(self, queue_threshold):
+        """True when callers should avoid the model: breaker not closed or queue backed up."""
+        return self.breaker.state != "closed" or self.limiter.queue_depth >= queue_threshold
+
+    def stats(self):
+        avg = self.total_llm_seconds / self.total_calls if self.total_calls else 0.0
+        return {
+            "model": self.model,
+            "calls": self.total_calls,
+            "errors": self.total_errors,
+            "avg_llm_ms": round(avg * 1000, 2),
+            "limiter": self.limiter.stats(),
+            "single_flight": self.single_flight.stats(),
+            "circuit_breaker": self.breaker.stats(),
+            "json": {
+                "calls": self.json_calls,
+                "early_stops": self.json_early_stops,
+                "repairs": self.json_repairs,
+                "repair_failures": self.json_repair_failures,
+            },
+        }
+
+
+# Singleton instance for import
+llm_gateway = LLMGateway()
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(doc, field="created_at"):
+    """Opaque cursor pointing just past `doc` in a (field desc, _id desc) ordering."""
+    raw = json.dumps({"t": doc[field].isoformat(), "id": str(doc["_id"])})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def keyset_filter(query, cursor, field="created_at"):
+    """
+    Adds the keyset condition for the page after `cursor` to `query`.
+    Pair with sort([(field, -1), ("_id", -1)]) so ties on `field` stay stable.
+    """
+    if not cursor:
+        return query
+    value, last_id = decode_cursor(cursor)
+    return {
+        **query,
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}},
+        ],
+    }
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import Config
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing pool is saturated; callers should answer 429."""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated, bounded thread pool.
+
+    scrypt and pbkdf2 release the GIL inside OpenSSL, so `workers` threads
+    use up to `workers` cores without blocking request threads. At most
+    `workers + max_pending` operations are admitted; beyond that callers get
+    PasswordPoolBusy immediately instead of queueing behind a login storm.
+    """
+
+    def __init__(self, method, workers=2, max_pending=32, timeout=10.0):
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        # Hash prefix ("scrypt:32768:8:1") as werkzeug writes it for this method
+        self._prefix = generate_password_hash("", method).split("$", 1)[0]
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+
+        self.hashes = 0
+        self.verifications = 0
+        self.rehashes = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+
+    def _timed(self, fn, args):
+        start = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.total_seconds += time.monotonic() - start
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy("Too many sign-ins in progress, try again shortly")
+        try:
+            future = self._executor.submit(self._timed, fn, args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _wait(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise PasswordPoolBusy("Sign-in is taking too long, try again shortly")
+
+    def hash(self, password):
+        result = self._wait(self._submit(generate_password_hash, password, self.method))
+        with self._lock:
+            self.hashes += 1
+        return result
+
+    def verify(self, pwhash, password):
+        result = self._wait(self._submit(check_password_hash, pwhash, password))
+        with self._lock:
+            self.verifications += 1
+        return result
+
+    def needs_rehash(self, pwhash):
+        """True if `pwhash` was made with a different method or cost than configured."""
+        return pwhash.split("$", 1)[0] != self._prefix
+
+    def rehash_later(self, password, on_done):
+        """
+        Hashes `password` with the current settings in the background and
+        passes the new hash to on_done. Skipped when the pool is busy; the
+        next login will try again.
+        """
+        try:
+            future = self._submit(generate_password_hash, password, self.method)
+        except PasswordPoolBusy:
+            return
+
+        def finished(f):
+            if f.exception() is not None:
+                print(f"Password rehash failed: {f.exception()}")
+                return
+            with self._lock:
+                self.rehashes += 1
+            on_done(f.result())
+
+        future.add_done_callback(finished)
+
+    def stats(self):
+        with self._lock:
+            done = self.hashes + self.verifications + self.rehashes
+            return {
+                "method": self._prefix,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "hashes": self.hashes,
+                "verifications": self.verifications,
+                "rehashes": self.rehashes,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "avg_ms": round(self.total_seconds / done * 1000, 1) if done else 0.0,
+            }
+
+
+password_hasher = PasswordHasher(
+    Config.PASSWORD_HASH_METHOD,
+    workers=Config.PASSWORD_POOL_WORKERS,
+    max_pending=Config.PASSWORD_POOL_MAX_PENDING,
+    timeout=Config.PASSWORD_POOL_TIMEOUT,
+)
@@ -0,0 +1,200 @@
+import re
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def question_text(question):
+    return f"{question.get('title', '')} {question.get('description', '')}".strip()
+
+
+class HashedVectorizer:
+    """
+    Stateless text embedding: word unigrams and bigrams hashed into `dims`
+    buckets with sublinear term frequency, L2-normalised so a dot product is
+    the cosine similarity. No vocabulary to fit or persist.
+    """
+
+    def __init__(self, dims=512):
+        self.dims = dims
+
+    def transform(self, text):
+        words = _TOKEN.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vec = np.zeros(self.dims, dtype=np.float32)
+        if not features:
+            return vec
+        idx = np.fromiter((zlib.crc32(f.encode("utf-8")) % self.dims for f in features), dtype=np.int64, count=len(features))
+        counts = np.bincount(idx, minlength=self.dims).astype(np.float32)
+        vec = np.log1p(counts)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+class QuestionBank:
+    """
+    Keeps every generated question with its (role, experience, focus) tags
+    and an in-memory similarity index over them, so questions can be served
+    without calling the model and near-duplicates can be detected.
+
+    Questions are persisted to Mongo (when a collection is given) and loaded
+    back into the index on first use.
+    """
+
+    def __init__(self, collection=None, dims=512, duplicate_threshold=0.9, max_size=20000):
+        self.collection = collection
+        self.vectorizer = HashedVectorizer(dims)
+        self.duplicate_threshold = duplicate_threshold
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._loaded = collection is None
+        self._matrix = np.zeros((256, dims), dtype=np.float32)
+        self._tag_ids = np.zeros(256, dtype=np.int32)
+        self._tags = {}
+        self._questions = []
+
+        self.added = 0
+        self.duplicates = 0
+        self.served = 0
+        self.bank_misses = 0
+
+    # ---------- Index ----------
+    def _tag_id(self, role, experience, focus):
+        key = (str(role).lower(), str(experience).lower(), str(focus).lower())
+        if key not in self._tags:
+            self._tags[key] = len(self._tags)
+        return self._tags[key]
+
+    def _append(self, question, vec, tag_id):
+        n = len(self._questions)
+        if n == self._matrix.shape[0]:
+            self._matrix = np.vstack([self._matrix, np.zeros_like(self._matrix)])
+            self._tag_ids = np.concatenate([self._tag_ids, np.zeros_like(self._tag_ids)])
+        self._matrix[n] = vec
+        self._tag_ids[n] = tag_id
+        self._questions.append(question)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                docs = self.collection.find(
+                    {}, {"_id": 0, "role": 1, "experience": 1, "focus": 1, "question": 1}
+                ).limit(self.max_size)
+                for doc in docs:
+                    question = doc["question"]
+                    tag_id = self._tag_id(doc["role"], doc["experience"], doc["focus"])
+                    self._append(question, self.vectorizer.transform(question_text(question)), tag_id)
+            except Exception as e:
+                print(f"Question bank load failed: {e}")
+
+    def _similarities(self, vec, tag_id=None):
+        n = len(self._questions)
+        scores = self._matrix[:n] @ vec
+        if tag_id is not None:
+            scores = np.where(self._tag_ids[:n] == tag_id, scores, -1.0)
+        return scores
+
+    # ---------- Public API ----------
+    def add(self, question, role, experience, focus):
+        """Stores a generated question unless a near-duplicate is already banked."""
+        text = question_text(question)
+        if not text:
+            return False
+        self._ensure_loaded()
+        vec = self.vectorizer.transform(text)
+        with self._lock:
+            tag_id = self._tag_id(role, experience, focus)
+            if self._questions and self._similarities(vec, tag_id).max() >= self.duplicate_threshold:
+                self.duplicates += 1
+                return False
+            if len(self._questions) >= self.max_size:
+                return False
+            self._append(question, vec, tag_id)
+            self.added += 1
+
+        if self.collection is not None:
+            try:
+                self.collection.insert_one({
+                    "role": role, "experience": experience, "focus": focus,
+                    "question": question, "created_at": datetime.utcnow(),
+                })
+            except Exception as e:
+                print(f"Question bank insert failed: {e}")
+        return True
+
+    def is_repeat(self, question, seen):
+        """True if `question` nearly duplicates one of the `seen` questions."""
+        if not seen:
+            return False
+        vec = self.vectorizer.transform(question_text(question))
+        seen_matrix = np.stack([self.vectorizer.transform(question_text(q)) for q in seen])
+        return bool((seen_matrix @ vec).max() >= self.duplicate_threshold)
+
+    def pick(self, role, experience, focus, seen=()):
+        """
+        Returns a banked question for these tags that is not a near-duplicate
+        of anything in `seen`, or None if there is none.
+        """
+        self._ensure_loaded()
+        seen_matrix = None
+        if seen:
+            seen_matrix = np.stack([self.vectorizer.transform(question_text(q)) for q in seen])
+
+        def unseen(rows):
+            if seen_matrix is None:
+                return rows
+            return rows[(self._matrix[rows] @ seen_matrix.T).max(axis=1) < self.duplicate_threshold]
+
+        with self._lock:
+            n = len(self._questions)
+            key = (str(role).lower(), str(experience).lower(), str(focus).lower())
+            if not n or key not in self._tags:
+                self.bank_misses += 1
+                return None
+            candidates = np.flatnonzero(self._tag_ids[:n] == self._tags[key])
+            # A small random sample almost always has an unseen question; scan all only if not
+            found = unseen(candidates[np.random.randint(len(candidates), size=min(32, len(candidates)))])
+            if not len(found):
+                found = unseen(np.random.permutation(candidates))
+            if not len(found):
+                self.bank_misses += 1
+                return None
+            self.served += 1
+            return dict(self._questions[int(found[0])])
+
+    def nearest(self, text, k=5, role=None, experience=None, focus=None):
+        """k most similar banked questions to free text, optionally within one tag set."""
+        self._ensure_loaded()
+        vec = self.vectorizer.transform(text)
+        with self._lock:
+            if not self._questions:
+                return []
+            tag_id = None
+            if role is not None:
+                key = (str(role).lower(), str(experience).lower(), str(focus).lower())
+                if key not in self._tags:
+                    return []
+                tag_id = self._tags[key]
+            scores = self._similarities(vec, tag_id)
+            top = np.argsort(-scores)[:k]
+            return [(dict(self._questions[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._questions),
+                "tag_sets": len(self._tags),
+                "added": self.added,
+                "duplicates_skipped": self.duplicates,
+                "served": self.served,
+                "misses": self.bank_misses,
+            }
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _SessionBuffer:
+    __slots__ = ("key", "questions", "pending")
+
+    def __init__(self, key):
+        self.key = key
+        self.questions = deque()  # (question, generation_seconds)
+        self.pending = 0
+
+
+class QuestionPrefetcher:
+    """
+    Generates the next few questions of an interview session in the background
+    while the candidate is answering, so /next can pop one from a buffer
+    instead of waiting on the model.
+
+    Buffers live in process memory and are keyed by session id. The number of
+    tracked sessions is capped; the least recently used one is dropped first.
+    """
+
+    def __init__(self, generate_fn, depth=2, workers=2, max_sessions=1000):
+        self.generate_fn = generate_fn
+        self.depth = depth
+        self.max_sessions = max_sessions
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+        self.seconds_saved = 0.0
+
+    def _session(self, session_id, key):
+        buf = self._sessions.get(session_id)
+        if buf is None or buf.key != key:
+            buf = _SessionBuffer(key)
+            self._sessions[session_id] = buf
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        return buf
+
+    def ensure(self, session_id, role, experience, focus):
+        """Top the session's buffer up to `depth` questions in the background."""
+        if self.depth <= 0:
+            return
+        key = (role, experience, focus)
+        with self._lock:
+            buf = self._session(session_id, key)
+            missing = self.depth - len(buf.questions) - buf.pending
+            buf.pending += max(missing, 0)
+        for _ in range(missing):
+            self._executor.submit(self._fill, session_id, buf)
+
+    def _fill(self, session_id, buf):
+        started = time.perf_counter()
+        try:
+            question = self.generate_fn(*buf.key)
+        except Exception as e:
+            print(f"Question prefetch failed: {e}")
+            question = None
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            buf.pending -= 1
+            if question is None:
+                self.failed += 1
+                return
+            self.generated += 1
+            # The session may have been completed or evicted meanwhile
+            if self._sessions.get(session_id) is buf:
+                buf.questions.append((question, elapsed))
+
+    def pop(self, session_id):
+        """Return a buffered question for the session, or None on a miss."""
+        with self._lock:
+            buf = self._sessions.get(session_id)
+            if buf is None or not buf.questions:
+                self.misses += 1
+                return None
+            question, elapsed = buf.questions.popleft()
+            self.hits += 1
+            self.seconds_saved += elapsed
+            return question
+
+    def discard(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            served = self.hits + self.misses
+            return {
+                "depth": self.depth,
+                "sessions": len(self._sessions),
+                "buffered": sum(len(b.questions) for b in self._sessions.values()),
+                "pending": sum(b.pending for b in self._sessions.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / served, 3) if served else 0.0,
+                "generated": self.generated,
+                "failed": self.failed,
+                "seconds_saved": round(self.seconds_saved, 2),
+            }
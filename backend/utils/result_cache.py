@@ -0,0 +1,133 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+def content_key(*parts):
+    """Stable hash over raw bytes and strings, used as a cache key."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class MongoCacheBackend:
+    """
+    Persistent second tier stored in a Mongo collection, so cached results
+    survive restarts and are shared by every worker process. Mongo's TTL
+    monitor removes expired documents.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexed = False
+
+    def _ensure_index(self):
+        if not self._indexed:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+    def get(self, key):
+        doc = self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return doc["value"] if doc else None
+
+    def set(self, key, value, ttl):
+        self._ensure_index()
+        self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "value": value, "expires_at": datetime.utcnow() + timedelta(seconds=ttl)},
+            upsert=True,
+        )
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache with a TTL, optionally backed by a persistent store.
+    Lookups check process memory first, then the backend; backend hits are
+    copied into memory.
+    """
+
+    def __init__(self, max_entries=256, ttl=86400, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.backend_errors = 0
+
+    def _put_local(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(key)
+            except Exception as e:
+                print(f"Result cache backend error: {e}")
+                value = None
+                self.backend_errors += 1
+            if value is not None:
+                with self._lock:
+                    self._put_local(key, value, now + self.ttl)
+                    self.hits += 1
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._put_local(key, value, time.time() + self.ttl)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception as e:
+                print(f"Result cache backend error: {e}")
+                self.backend_errors += 1
+
+    def delete(self, key):
+        """Drops a key from process memory (the persistent backend is left alone)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "persistent": self.backend is not None,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "backend_errors": self.backend_errors,
+            }
@@ -1,13 +1,228 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 import fitz  # This is provided by pymupdf
 
-def extract_text_from_file(file_path):
+from config import Config
+from utils.llm_gateway import llm_gateway
+from utils.skill_taxonomy import get_taxonomy
+
+# MuPDF holds the GIL and its documents are not thread-safe, so long PDFs are
+# split into page ranges and extracted in worker processes, each opening its
+# own copy of the document from the bytes.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def start_page_pool():
+    """
+    Creates the extraction pool; the app calls this at startup. Workers come
+    from a forkserver (spawn where that is unavailable), never a fork of the
+    server, whose request, pymongo and executor threads may hold locks the
+    child would inherit locked.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_EXTRACT_WORKERS, mp_context=multiprocessing.get_context(method)
+            )
+    return _pool
+
+
+def _page_pool():
+    return _pool or start_page_pool()
+
+
+def _collect(doc, start, stop, max_chars=None):
+    parts = []
+    size = 0
+    for number in range(start, min(stop, doc.page_count)):
+        text = doc[number].get_text()
+        parts.append(text)
+        size += len(text)
+        if max_chars is not None and size >= max_chars:
+            break
+    return parts, size
+
+
+def _extract_range(data, start, stop, max_chars=None):
+    """Worker: text of pages [start, stop), stopping once max_chars characters are collected."""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "".join(_collect(doc, start, stop, max_chars)[0])
+
+
+def _extract_parallel(data, start, page_count, max_chars, size, workers):
+    # Ranges are consumed in order, so once the budget is reached the ones
+    # that have not started yet are cancelled
+    step = -(-(page_count - start) // (workers * 2))
+    futures = [
+        _page_pool().submit(_extract_range, data, first, first + step, max_chars)
+        for first in range(start, page_count, step)
+    ]
+    parts = []
+    for future in futures:
+        if max_chars is not None and size >= max_chars:
+            future.cancel()
+            continue
+        text = future.result()
+        parts.append(text)
+        size += len(text)
+    return parts
+
+
+def extract_text(data, max_chars=None, parallel=True):
+    """
+    Text of a PDF held in memory (bytes or a file-like object), without a
+    temp file. With max_chars, extraction stops at the first page that
+    reaches the budget, so the result may run past it; slice if exact.
+    """
+    if hasattr(data, "read"):
+        data = data.read()
     try:
-        text = ""
-        # Open the PDF document
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text()
-        return text
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            page_count = doc.page_count
+            workers = Config.PDF_EXTRACT_WORKERS
+            if not parallel or workers < 2 or page_count < Config.PDF_PARALLEL_MIN_PAGES:
+                return "".join(_collect(doc, 0, page_count, max_chars)[0])
+            # A budget is usually met by the first page or two; read those here
+            # before paying for the pool
+            head = Config.PDF_PARALLEL_MIN_PAGES // 2 if max_chars is not None else 0
+            parts, size = _collect(doc, 0, head, max_chars)
+        if head < page_count and (max_chars is None or size < max_chars):
+            parts += _extract_parallel(data, head, page_count, max_chars, size, workers)
+        return "".join(parts)
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+
+def extract_text_pooled(data, max_chars=None):
+    """extract_text() on the worker process pool, for callers handling many PDFs at once."""
+    return _page_pool().submit(extract_text, data, max_chars, False).result()
+
+
+def extract_text_from_file(file_path, max_chars=None):
+    try:
+        with open(file_path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Error extracting PDF text: {e}")
+        return ""
+    return extract_text(data, max_chars)
+
+
+# ============================
+# Structured parsing: LLM first, spaCy as the fallback
+# ============================
+PARSE_SCHEMA = {"skills": list, "experience": list, "education": list}
+
+EDUCATION_WORDS = {"university", "college", "msc", "bsc"}
+
+# The fallback only reads entities and sentence boundaries; the tagger,
+# lemmatizer and (when the model ships a senter) the parser are switched off.
+FALLBACK_PIPES = ("ner", "senter")
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def _load_nlp():
+    try:
+        import spacy
+    except ImportError:
+        print("spaCy is not installed, resume fallback parsing is disabled")
+        return False
+    try:
+        nlp = spacy.load(Config.SPACY_MODEL)
+    except OSError:
+        print(f"Error: spaCy model '{Config.SPACY_MODEL}' not found. "
+              f"Please run: python -m spacy download {Config.SPACY_MODEL}")
+        return False
+
+    keep = set(FALLBACK_PIPES)
+    if "senter" in nlp.component_names:
+        if "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+    else:
+        keep.add("parser")
+    # Shared tok2vec layers stay on only if a kept pipe listens to them
+    for name in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe(name), "listening_components", [])
+        if keep.intersection(listeners):
+            keep.add(name)
+    for name in nlp.pipe_names:
+        if name not in keep:
+            nlp.disable_pipe(name)
+    if not {"senter", "parser", "sentencizer"}.intersection(nlp.pipe_names):
+        nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def get_nlp():
+    """The fallback pipeline, loaded once per process on first use. None if unavailable."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = _load_nlp()
+    return _nlp or None
+
+
+def _fallback_fields(doc):
+    skills = sorted(get_taxonomy().match(doc.text))
+    experience = {ent.text for ent in doc.ents if ent.label_ == "ORG"}
+    education = {token.sent.text for token in doc if token.lower_ in EDUCATION_WORDS}
+    return {"skills": skills, "experience": list(experience), "education": list(education)}
+
+
+def parse_resumes_with_spacy(texts, batch_size=None):
+    """spaCy fallback for many resumes at once through nlp.pipe. One dict per text."""
+    nlp = get_nlp()
+    if nlp is None:
+        return [{} for _ in texts]
+    docs = nlp.pipe(texts, batch_size=batch_size or Config.SPACY_BATCH_SIZE)
+    return [_fallback_fields(doc) for doc in docs]
+
+
+def parse_resume_with_spacy(text):
+    return parse_resumes_with_spacy([text])[0]
+
+
+def parse_resume_with_llm(text):
+    """Skills, experience and education through the LLM; falls back to spaCy."""
+    prompt = f"""
+    You are an expert resume parser. Extract the following information from the resume text below.
+    Return ONLY a valid JSON object with the keys "skills", "experience", and "education".
+    - "skills": A list of technical skills (e.g., Python, React, AWS).
+    - "experience": A list of strings, each string containing a job title and company (e.g., "Software Engineer at Google").
+    - "education": A list of strings, each string containing a degree and institution (e.g., "MSc in Computer Science at Stanford").
+
+    Resume Text:
+    ---
+    {text}
+    ---
+
+    JSON Output:
+    """
+    try:
+        return llm_gateway.prompt_json(prompt, PARSE_SCHEMA, timeout=Config.LLM_BUDGET_RESUME)
+    except Exception as e:
+        print(f"Warning: LLM resume parsing failed ({e}). Falling back to spaCy.")
+        return parse_resume_with_spacy(text)
+
+
+def parse_resume(pdf=None, text=None):
+    """
+    Structured fields from a resume. `pdf` may be a path, bytes or a
+    file-like object; otherwise pass the already extracted `text`.
+    """
+    if isinstance(pdf, str):
+        text = extract_text_from_file(pdf)
+    elif pdf is not None:
+        text = extract_text(pdf)
+    elif not text:
+        raise ValueError("Provide either a PDF or resume text.")
+    return parse_resume_with_llm(text)
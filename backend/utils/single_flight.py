@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+
+class _Flight:
+    __slots__ = ("event", "future", "result", "error", "followers")
+
+    def __init__(self, event=None, future=None):
+        self.event = event
+        self.future = future
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one upstream call.
+
+    `variants` lets up to that many distinct calls run for one key at the same
+    time; later callers join the least-shared one. Use variants=1 for
+    deterministic prompts and a higher value where sampled (temperature > 0)
+    outputs should stay varied across callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._async_flights = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join_or_lead(self, table, key, variants, new_flight):
+        with self._lock:
+            flights = table.setdefault(key, [])
+            if len(flights) >= max(1, variants):
+                flight = min(flights, key=lambda f: f.followers)
+                flight.followers += 1
+                self.coalesced += 1
+                return flight, False
+            flight = new_flight()
+            flights.append(flight)
+            self.leaders += 1
+            return flight, True
+
+    def _finish(self, table, key, flight):
+        with self._lock:
+            flights = table.get(key)
+            if flights is not None:
+                flights.remove(flight)
+                if not flights:
+                    del table[key]
+
+    def do(self, key, fn, variants=1):
+        """Run fn() for the first caller of `key`; concurrent callers share its result."""
+        flight, leader = self._join_or_lead(
+            self._flights, key, variants, lambda: _Flight(event=threading.Event())
+        )
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._finish(self._flights, key, flight)
+            flight.event.set()
+
+    async def ado(self, key, coro_fn, variants=1):
+        """Async twin of do(); flights are shared within one event loop."""
+        loop = asyncio.get_running_loop()
+        flight, leader = self._join_or_lead(
+            self._async_flights, (id(loop), key), variants,
+            lambda: _Flight(future=loop.create_future()),
+        )
+        if not leader:
+            return await asyncio.shield(flight.future)
+
+        try:
+            result = await coro_fn()
+            flight.future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except Exception as e:
+            flight.future.set_exception(e)
+            # Mark retrieved so an unshared failure does not log a warning
+            flight.future.exception()
+            raise
+        finally:
+            self._finish(self._async_flights, (id(loop), key), flight)
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                "upstream_calls": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesce_rate": round(self.coalesced / calls, 3) if calls else 0.0,
+                "in_flight_keys": len(self._flights) + len(self._async_flights),
+            }
@@ -0,0 +1,123 @@
+import json
+import re
+import threading
+
+from config import Config
+
+# Words keep inner ".", "/", "-" and "+#" so node.js, ci/cd, c++ and c# are one token
+TOKEN_RE = re.compile(r"\.?[A-Za-z0-9+#]+(?:[./-][A-Za-z0-9+#]+)*")
+# Where a compound that is not itself a known phrase is split ("Python/Django", "AWS-certified")
+COMPOUND_SPLIT_RE = re.compile(r"[/-]")
+
+# Trie key marking the end of a phrase; the tokenizer never produces it
+END = ""
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text)
+
+
+class SkillTaxonomy:
+    """
+    Skill names and aliases compiled into a token trie.
+
+    Each phrase is a path of lowercase tokens ending in {END: (skill, exact)}.
+    find() walks the trie from every token and keeps the longest phrase, so
+    the cost depends on the resume length, not on how many skills there are.
+    Phrases listed under "exact" in the data file ("Go", "R", "Spring") only
+    match with that casing. A "/" or "-" compound stays one token only when
+    some phrase contains it whole (ci/cd, tcp/ip); otherwise tokens() splits
+    it, so "Python/Django" and "Java-based" match their parts. The file also carries per-category weights and
+    the key skills of common roles, used by utils/ats_scorer.py.
+    """
+
+    def __init__(self, skills, version=None, category_weights=None, roles=None):
+        self.version = version
+        self.category_weights = category_weights or {}
+        self.roles = roles or {}
+        self.categories = {}
+        self.phrases = 0
+        self.max_tokens = 0
+        self._trie = {}
+        self._compounds = set()
+        for skill in skills:
+            name = skill["name"]
+            self.categories[name] = skill.get("category")
+            exact = set(skill.get("exact", ()))
+            for phrase in (name, *skill.get("aliases", ())):
+                tokens = tokenize(phrase)
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    if COMPOUND_SPLIT_RE.search(token):
+                        self._compounds.add(token.lower())
+                    node = node.setdefault(token.lower(), {})
+                node[END] = (name, tuple(tokens) if phrase in exact else None)
+                self.phrases += 1
+                self.max_tokens = max(self.max_tokens, len(tokens))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["skills"], version=data.get("version"),
+            category_weights=data.get("category_weights"), roles=data.get("roles"),
+        )
+
+    def __len__(self):
+        return len(self.categories)
+
+    def tokens(self, text):
+        """tokenize(), with compounds that are not known phrases split into their parts."""
+        result = []
+        for token in tokenize(text):
+            if COMPOUND_SPLIT_RE.search(token) and token.lower() not in self._compounds:
+                result.extend(part for part in COMPOUND_SPLIT_RE.split(token) if part)
+            else:
+                result.append(token)
+        return result
+
+    def find(self, text):
+        """(skill, start, end) spans over tokens(text) for every match, longest phrase first at each position."""
+        tokens = self.tokens(text)
+        lowered = [token.lower() for token in tokens]
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            best = None
+            j = i
+            while j < len(tokens):
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                hit = node.get(END)
+                if hit is not None and (hit[1] is None or hit[1] == tuple(tokens[i:j])):
+                    best = (hit[0], i, j)
+            if best:
+                matches.append(best)
+                i = best[2]
+            else:
+                i += 1
+        return matches
+
+    def match(self, text):
+        """Distinct canonical skill names mentioned in `text`."""
+        return {name for name, _, _ in self.find(text)}
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """The configured taxonomy, compiled once per process on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.load(Config.SKILL_TAXONOMY_PATH)
+    return _taxonomy
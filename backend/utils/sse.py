@@ -0,0 +1,13 @@
+import json
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Headers that stop proxies (nginx, dev servers) from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
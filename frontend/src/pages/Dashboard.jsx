@@ -25,18 +25,18 @@ const Dashboard = () => {
   const loadDashboardData = async () => {
     if (!user) return;
     try {
-      // Fetch history from MongoDB 
-      const historyData = await api.client.get("/api/interview/history");
-      const sessions = historyData.data || [];
-      setHistory(sessions);
-
-      if (sessions.length > 0) {
-        const total = sessions.length;
-        const avg = Math.round(
-          sessions.reduce((acc, curr) => acc + (curr.overall_score || 0), 0) / total
-        );
-        setStats({ total_interviews: total, average_score: avg });
-      }
+      // Recent sessions plus the precomputed per-user stats
+      const [historyData, dashboardData] = await Promise.all([
+        api.client.get("/api/interview/history", { params: { limit: 2 } }),
+        api.client.get("/api/dashboard/"),
+      ]);
+      setHistory(historyData.data?.items || []);
+
+      const userStats = dashboardData.data?.stats || {};
+      setStats({
+        total_interviews: userStats.interviews || 0,
+        average_score: Math.round(userStats.avg_score || 0),
+      });
     } catch (err) {
       console.error("Dashboard Sync Error:", err);
     } finally {
@@ -48,6 +48,16 @@ const Dashboard = () => {
     loadDashboardData();
   }, [user]);
 
+  // History only carries summaries; load answers and feedback for the report
+  const openReport = async (session) => {
+    try {
+      const res = await api.client.get(`/api/interview/session/${session._id}`);
+      navigate("/interview/report", { state: { history: res.data.answers, config: res.data } });
+    } catch (err) {
+      alert("Could not load session");
+    }
+  };
+
   const handleDelete = async (e, sessionId) => {
     e.stopPropagation(); 
     if (!window.confirm("Permanently delete this session record?")) return;
@@ -142,7 +152,7 @@ const Dashboard = () => {
                       <div 
                         key={session._id} 
                         className="history-card-small glass-card fade-in"
-                        onClick={() => navigate("/interview/report", { state: { history: session.answers, config: session } })}
+                        onClick={() => openReport(session)}
                       >
                           <div className="hc-header">
                               <div className="status-indicator">
@@ -40,19 +40,12 @@ const Profile = () => {
     const fetchSyncStats = async () => {
       if (!user) return;
       try {
-        const res = await api.client.get("/api/interview/history");
-        const historyData = res.data || [];
-
-        if (historyData.length > 0) {
-          const total = historyData.length;
-          const avg = Math.round(
-            historyData.reduce(
-              (acc, curr) => acc + (curr.overall_score || 0),
-              0,
-            ) / total,
-          );
-          setStats({ interviews: total, avgScore: avg });
-        }
+        const res = await api.client.get("/api/dashboard/");
+        const userStats = res.data?.stats || {};
+        setStats({
+          interviews: userStats.interviews || 0,
+          avgScore: Math.round(userStats.avg_score || 0),
+        });
       } catch (err) {
         console.error("Profile Stats Sync Error:", err);
       } finally {
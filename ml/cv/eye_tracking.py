@@ -1,7 +1,12 @@
+from collections import deque
+from functools import lru_cache
+
 import cv2
 import numpy as np
 
 # --- Landmark constants for MediaPipe Face Mesh ---
+NUM_LANDMARKS = 468
+
 LEFT_EYE = [362, 382, 381, 380, 373, 374, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
 RIGHT_EYE = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
 
@@ -14,53 +19,208 @@ MOUTH_RIGHT = 291
 EAR_THRESHOLD = 0.2 # Eye Aspect Ratio threshold for blink
 MOUTH_OPEN_THRESHOLD = 15.0 # Threshold to detect if talking
 
+# --- Index arrays for fancy indexing, shape (..., pairs, 2 ends) ---
+# EAR uses two vertical pairs (outer, inner) and one horizontal pair per eye,
+# taken from positions 1/14, 2/13 and 0/8 of the 16-point eye contours.
+def _eye_pairs(eye):
+    return [[eye[1], eye[14]], [eye[2], eye[13]]], [eye[0], eye[8]]
+
+_LEFT_V, _LEFT_H = _eye_pairs(LEFT_EYE)
+_RIGHT_V, _RIGHT_H = _eye_pairs(RIGHT_EYE)
+EYE_VERTICAL = np.array([_LEFT_V, _RIGHT_V])      # (2 eyes, 2 pairs, 2)
+EYE_HORIZONTAL = np.array([_LEFT_H, _RIGHT_H])    # (2 eyes, 2)
+MOUTH_PAIRS = np.array([[MOUTH_TOP, MOUTH_BOTTOM], [MOUTH_LEFT, MOUTH_RIGHT]])
+
+# Nose tip, chin, left eye corner, right eye corner, left and right mouth corners
+POSE_LANDMARKS = np.array([1, 152, 33, 263, 61, 291])
+
+# Standard 3D face model points, in POSE_LANDMARKS order
+MODEL_POINTS = np.array([
+    (0.0, 0.0, 0.0),      # Nose tip
+    (0.0, -330.0, -65.0), # Chin
+    (-225.0, 170.0, -135.0), # Left eye left corner
+    (225.0, 170.0, -135.0),  # Right eye right corner
+    (-150.0, -150.0, -125.0), # Left mouth corner
+    (150.0, -150.0, -125.0),  # Right mouth corner
+])
+DIST_COEFFS = np.zeros((4, 1), dtype=np.float64)
+
+
+@lru_cache(maxsize=8)
+def camera_matrix(frame_w, frame_h):
+    """Pinhole approximation for a frame size; built once per resolution."""
+    focal_length = frame_w
+    center = (frame_w / 2, frame_h / 2)
+    return np.array([[focal_length, 0, center[0]], [0, focal_length, center[1]], [0, 0, 1]], dtype=np.float64)
+
+
+# Every landmark the metrics below read (eyes, mouth, pose points)
+TRACKED_LANDMARKS = np.unique(np.concatenate([
+    EYE_VERTICAL.ravel(), EYE_HORIZONTAL.ravel(), MOUTH_PAIRS.ravel(), POSE_LANDMARKS,
+]))
+_TRACKED = TRACKED_LANDMARKS.tolist()
+
+# Landmarks whose movement means the blink or gaze state may change: eye contours and nose tip.
+# The mouth is left out, so talking alone does not stop frame skipping.
+STABILITY_LANDMARKS = np.unique(np.concatenate([EYE_VERTICAL.ravel(), EYE_HORIZONTAL.ravel(), POSE_LANDMARKS[:1]]))
+
+
+# --- One conversion per frame ---
+
+def landmarks_to_array(landmarks, w, h, tracked_only=False):
+    """
+    Face mesh landmarks (a MediaPipe landmark list or its .landmark field) as
+    a (468, 2) float64 array of pixel coordinates. Arrays pass through as-is.
+
+    Reading 468 protobuf objects is most of the per-frame cost, so with
+    tracked_only only TRACKED_LANDMARKS are filled in and the other rows are
+    NaN; every metric in this module still works on the result.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    landmarks = getattr(landmarks, "landmark", landmarks)
+    if tracked_only:
+        points = np.full((len(landmarks), 2), np.nan)
+        picked = (landmarks[i] for i in _TRACKED)
+        points[TRACKED_LANDMARKS] = np.fromiter(
+            (v for lm in picked for v in (lm.x, lm.y)), dtype=np.float64, count=2 * len(_TRACKED),
+        ).reshape(-1, 2)
+    else:
+        n = len(landmarks)
+        points = np.fromiter((v for lm in landmarks for v in (lm.x, lm.y)), dtype=np.float64, count=2 * n)
+        points = points.reshape(n, 2)
+    points *= (w, h)
+    return points
+
+
+def _distances(points, pairs):
+    """Euclidean distances between landmark pairs; points (..., N, 2), pairs (..., 2)."""
+    diff = points[..., pairs[..., 0], :] - points[..., pairs[..., 1], :]
+    return np.hypot(diff[..., 0], diff[..., 1])
+
+
+# All eye and mouth pairs, so one gather per frame feeds every metric:
+# 4 eye verticals (left outer/inner, right outer/inner), 2 eye horizontals, mouth vertical/horizontal
+METRIC_PAIRS = np.concatenate([EYE_VERTICAL.reshape(-1, 2), EYE_HORIZONTAL, MOUTH_PAIRS])
+
+
+def _ears(d):
+    vertical = d[..., :4].reshape(d.shape[:-1] + (2, 2)).sum(axis=-1)
+    return vertical / (2.0 * d[..., 4:6])
+
+
+def _mouth(d):
+    vert, hor = d[..., 6], d[..., 7]
+    return np.divide(vert, hor, out=np.zeros_like(vert), where=hor != 0) * 100.0
+
+
+# --- Vectorized metrics: points is (468, 2) for a frame or (T, 468, 2) for a stack ---
+
+def eye_aspect_ratios(points):
+    """(..., 2) EAR for the left and right eye."""
+    return _ears(_distances(points, METRIC_PAIRS))
+
+
+def mouth_openness(points):
+    """(...) vertical / horizontal inner-lip opening, times 100."""
+    return _mouth(_distances(points, METRIC_PAIRS))
+
+
+def head_pose_points(points):
+    """(..., 6, 2) image points for solvePnP, in MODEL_POINTS order."""
+    return points[..., POSE_LANDMARKS, :]
+
+
+def blinking(ears, mouth):
+    """Blink when the mean EAR drops below threshold, unless the mouth is open (talking)."""
+    return (ears.mean(axis=-1) < EAR_THRESHOLD) & (mouth <= MOUTH_OPEN_THRESHOLD)
+
+
+def frame_metrics(points):
+    """All per-frame metrics from one (468, 2) array."""
+    d = _distances(points, METRIC_PAIRS)
+    ears, mouth = _ears(d), _mouth(d)
+    return {
+        "left_ear": float(ears[0]),
+        "right_ear": float(ears[1]),
+        "mouth_openness": float(mouth),
+        "blinking": bool(blinking(ears, mouth)),
+        "pose_points": head_pose_points(points),
+    }
+
+
+def batch_metrics(stack):
+    """
+    Metrics for a (T, 468, 2) stack of frames in one pass.
+    Returns arrays: ears (T, 2), mouth_openness (T,), blinking (T,), pose_points (T, 6, 2).
+    """
+    stack = np.asarray(stack, dtype=np.float64)
+    d = _distances(stack, METRIC_PAIRS)
+    ears, mouth = _ears(d), _mouth(d)
+    return {
+        "ears": ears,
+        "mouth_openness": mouth,
+        "blinking": blinking(ears, mouth),
+        "pose_points": head_pose_points(stack),
+    }
+
+
+def rotation_to_euler(rot_vec):
+    """Rodrigues vector to (x, y, z) rotation angles in degrees."""
+    rot_mat, _ = cv2.Rodrigues(rot_vec)
+    sy = np.sqrt(rot_mat[0, 0] * rot_mat[0, 0] + rot_mat[1, 0] * rot_mat[1, 0])
+    singular = sy < 1e-6
+    if not singular:
+        x = np.arctan2(rot_mat[2, 1], rot_mat[2, 2])
+        y = np.arctan2(-rot_mat[2, 0], sy)
+        z = np.arctan2(rot_mat[1, 0], rot_mat[0, 0])
+    else:
+        x = np.arctan2(-rot_mat[1, 2], rot_mat[1, 1])
+        y = np.arctan2(-rot_mat[2, 0], sy)
+        z = 0
+    return np.degrees([x, y, z])
+
+
+def solve_pose(image_points, frame_w, frame_h, rvec=None, tvec=None):
+    """
+    (ok, rvec, tvec) from solvePnP for the (6, 2) pose points of one frame.
+    Passing the previous frame's rvec/tvec starts the iteration from them
+    (useExtrinsicGuess), which converges in fewer steps on video.
+    """
+    guess = rvec is not None and tvec is not None
+    return cv2.solvePnP(
+        MODEL_POINTS, np.ascontiguousarray(image_points, dtype=np.float64),
+        camera_matrix(frame_w, frame_h), DIST_COEFFS,
+        rvec=rvec.copy() if guess else None, tvec=tvec.copy() if guess else None,
+        useExtrinsicGuess=guess, flags=cv2.SOLVEPNP_ITERATIVE,
+    )
+
+
+def solve_head_pose(image_points, frame_w, frame_h):
+    """(x, y, z) rotation angles from the (6, 2) pose points of one frame."""
+    try:
+        _, rot_vec, _ = solve_pose(image_points, frame_w, frame_h)
+        return rotation_to_euler(rot_vec)
+    except Exception:
+        return 0, 0, 0
+
+
+def batch_head_pose(stack, frame_w, frame_h):
+    """(T, 3) rotation angles for a (T, 468, 2) stack; solvePnP itself runs per frame."""
+    pose_points = head_pose_points(np.asarray(stack, dtype=np.float64))
+    return np.array([solve_head_pose(p, frame_w, frame_h) for p in pose_points], dtype=np.float64)
+
+
+# --- Per-frame API (accepts MediaPipe landmarks or a (468, 2) array) ---
+
 def get_head_pose(frame, landmarks):
     """
     Calculates the 3D head pose from 2D facial landmarks.
     Returns: (x, y, z) rotation angles.
     """
     frame_h, frame_w, _ = frame.shape
-    focal_length = frame_w
-    center = (frame_w / 2, frame_h / 2)
-    cam_matrix = np.array([[focal_length, 0, center[0]], [0, focal_length, center[1]], [0, 0, 1]], dtype=np.float64)
-    dist_coeffs = np.zeros((4, 1), dtype=np.float64)
-
-    # Standard 3D face model points
-    model_points = np.array([
-        (0.0, 0.0, 0.0),      # Nose tip
-        (0.0, -330.0, -65.0), # Chin
-        (-225.0, 170.0, -135.0), # Left eye left corner
-        (225.0, 170.0, -135.0),  # Right eye right corner
-        (-150.0, -150.0, -125.0), # Left mouth corner
-        (150.0, -150.0, -125.0),  # Right mouth corner
-    ])
-
-    # 2D image points from MediaPipe
-    image_points = np.array([
-        (landmarks[1].x * frame_w, landmarks[1].y * frame_h),
-        (landmarks[152].x * frame_w, landmarks[152].y * frame_h),
-        (landmarks[33].x * frame_w, landmarks[33].y * frame_h),
-        (landmarks[263].x * frame_w, landmarks[263].y * frame_h),
-        (landmarks[61].x * frame_w, landmarks[61].y * frame_h),
-        (landmarks[291].x * frame_w, landmarks[291].y * frame_h),
-    ], dtype=np.float64)
-
-    try:
-        _, rot_vec, _ = cv2.solvePnP(model_points, image_points, cam_matrix, dist_coeffs, flags=cv2.SOLVEPNP_ITERATIVE)
-        rot_mat, _ = cv2.Rodrigues(rot_vec)
-        sy = np.sqrt(rot_mat[0, 0] * rot_mat[0, 0] + rot_mat[1, 0] * rot_mat[1, 0])
-        singular = sy < 1e-6
-        if not singular:
-            x = np.arctan2(rot_mat[2, 1], rot_mat[2, 2])
-            y = np.arctan2(-rot_mat[2, 0], sy)
-            z = np.arctan2(rot_mat[1, 0], rot_mat[0, 0])
-        else:
-            x = np.arctan2(-rot_mat[1, 2], rot_mat[1, 1])
-            y = np.arctan2(-rot_mat[2, 0], sy)
-            z = 0
-        return np.degrees([x, y, z])
-    except:
-        return 0, 0, 0
+    points = landmarks_to_array(landmarks, frame_w, frame_h, tracked_only=True)
+    return solve_head_pose(head_pose_points(points), frame_w, frame_h)
 
 def is_looking_at_camera(x_angle, y_angle, threshold=15):
     return abs(y_angle) < threshold and abs(x_angle) < (threshold + 5)
@@ -69,29 +229,13 @@ def is_looking_at_camera(x_angle, y_angle, threshold=15):
 
 def get_eye_aspect_ratio(eye_landmarks, landmarks, w, h):
     """Calculates EAR for one eye."""
-    # Convert normalized landmarks to pixel coordinates
-    coords = np.array([(landmarks[i].x * w, landmarks[i].y * h) for i in eye_landmarks])
-    
-    # Vertical distances
-    A = np.linalg.norm(coords[1] - coords[14]) # Top-Bottom outer
-    B = np.linalg.norm(coords[2] - coords[13]) # Top-Bottom inner
-    # Horizontal distance
-    C = np.linalg.norm(coords[0] - coords[8])  # Left-Right
-    
-    return (A + B) / (2.0 * C)
+    points = landmarks_to_array(landmarks, w, h)
+    vertical, horizontal = _eye_pairs(eye_landmarks)
+    return float(_distances(points, np.array(vertical)).sum() / (2.0 * _distances(points, np.array(horizontal))))
 
 def get_mouth_openness(landmarks, w, h):
     """Calculates how open the mouth is to detect talking."""
-    top = np.array([landmarks[MOUTH_TOP].x * w, landmarks[MOUTH_TOP].y * h])
-    bottom = np.array([landmarks[MOUTH_BOTTOM].x * w, landmarks[MOUTH_BOTTOM].y * h])
-    left = np.array([landmarks[MOUTH_LEFT].x * w, landmarks[MOUTH_LEFT].y * h])
-    right = np.array([landmarks[MOUTH_RIGHT].x * w, landmarks[MOUTH_RIGHT].y * h])
-
-    vert = np.linalg.norm(top - bottom)
-    hor = np.linalg.norm(left - right)
-    
-    if hor == 0: return 0
-    return (vert / hor) * 100.0
+    return float(mouth_openness(landmarks_to_array(landmarks, w, h, tracked_only=True)))
 
 def is_blinking(landmarks, frame_shape):
     """
@@ -99,19 +243,214 @@ def is_blinking(landmarks, frame_shape):
     """
     h, w, _ = frame_shape
     try:
-        # 1. Check if Talking (Mouth is moving/open)
-        mouth_open_score = get_mouth_openness(landmarks, w, h)
-        
-        # If mouth is open significantly, assume talking -> Don't count blinks
-        if mouth_open_score > MOUTH_OPEN_THRESHOLD:
+        return frame_metrics(landmarks_to_array(landmarks, w, h, tracked_only=True))["blinking"]
+    except Exception:
+        return False
+
+
+# --- Streaming tracker ---
+
+def mediapipe_detector(max_num_faces=1):
+    """BGR frame -> landmarks of the first face (or None), using MediaPipe Face Mesh in video mode."""
+    import mediapipe as mp
+
+    face_mesh = mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=False, max_num_faces=max_num_faces, refine_landmarks=False,
+    )
+
+    def detect(frame):
+        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        faces = results.multi_face_landmarks
+        return faces[0] if faces else None
+
+    return detect
+
+
+class GazeBlinkTracker:
+    """
+    Blink, gaze and talking statistics over a video stream, one update() per frame.
+
+    A blink event is a run of at least min_blink_frames consecutive processed
+    frames with the eyes closed (the per-frame is_blinking rule, so talking
+    never counts), no longer than max_blink_seconds; longer closures are not
+    blinks. Talking and gaze-away time are kept over the last window_seconds
+    in a fixed-size ring buffer with running totals.
+
+    While the face is stable (eye and nose landmarks moved less than
+    stable_pixels since the last processed frame and the eyes are clearly
+    open), up to max_skip following frames are not run through the detector
+    at all; they inherit the last state. A blink is only caught if
+    max_skip + min_blink_frames frames fit inside it, so the default of 1
+    still sees every 100 ms blink at 30 fps. Any movement or a closing eye
+    returns to every frame. Head pose reuses the previous angles
+    when the pose points have not moved and otherwise seeds solvePnP with the
+    previous rvec/tvec.
+
+    Pass a detector (BGR frame -> landmarks or None) to have update(frame)
+    run face mesh itself, defaulting to MediaPipe; or check needs_landmarks()
+    and pass landmarks (MediaPipe objects or a (468, 2) pixel array) directly.
+    """
+
+    def __init__(self, fps=30.0, detector=None, window_seconds=60.0, min_blink_frames=2,
+                 max_blink_seconds=0.5, gaze_threshold=15, max_skip=1, stable_pixels=1.5):
+        self.fps = fps
+        self.detector = detector
+        self.window_seconds = window_seconds
+        self.min_blink_frames = min_blink_frames
+        self.max_blink_seconds = max_blink_seconds
+        self.gaze_threshold = gaze_threshold
+        self.max_skip = max_skip
+        self.stable_pixels = stable_pixels
+        self.reset()
+
+    def reset(self):
+        # (dt, talking, away) per frame over the window, with running sums
+        self._samples = deque(maxlen=max(1, int(self.window_seconds * self.fps)))
+        self._window_time = self._talking_time = self._away_time = 0.0
+        self._blink_times = deque()
+        self.blinks = 0
+        self.frames = 0
+        self.processed_frames = 0
+        self.total_away_seconds = 0.0
+        self.longest_away_seconds = 0.0
+        self._away_since = None
+        self._closed_frames = 0
+        self._closed_since = None
+        self._skip = 0
+        self._last_time = None
+        self._points = None
+        self._pose_points = None
+        self._rvec = self._tvec = None
+        self._state = {"face": False, "eyes_closed": False, "talking": False, "looking": False, "angles": None}
+
+    def needs_landmarks(self):
+        """Whether the next update() will use landmarks; when False, callers can skip face mesh."""
+        return self._skip == 0
+
+    def update(self, frame=None, landmarks=None, frame_size=None, timestamp=None):
+        """
+        Consume one frame. Give either a BGR frame (landmarks come from the
+        detector), or landmarks with the frame or its (width, height).
+        timestamp is in seconds and defaults to frame count / fps.
+        Returns this frame's state plus whether it was processed and whether a blink ended on it.
+        """
+        now = timestamp if timestamp is not None else self.frames / self.fps
+        dt = 1.0 / self.fps if self._last_time is None else max(now - self._last_time, 0.0)
+        self._last_time = now
+        self.frames += 1
+
+        processed = self._skip == 0
+        blink = False
+        if processed:
+            if landmarks is None and frame is not None:
+                if self.detector is None:
+                    self.detector = mediapipe_detector()
+                landmarks = self.detector(frame)
+            if frame_size is None and frame is not None:
+                frame_size = (frame.shape[1], frame.shape[0])
+            blink = self._process(landmarks, frame_size, now)
+        else:
+            self._skip -= 1
+
+        state = self._state
+        self._record(dt, state["talking"], not state["looking"], now)
+        return {**state, "processed": processed, "blink": blink}
+
+    def _process(self, landmarks, frame_size, now):
+        self.processed_frames += 1
+        if landmarks is None:
+            self._points = self._pose_points = None
+            self._rvec = self._tvec = None
+            self._closed_frames = 0
+            self._closed_since = None
+            self._state = {"face": False, "eyes_closed": False, "talking": False, "looking": False, "angles": None}
             return False
 
-        # 2. If NOT talking, check for blinks
-        left_ear = get_eye_aspect_ratio(LEFT_EYE, landmarks, w, h)
-        right_ear = get_eye_aspect_ratio(RIGHT_EYE, landmarks, w, h)
-        avg_ear = (left_ear + right_ear) / 2.0
-        
-        return avg_ear < EAR_THRESHOLD
-        
-    except Exception:
-        return False
\ No newline at end of file
+        w, h = frame_size
+        points = landmarks_to_array(landmarks, w, h, tracked_only=True)
+        metrics = frame_metrics(points)
+        closed = metrics["blinking"]
+        ears_open = min(metrics["left_ear"], metrics["right_ear"]) > 1.25 * EAR_THRESHOLD
+
+        blink = False
+        if closed:
+            if self._closed_frames == 0:
+                self._closed_since = now
+            self._closed_frames += 1
+        else:
+            if (self._closed_frames >= self.min_blink_frames
+                    and now - self._closed_since <= self.max_blink_seconds):
+                blink = True
+                self.blinks += 1
+                self._blink_times.append(now)
+            self._closed_frames = 0
+            self._closed_since = None
+
+        pose_points = metrics["pose_points"]
+        angles = self._state["angles"]
+        if (angles is None or self._pose_points is None
+                or np.abs(pose_points - self._pose_points).max() >= self.stable_pixels):
+            try:
+                ok, rvec, tvec = solve_pose(pose_points, w, h, self._rvec, self._tvec)
+            except cv2.error:
+                ok = False
+            if ok:
+                self._rvec, self._tvec = rvec, tvec
+                angles = rotation_to_euler(rvec)
+                self._pose_points = pose_points
+            else:
+                self._rvec = self._tvec = None
+                angles = (0, 0, 0)
+                self._pose_points = None
+
+        watched = points[STABILITY_LANDMARKS]
+        stable = (self._points is not None and ears_open and not closed
+                  and np.abs(watched - self._points).max() < self.stable_pixels)
+        self._points = watched
+        self._skip = self.max_skip if stable else 0
+
+        self._state = {
+            "face": True,
+            "eyes_closed": closed,
+            "talking": metrics["mouth_openness"] > MOUTH_OPEN_THRESHOLD,
+            "looking": is_looking_at_camera(angles[0], angles[1], self.gaze_threshold),
+            "angles": angles,
+        }
+        return blink
+
+    def _record(self, dt, talking, away, now):
+        if len(self._samples) == self._samples.maxlen:
+            old_dt, old_talking, old_away = self._samples[0]
+            self._window_time -= old_dt
+            self._talking_time -= old_dt * old_talking
+            self._away_time -= old_dt * old_away
+        self._samples.append((dt, talking, away))
+        self._window_time += dt
+        self._talking_time += dt * talking
+        self._away_time += dt * away
+
+        if away:
+            self.total_away_seconds += dt
+            if self._away_since is None:
+                self._away_since = now - dt
+            self.longest_away_seconds = max(self.longest_away_seconds, now - self._away_since)
+        else:
+            self._away_since = None
+
+        while self._blink_times and self._blink_times[0] < now - self.window_seconds:
+            self._blink_times.popleft()
+
+    def summary(self):
+        """Rates over the last window_seconds plus stream totals."""
+        window = self._window_time
+        return {
+            "blinks": self.blinks,
+            "blinks_per_minute": len(self._blink_times) * 60.0 / window if window else 0.0,
+            "talking_ratio": self._talking_time / window if window else 0.0,
+            "gaze_away_ratio": self._away_time / window if window else 0.0,
+            "gaze_away_seconds": self.total_away_seconds,
+            "current_gaze_away_seconds": self._last_time - self._away_since if self._away_since is not None else 0.0,
+            "longest_gaze_away_seconds": self.longest_away_seconds,
+            "frames": self.frames,
+            "processed_frames": self.processed_frames,
+        }
@@ -1,115 +1,20 @@
-import spacy
-import PyPDF2
-import re
-import json
+"""
+The resume parser now lives in backend/utils/resume_parser.py (PyMuPDF text
+extraction, LLM parsing with a lazily loaded spaCy fallback, batch nlp.pipe).
+This module re-exports it for code that still imports ml.nlp.resume_parser.
+"""
 import os
-from spacy.matcher import Matcher
-from backend.ollama_client import generate_response # `parse_resume` needs this
-
-# Load spaCy NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except IOError:
-    print("Error: 'en_core_web_sm' model not found. ")
-    print("Please run: python -m spacy download en_core_web_sm")
-    nlp = None
-
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """
-    Extract text from a PDF file.
-    Returns: Extracted text as a string.
-    """
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"PDF file not found at {pdf_path}")
-        
-    text = ""
-    with open(pdf_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            if page.extract_text():
-                text += page.extract_text()
-    return text
-
-# --- (THIS IS THE FUNCTION WE NEEDED TO ADD BACK) ---
-def parse_resume_with_spacy(text):
-    """
-    Parse resume text using spaCy to extract entities.
-    This is a FALLBACK for when the LLM fails.
-    """
-    if not nlp:
-        print("spaCy model not loaded, cannot parse.")
-        return {}
-        
-    doc = nlp(text)
-    skill_matcher = Matcher(nlp.vocab)
-    skill_patterns = [
-        [{'LOWER': 'python'}], [{'LOWER': 'java'}], [{'LOWER': 'javascript'}],
-        [{'LOWER': 'react'}], [{'LOWER': 'fastapi'}], [{'LOWER': 'opencv'}],
-        [{'LOWER': 'tensorflow'}], [{'LOWER': 'pytorch'}],
-        [{'LOWER': 'machine'}, {'LOWER': 'learning'}]
-    ]
-    skill_matcher.add("SKILLS", skill_patterns)
-    matches = skill_matcher(doc)
-    skills = [doc[start:end].text for match_id, start, end in matches]
-    experience = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-    education = []
-    for token in doc:
-        if token.text.lower() in ['university', 'college', 'msc', 'bsc']:
-            if token.sent.text not in education:
-                education.append(token.sent.text)
-
-    return {
-        "skills": list(set(skills)),
-        "experience": list(set(experience)),
-        "education": list(set(education)),
-    }
-
-def parse_resume_with_ollama(text):
-    """
-    Parse resume text using Ollama (Mistral) for structured extraction.
-    This is the *main* parser.
-    """
-    prompt = f"""
-    You are an expert resume parser. Extract the following information from the resume text below.
-    Return ONLY a valid JSON object with the keys "skills", "experience", and "education".
-    - "skills": A list of technical skills (e.g., Python, React, AWS).
-    - "experience": A list of strings, each string containing a job title and company (e.g., "Software Engineer at Google").
-    - "education": A list of strings, each string containing a degree and institution (e.g., "MSc in Computer Science at Stanford").
-
-    Resume Text:
-    ---
-    {text}
-    ---
-    
-    JSON Output:
-    """
-    response = generate_response(prompt)
-    json_match = re.search(r'\{.*\}', response, re.DOTALL)
-    
-    if not json_match:
-        print("Warning: Ollama did not return valid JSON. Falling back to spaCy.")
-        return parse_resume_with_spacy(text)
-
-    try:
-        json_string = json_match.group(0)
-        extracted_data = json.loads(json_string)
-        if "skills" not in extracted_data: extracted_data["skills"] = []
-        if "experience" not in extracted_data: extracted_data["experience"] = []
-        if "education" not in extracted_data: extracted_data["education"] = []
-        return extracted_data
-    except json.JSONDecodeError:
-        print("Warning: Ollama response was not valid JSON. Falling back to spaCy.")
-        return parse_resume_with_spacy(text)
-
-def parse_resume(pdf_path=None, text=None):
-    """
-    Parse a resume (PDF or text) and extract structured information.
-    Returns: Dictionary of extracted data.
-    """
-    if pdf_path:
-        text = extract_text_from_pdf(pdf_path)
-    elif not text:
-        raise ValueError("Provide either a PDF path or resume text.")
-
-    return parse_resume_with_ollama(text)
-# --- (END OF FUNCTION WE NEEDED) ---
\ No newline at end of file
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from utils.resume_parser import (  # noqa: E402
+    extract_text,
+    extract_text_from_file as extract_text_from_pdf,
+    parse_resume,
+    parse_resume_with_llm as parse_resume_with_ollama,
+    parse_resume_with_spacy,
+    parse_resumes_with_spacy,
+)